@@ -3,10 +3,16 @@ main.py
 ──────────────────────────────
 - FastAPI 카카오톡 챗봇 서버 진입점
 - webhook / oauth 라우터 처리
+- /metrics : Prometheus 텍스트 포맷 메트릭 노출
+- /crawl/jobs : 크롤링 스케줄러 대기열 · 작업 상태 조회
+- /ready : warm-up(app/services/warmup.py) 완료 여부 — lifespan 에서 기동 시 실행
 """
 
-from fastapi import FastAPI, Request, Query
-from fastapi.responses import HTMLResponse
+import asyncio
+from contextlib import asynccontextmanager
+
+from fastapi import FastAPI, HTTPException, Request, Query
+from fastapi.responses import HTMLResponse, PlainTextResponse, Response
 from fastapi.templating import Jinja2Templates
 from fastapi import BackgroundTasks
 
@@ -14,16 +20,63 @@ from app.services.webhook_handler import handle_webhook
 from app.services.oauth_handler import handle_oauth
 from app.utils.kakao_oauth import build_kakao_auth_url
 from app.services.kakao_message_sender import send_kakao_message
+from app.services.warmup import WARMUP_BLOCKING, run_warmup, warmup_state
+from app.utils.metrics import (
+    CONTENT_TYPE_LATEST,
+    SESSION_STORE_SIZE,
+    TOKEN_STORE_SIZE,
+    render_metrics
+)
+from app.utils.serializer import dumps, loads
+from app.utils.session_manager import session_states
+from app.utils.spec_search import get_spec_search
+from app.utils.tracing import start_trace
+from selenium_utils.crawl_scheduler import get_crawl_scheduler
+from storage.token_manager import load_tokens
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """
+    기동: warm-up 실행 (WARMUP_BLOCKING=1 이면 끝날 때까지 요청을 받지 않음, 아니면 백그라운드)
+    종료: 진행 중인 warm-up 취소, 유휴 Chrome 드라이버 종료
+    """
+    task = asyncio.create_task(run_warmup())
+    if WARMUP_BLOCKING:
+        await task
+    yield
+    if not task.done():
+        task.cancel()
+    from selenium_utils.manufacturer_brand_crawler import close_driver_pool
+
+    close_driver_pool()
+
 
 app = FastAPI(
     title="KakaoTalk Shopping Assistant Bot",
     description="FastAPI 기반 카카오 챗봇 서버",
     version="1.0.0",
+    lifespan=lifespan,
 )
 
 templates = Jinja2Templates(directory="app/templates")
 
 
+class KakaoJSONResponse(Response):
+    """
+    직렬화 레이어(orjson 등)로 바로 bytes 를 만드는 JSON 응답
+    (jsonable_encoder / 표준 json 인코딩 단계를 거치지 않음)
+    """
+    media_type = "application/json"
+
+    def render(self, content) -> bytes:
+        return dumps(content)
+
+# 저장소 크기는 스크랩 시점에 계산
+SESSION_STORE_SIZE.set_function(lambda: len(session_states))
+TOKEN_STORE_SIZE.set_function(lambda: len(load_tokens()))
+
+
 @app.get("/", summary="헬스 체크")
 async def root() -> dict:
     """
@@ -32,8 +85,78 @@ async def root() -> dict:
     return {"message": "FastAPI 챗봇 서버 실행 중!"}
 
 
-@app.post("/webhook", summary="카카오톡 Webhook")
-async def webhook(request: Request, background_tasks: BackgroundTasks) -> dict:
+@app.get("/ready", summary="준비 상태 (warm-up 완료 여부)")
+async def ready() -> KakaoJSONResponse:
+    """
+    warm-up 이 끝나고 필수 단계가 모두 통과했으면 200, 아니면 503
+    (로드밸런서 / 롤링 배포의 readiness probe 용, 단계별 소요 시간 · 실패 사유 포함)
+
+    Returns:
+        KakaoJSONResponse: {"ready", "status", "elapsed_ms", "steps"}
+    """
+    return KakaoJSONResponse(warmup_state.to_dict(), status_code=200 if warmup_state.ready else 503)
+
+
+@app.get("/metrics", response_class=PlainTextResponse, summary="메트릭 노출")
+async def metrics() -> PlainTextResponse:
+    """
+    Prometheus 스크랩용 메트릭 엔드포인트
+    (stage 지연 시간, LLM 토큰/지연, 크롤링 시간, 캐시 적중률, 저장소 크기)
+
+    Returns:
+        PlainTextResponse: Prometheus 텍스트 포맷
+    """
+    return PlainTextResponse(render_metrics(), media_type=CONTENT_TYPE_LATEST)
+
+
+@app.get("/crawl/jobs", summary="크롤링 작업 목록")
+async def crawl_jobs(
+    status: str | None = Query(None, description="queued | running | done | failed"),
+    limit: int = Query(50, ge=1, le=500),
+) -> dict:
+    """
+    크롤링 스케줄러의 우선순위별 대기 수, 실행 중 작업 수, 최근 작업 목록
+
+    Returns:
+        dict: {"queued", "running", "jobs"}
+    """
+    return get_crawl_scheduler().list_jobs(status, limit)
+
+
+@app.get("/crawl/jobs/{job_id}", summary="크롤링 작업 상태")
+async def crawl_job(job_id: str) -> dict:
+    """
+    크롤링 작업 1건의 상태 (queued / running / done / failed, 대기 · 실행 시간)
+
+    Args:
+        job_id (str): 작업 ID (crawl-N)
+
+    Returns:
+        dict: 작업 상태
+    """
+    job = get_crawl_scheduler().get_job(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail="크롤링 작업을 찾을 수 없습니다.")
+    return job
+
+
+@app.get("/specs/search", summary="크롤링 결과 전문 검색")
+def specs_search(
+    q: str = Query(..., min_length=1, description="검색어 (부분 문자열 · 초성 가능)"),
+    top: int = Query(10, ge=1, le=100),
+    field: str | None = Query(None, pattern="^(category|value|nav|attribute)$"),
+) -> dict:
+    """
+    "브랜드 X 가 있는 카테고리" 같은 질의를 색인으로 조회 (SQLite 조회라 스레드풀에서 실행)
+
+    Returns:
+        dict: {"query", "results": [{"url", "detail_name", "mid_key", "score", "matches"}]}
+    """
+    return {"query": q, "results": get_spec_search().search(q, top, field)}
+
+
+@app.post("/webhook", response_class=KakaoJSONResponse, summary="카카오톡 Webhook")
+async def webhook(request: Request, background_tasks: BackgroundTasks) -> KakaoJSONResponse:
     """
     카카오톡에서 들어오는 Webhook 이벤트 처리
 
@@ -42,10 +165,12 @@ async def webhook(request: Request, background_tasks: BackgroundTasks) -> dict:
         background_tasks (BackgroundTasks): 백그라운드 작업 관리 객체
 
     Returns:
-        dict: 카카오톡에 응답할 JSON
+        KakaoJSONResponse: 카카오톡에 응답할 JSON
     """
-    data = await request.json()
-    return await handle_webhook(data, background_tasks)
+    with start_trace("webhook", path="/webhook"):
+        data = loads(await request.body())
+        response = await handle_webhook(data, background_tasks, request.headers.get("x-request-id"))
+        return KakaoJSONResponse(response)
 
 
 @app.get("/auth_url", summary="카카오 인증 URL 생성")
@@ -4,15 +4,19 @@ category_flow_executor.py
 - 유저 입력과 세션 데이터를 기반으로
   카테고리 매칭 → URL 해석 → (확인 후) 크롤링까지 수행
   (저장은 호출하는 쪽에서 처리)
+- 버튼으로 고른 (중간키, 세부항목)이 넘어오면 후보 목록에 있는지만 확인하고 LLM 매칭 생략
 """
 
+from typing import Optional
+
 from app.utils.session_manager import get_session
 from app.utils.category_url_resolver import resolve_category_url
-from chatbot_llm.category_match_llm import category_match
+from chatbot_llm.category_match_llm import category_match, is_valid_match
+from app.utils.tracing import span
 from selenium_utils.manufacturer_brand_crawler import crawl_spec_options
 
 
-async def prepare_category_flow(user_id: str, utterance: str):
+async def prepare_category_flow(user_id: str, utterance: str, choice: Optional[tuple[str, str]] = None):
     """
     카테고리 매칭 → URL 해석까지만 수행
     (사용자 확인 후 크롤링 단계 진행)
@@ -20,19 +24,24 @@ async def prepare_category_flow(user_id: str, utterance: str):
     Args:
         user_id (str): 유저 ID
         utterance (str): 사용자 입력
+        choice (tuple | None): 버튼으로 선택한 (mid_key, detail_key) — 직전 추천 목록에 있으면 그대로 사용
 
     Returns:
         [bool, list | str]: 성공 시 [True, (mid_key, detail_key, url)], 실패 시 [False, 메시지]
     """
     bot_raw_result = get_session(user_id).get("last_bot_message")
 
-    llm_result = await category_match(utterance, bot_raw_result)
+    if choice is not None and isinstance(bot_raw_result, dict) and is_valid_match([True, list(choice)], bot_raw_result):
+        llm_result = [True, list(choice)]
+    else:
+        llm_result = await category_match(utterance, bot_raw_result)
     if not llm_result or not llm_result[0]:  # 실패
         return llm_result
 
     mid_key, detail_key = llm_result[1]
 
-    url = resolve_category_url(mid_key, detail_key)
+    with span("catalog.resolve_url", mid_key=mid_key, detail_key=detail_key):
+        url = resolve_category_url(mid_key, detail_key)
     if not url:
         return [False, "죄송합니다. 카테고리 URL을 찾지 못했습니다."]
 
@@ -40,19 +49,21 @@ async def prepare_category_flow(user_id: str, utterance: str):
     return [True, (mid_key, detail_key, url)]
 
 
-def execute_category_crawling(detail_key: str, url: str):
+def execute_category_crawling(detail_key: str, url: str, user_id: Optional[str] = None):
     """
-    URL에 대해 크롤링만 수행
+    URL에 대해 크롤링만 수행 (크롤링 스케줄러의 대화형 우선순위로 실행)
     (저장은 호출하는 쪽에서 처리)
 
     Args:
         detail_key (str): 세부 항목 키
         url (str): 크롤링할 URL
+        user_id (str | None): 요청한 유저 (스케줄러의 유저별 공정성 단위)
 
     Returns:
         [bool, dict | str]: 성공 시 [True, 크롤링 데이터], 실패 시 [False, 메시지]
     """
-    crawled_data = crawl_spec_options(url)
+    with span("crawl.spec_options", url=url):
+        crawled_data = crawl_spec_options(url, user=user_id)
 
     if not crawled_data or all(len(v) == 0 for v in crawled_data.values()):
         return [False, "죄송합니다. 카테고리 정보를 가져오지 못했습니다."]
@@ -102,7 +113,7 @@ if __name__ == "__main__":
                         print(f"  • {txt}: {link}")
 
             # 저장은 호출하는 쪽에서
-            save_category_spec(url, detail_key, crawled_data)
+            save_category_spec(url, detail_key, crawled_data, mid_key)
 
         else:
             print(f"❌ 크롤링 실패: {crawl_result[1]}")
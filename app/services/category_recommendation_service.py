@@ -3,11 +3,14 @@ category_recommendation_service.py
 ──────────────────────────────
 - 사용자 입력 → validate_llm → build_category_dict → refine_llm
 - 카테고리 추천 서비스 전체 워크플로 처리
+- 발화에 카탈로그 이름이 명확하게 들어 있으면 validate_llm 대신 키워드 스캔 결과 사용 (keyword_spotter.py)
 """
 
 from chatbot_llm.validate_llm import validate_keywords
+from app.services.keyword_spotter import spot_keywords
 from chatbot_llm.refine_llm import refine_keywords
 from app.utils.build_category_dict import build_category_dict
+from app.utils.tracing import span
 
 
 async def recommend_category(user_message: str) -> list:
@@ -20,8 +23,11 @@ async def recommend_category(user_message: str) -> list:
     Returns:
         list: [True, {...}] 또는 [False, "안내 문구"]
     """
-    # 1️⃣ validate 단계
-    validate_result = await validate_keywords(user_message)
+    # 1️⃣ validate 단계 (카탈로그 이름이 그대로 있으면 LLM 생략)
+    with span("keyword_spotter.spot"):
+        validate_result = spot_keywords(user_message)
+    if validate_result is None:
+        validate_result = await validate_keywords(user_message)
 
     if not validate_result or validate_result[0] is not True:
         # validate 실패
@@ -29,7 +35,8 @@ async def recommend_category(user_message: str) -> list:
 
     # 2️⃣ build_category_dict 단계
     try:
-        category_dict = build_category_dict(validate_result)
+        with span("catalog.build_category_dict"):
+            category_dict = build_category_dict(validate_result)
     except Exception as e:
         print(f"❌ build_category_dict 실패: {e}")
         return [False, "죄송합니다. 카테고리 데이터를 처리하는 중 오류가 발생했습니다. 다시 시도해 주세요."]
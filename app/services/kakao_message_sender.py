@@ -1,12 +1,12 @@
 import json
-import requests
 from storage.token_manager import get_user_token
-from dotenv import load_dotenv
+from app.utils.config import load_env
 import os
 
-load_dotenv()
+load_env()
 
 BASE_URL = os.getenv("BASE_URL", "")
+KAKAO_API_HOST = os.getenv("KAKAO_API_HOST", "https://kapi.kakao.com")  # 부하 테스트 시 fake 서버로 교체
 
 def send_kakao_message(user_id: str, text: str):
     """
@@ -18,7 +18,7 @@ def send_kakao_message(user_id: str, text: str):
         return
 
     access_token = token_info["access_token"]
-    url = "https://kapi.kakao.com/v2/api/talk/memo/default/send"
+    url = f"{KAKAO_API_HOST}/v2/api/talk/memo/default/send"
     headers = {
         "Authorization": f"Bearer {access_token}",
         "Content-Type": "application/x-www-form-urlencoded"
@@ -34,6 +34,8 @@ def send_kakao_message(user_id: str, text: str):
         })
     }
 
+    import requests  # 서버 기동 시 임포트 비용을 피하기 위해 첫 사용 시 로드
+
     response = requests.post(url, headers=headers, data=payload)
     if response.ok:
         print(f"✅ 카톡 메시지 전송 완료: {user_id}")
@@ -0,0 +1,286 @@
+"""
+keyword_spotter.py
+──────────────────────────────
+- stage 1 빠른 경로: 발화에 카탈로그 이름(대분류 · 중간 카테고리 · 세부 항목)이 그대로 들어 있으면
+  validate_llm 없이 build_category_dict 입력([True, 키, …])을 바로 생성
+- category_structure_keys.json 의 이름으로 Aho-Corasick 오토마톤을 한 번 만들어 두고 발화를 선형 시간에 스캔
+  (파일이 바뀌면 다음 호출 때 다시 생성)
+- 정규화: 소문자 + 한글 / 영숫자 외 제거 → "게이밍 노트북" · "게이밍노트북" · "기계식 키보드!" 모두 일치
+- 색인 용어: 중간 카테고리 · 세부 항목 이름 전체 + "/" · "·" · "," 로 나눈 조각 ("노트북 전체" 처럼 끝의 "전체" 는
+  떼어 냄, 2글자 이상), 대분류는 이름 전체만
+
+📌 판정 (겹치는 일치는 가장 왼쪽 · 가장 긴 것만 사용)
+- hit       : 모든 일치가 하나의 대분류 / 중간 카테고리로 정해짐 → [True, 키, …] (LLM 생략)
+- ambiguous : 여러 중간 카테고리에 걸친 용어("패딩", "액세서리" …)가 있거나 키가 너무 많음 → validate_llm
+- negated   : "말고" · "빼고" · "제외" 같은 부정 표현이 있음 → validate_llm
+- miss      : 일치 없음 → validate_llm
+- 결과는 keyword_spotter_total{result} 메트릭 · 이벤트 로그 캐시 항목(keyword_spotter)으로 집계
+
+📌 환경 변수
+- KEYWORD_SPOTTER_ENABLED      : 0 이면 항상 validate_llm 사용 (기본 1)
+- KEYWORD_SPOTTER_MAX_KEYWORDS : 빠른 경로로 넘길 최대 키 수 (기본 10, validate_llm 과 같음)
+
+📌 CLI
+    python -m app.services.keyword_spotter spot "게이밍 노트북 추천해줘"
+    python -m app.services.keyword_spotter stats queries.txt     # 질의 로그에서 빠른 경로 적중률
+"""
+
+import argparse
+import os
+import re
+import sys
+import threading
+from collections import Counter, deque
+from pathlib import Path
+from typing import Optional
+
+from app.utils.metrics import KEYWORD_SPOTTER, record_cache
+
+# =====================================================
+# 0️⃣ 전역 설정
+# =====================================================
+PROJECT_ROOT = Path(__file__).resolve().parent.parent.parent
+CATEGORY_KEYS_JSON = PROJECT_ROOT / "storage" / "category_structure_keys.json"
+KEYWORD_SPOTTER_ENABLED = os.getenv("KEYWORD_SPOTTER_ENABLED", "1") == "1"
+KEYWORD_SPOTTER_MAX_KEYWORDS = int(os.getenv("KEYWORD_SPOTTER_MAX_KEYWORDS", "10"))
+
+MIN_TERM_LENGTH = 2
+STRIP_PATTERN = re.compile(r"[^0-9a-z가-힣]+")
+PART_SPLIT_PATTERN = re.compile(r"[/·,]")
+GENERIC_SUFFIX_PATTERN = re.compile(r"(전체보기|전체)$")
+NEGATION_PATTERN = re.compile(r"말고|빼고|제외|아니고|싫어|없는\s*거")
+
+
+def normalize(text: str) -> str:
+    return STRIP_PATTERN.sub("", text.lower())
+
+
+# =====================================================
+# 1️⃣ Aho-Corasick 오토마톤
+# =====================================================
+class KeywordAutomaton:
+    """
+    여러 용어를 한 번에 찾는 Aho-Corasick 오토마톤 (상태 = 정수, 전이 = 상태별 dict)
+
+    Args:
+        terms (Iterable[str]): 정규화된 용어
+    """
+
+    def __init__(self, terms):
+        self._goto: list[dict[str, int]] = [{}]
+        self._fail: list[int] = [0]
+        self._output: list[Optional[str]] = [None]   # 이 상태에서 끝나는 가장 긴 용어
+        self._dict_link: list[int] = [0]             # 실패 경로상 용어가 끝나는 가장 가까운 상태
+        for term in terms:
+            self._add(term)
+        self._link()
+
+    def _add(self, term: str) -> None:
+        state = 0
+        for ch in term:
+            nxt = self._goto[state].get(ch)
+            if nxt is None:
+                nxt = len(self._goto)
+                self._goto[state][ch] = nxt
+                self._goto.append({})
+                self._fail.append(0)
+                self._output.append(None)
+                self._dict_link.append(0)
+            state = nxt
+        self._output[state] = term
+
+    def _link(self) -> None:
+        queue = deque(self._goto[0].values())
+        while queue:
+            state = queue.popleft()
+            for ch, nxt in self._goto[state].items():
+                fallback = self._fail[state]
+                while fallback and ch not in self._goto[fallback]:
+                    fallback = self._fail[fallback]
+                target = self._goto[fallback].get(ch, 0)
+                self._fail[nxt] = target if target != nxt else 0
+                fail = self._fail[nxt]
+                self._dict_link[nxt] = fail if self._output[fail] is not None else self._dict_link[fail]
+                queue.append(nxt)
+
+    def __len__(self) -> int:
+        return sum(1 for term in self._output if term is not None)
+
+    def find_all(self, text: str) -> list[tuple[int, int, str]]:
+        """text 안의 모든 일치 (시작, 끝, 용어) — 겹치는 일치 포함"""
+        goto, fail, output, dict_link = self._goto, self._fail, self._output, self._dict_link
+        matches = []
+        state = 0
+        for end, ch in enumerate(text, 1):
+            while state and ch not in goto[state]:
+                state = fail[state]
+            state = goto[state].get(ch, 0)
+            hit = state if output[state] is not None else dict_link[state]
+            while hit:
+                term = output[hit]
+                matches.append((end - len(term), end, term))
+                hit = dict_link[hit]
+        return matches
+
+
+def leftmost_longest(matches: list[tuple[int, int, str]]) -> list[tuple[int, int, str]]:
+    """겹치는 일치 중 가장 왼쪽에서 시작하는 가장 긴 것만 남김"""
+    selected, covered = [], 0
+    for start, end, term in sorted(matches, key=lambda m: (m[0], m[0] - m[1])):
+        if start >= covered:
+            selected.append((start, end, term))
+            covered = end
+    return selected
+
+
+# =====================================================
+# 2️⃣ 카탈로그 용어 → 키
+# =====================================================
+def _name_terms(name: str) -> set[str]:
+    terms = set()
+    for part in [name, *PART_SPLIT_PATTERN.split(name)]:
+        term = normalize(GENERIC_SUFFIX_PATTERN.sub("", part.strip()))
+        if len(term) >= MIN_TERM_LENGTH:
+            terms.add(term)
+    return terms
+
+
+class KeywordSpotter:
+    """
+    카탈로그 이름 오토마톤 + 용어별 후보 키
+
+    - 대분류 / 중간 카테고리 이름과 정확히 같은 용어는 그 키로 확정
+    - 그 외 용어는 그 용어를 이름(조각)으로 가진 중간 카테고리가 하나일 때만 확정
+
+    Args:
+        category_keys (dict): {대분류: {중간키: [세부항목, …]}}
+    """
+
+    def __init__(self, category_keys: dict):
+        exact: dict[str, str] = {}
+        owners: dict[str, set[str]] = {}
+        for top, mids in category_keys.items():
+            # 대분류는 조각("사무", "취미" …)이 하위 전체로 퍼지므로 이름 전체로만 색인
+            exact.setdefault(normalize(top), top)
+            owners.setdefault(normalize(top), set()).add(top)
+            for mid, details in mids.items():
+                exact.setdefault(normalize(mid), mid)
+                for name in (mid, *details):
+                    for term in _name_terms(name):
+                        owners.setdefault(term, set()).add(mid)
+
+        self.keys: dict[str, Optional[str]] = {}
+        for term, keys in owners.items():
+            self.keys[term] = exact.get(term) or (next(iter(keys)) if len(keys) == 1 else None)
+        self.automaton = KeywordAutomaton(self.keys)
+
+    def spot(self, utterance: str) -> tuple[str, list[str], list[str]]:
+        """
+        Returns:
+            tuple: (판정 hit | ambiguous | negated | miss, 확정된 키 목록, 일치한 용어 목록)
+        """
+        matches = leftmost_longest(self.automaton.find_all(normalize(utterance)))
+        terms = [term for _, _, term in matches]
+        if not matches:
+            return "miss", [], terms
+        if NEGATION_PATTERN.search(utterance):
+            return "negated", [], terms
+
+        keys = []
+        for term in terms:
+            key = self.keys[term]
+            if key is None:
+                return "ambiguous", [], terms
+            if key not in keys:
+                keys.append(key)
+        if len(keys) > KEYWORD_SPOTTER_MAX_KEYWORDS:
+            return "ambiguous", [], terms
+        return "hit", keys, terms
+
+
+# =====================================================
+# 3️⃣ 조회 (stage 1)
+# =====================================================
+_lock = threading.Lock()
+_spotter: Optional[KeywordSpotter] = None
+_spotter_mtime: Optional[float] = None
+
+
+def get_keyword_spotter() -> KeywordSpotter:
+    """카탈로그 파일이 바뀌지 않았으면 만들어 둔 오토마톤 재사용"""
+    global _spotter, _spotter_mtime
+    try:
+        mtime = CATEGORY_KEYS_JSON.stat().st_mtime
+    except OSError:
+        mtime = None
+    with _lock:
+        if _spotter is None or mtime != _spotter_mtime:
+            from app.utils.build_category_dict import load_category_keys
+
+            _spotter = KeywordSpotter(load_category_keys())
+            _spotter_mtime = mtime
+        return _spotter
+
+
+def spot_keywords(utterance: str) -> Optional[list]:
+    """
+    발화에서 카탈로그 이름이 명확하게 잡히면 validate_llm 결과 대신 쓸 키 목록
+
+    Returns:
+        list | None: [True, 키, …] (build_category_dict 입력), 빠른 경로를 쓸 수 없으면 None
+    """
+    if not KEYWORD_SPOTTER_ENABLED:
+        return None
+    result, keys, _ = get_keyword_spotter().spot(utterance)
+    KEYWORD_SPOTTER.inc(result=result)
+    record_cache("keyword_spotter", result == "hit")
+    return [True, *keys] if result == "hit" else None
+
+
+# =====================================================
+# 4️⃣ CLI
+# =====================================================
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description="stage 1 카탈로그 키워드 빠른 경로")
+    sub = parser.add_subparsers(dest="command", required=True)
+    spot = sub.add_parser("spot", help="발화 1개 판정")
+    spot.add_argument("utterance")
+    stats = sub.add_parser("stats", help="질의 로그 전체의 판정 분포 (빠른 경로 적중률)")
+    stats.add_argument("log", type=Path, help="텍스트(한 줄 1발화) 또는 JSONL(.jsonl / .jsonl.gz)")
+    stats.add_argument("--examples", type=int, default=3, help="판정별로 보여 줄 예시 수")
+    args = parser.parse_args(argv)
+
+    spotter = get_keyword_spotter()
+    if args.command == "spot":
+        result, keys, terms = spotter.spot(args.utterance)
+        print(f"판정: {result}")
+        print(f"일치 용어: {terms}")
+        print(f"키: {keys}")
+        return 0
+
+    from app.services.recommendation_table import read_query_log
+
+    counts: Counter = Counter()
+    examples: dict[str, list[str]] = {}
+    for utterance in read_query_log(args.log):
+        result, keys, terms = spotter.spot(utterance)
+        counts[result] += 1
+        bucket = examples.setdefault(result, [])
+        if len(bucket) < args.examples:
+            bucket.append(f"{utterance} → {keys or terms}")
+
+    total = sum(counts.values())
+    if not total:
+        print("❌ 질의가 없습니다.")
+        return 1
+    print(f"📊 질의 {total:,}개 · 용어 {len(spotter.automaton):,}개")
+    for result in ("hit", "ambiguous", "negated", "miss"):
+        print(f"  {result:<10}{counts[result]:>8,}  {counts[result] / total:>6.1%}")
+        for example in examples.get(result, []):
+            print(f"      {example}")
+    print(f"\n✅ validate_llm 생략 비율: {counts['hit'] / total:.1%}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,255 @@
+"""
+recommendation_table.py
+──────────────────────────────
+- 자주 들어오는 stage 1 질의의 추천 결과를 미리 계산해 둔 조회 테이블
+- 오프라인 배치: 질의 로그 → 정규화 / 군집화 → 군집당 recommend_category 1회 (동시 실행 제한)
+  → storage/recommendation_table.json
+- handle_stage_1 은 LLM 호출 전에 lookup_recommendation() 으로 테이블을 먼저 확인
+- 테이블에는 카탈로그(category_structure_keys.json) / 프롬프트 / 모델 버전을 기록하고,
+  현재 버전과 다르면 테이블을 사용하지 않음
+
+📌 질의 로그 형식
+- 텍스트 파일: 한 줄에 발화 1개
+- JSONL(.jsonl / .jsonl.gz): {"utterance": "..."} (stage 필드가 있으면 stage 1 만 사용)
+
+📌 CLI
+    python -m app.services.recommendation_table build queries.txt --top 200 --min-count 3 --concurrency 4
+    python -m app.services.recommendation_table show
+"""
+
+import argparse
+import asyncio
+import gzip
+import hashlib
+import json
+import os
+import re
+import sys
+import time
+from collections import Counter
+from pathlib import Path
+from typing import Iterator, Optional
+
+from app.utils.metrics import record_cache
+from app.utils.serializer import read_json, write_json
+
+# =====================================================
+# 0️⃣ 전역 설정
+# =====================================================
+PROJECT_ROOT = Path(__file__).resolve().parent.parent.parent
+TABLE_PATH = Path(os.getenv("RECOMMENDATION_TABLE_PATH") or PROJECT_ROOT / "storage" / "recommendation_table.json")
+CATEGORY_KEYS_JSON = PROJECT_ROOT / "storage" / "category_structure_keys.json"
+PROMPT_FILES = (
+    "validate_system_prompt.txt",
+    "validate_user_prompt.txt",
+    "refine_system_prompt.txt",
+    "refine_user_prompt.txt",
+)
+
+# 의미 없이 붙는 요청 표현 (정규화 시 제거)
+FILLER_PATTERN = re.compile(
+    r"(추천\s*(좀\s*)?(해\s*)?(줘|주세요|주라|부탁(해|해요|합니다|드려요)?)|추천|찾고\s*있어(요)?|찾아\s*줘|보고\s*있어(요)?"
+    r"|사려고(요)?|살건데|사고\s*싶어(요)?|필요해(요)?|원해(요)?|있을까(요)?|알려\s*줘|좀)$"
+)
+PUNCT_PATTERN = re.compile(r"[^\w\s·/]")
+
+
+# =====================================================
+# 1️⃣ 정규화 / 버전
+# =====================================================
+def normalize_query(utterance: str) -> str:
+    """
+    군집 키: 소문자 · 문장부호 제거 · 끝에 붙는 요청 표현 제거 · 토큰 정렬
+    예) "노트북 추천해줘!" / "노트북 추천 부탁해" → "노트북"
+    """
+    text = PUNCT_PATTERN.sub(" ", utterance.lower()).strip()
+    previous = None
+    while text and text != previous:
+        previous = text
+        text = FILLER_PATTERN.sub("", text).strip()
+    return " ".join(sorted(text.split()))
+
+
+def _file_digest(paths) -> str:
+    digest = hashlib.sha256()
+    for path in paths:
+        try:
+            digest.update(Path(path).read_bytes())
+        except FileNotFoundError:
+            digest.update(b"-")
+    return digest.hexdigest()[:16]
+
+
+def current_version() -> dict:
+    """카탈로그 / 프롬프트 / 모델 / 프롬프트 예산 — 하나라도 바뀌면 테이블 무효"""
+    from chatbot_llm.llm_router import LLM_MODEL_DEFAULT
+    from chatbot_llm.prompt_budget import PROMPT_BUDGET_REFINE
+
+    return {
+        "catalog": _file_digest([CATEGORY_KEYS_JSON]),
+        "prompts": _file_digest(PROJECT_ROOT / "prompts" / name for name in PROMPT_FILES),
+        "model": LLM_MODEL_DEFAULT,
+        "refine_budget": PROMPT_BUDGET_REFINE,
+    }
+
+
+# =====================================================
+# 2️⃣ 조회 (서버)
+# =====================================================
+_table: Optional[dict] = None
+_table_stamp: Optional[tuple] = None
+
+
+def _load_table() -> Optional[dict]:
+    """테이블 / 카탈로그 파일이 바뀌었을 때만 다시 로드, 버전이 다르면 None"""
+    global _table, _table_stamp
+    try:
+        stamp = (TABLE_PATH.stat().st_mtime_ns, CATEGORY_KEYS_JSON.stat().st_mtime_ns)
+    except FileNotFoundError:
+        _table, _table_stamp = None, None
+        return None
+    if stamp == _table_stamp:
+        return _table
+
+    _table_stamp = stamp
+    try:
+        table = read_json(TABLE_PATH)
+    except Exception as e:
+        print(f"⚠️ 추천 테이블 로드 실패: {e}")
+        _table = None
+        return None
+    if table.get("version") != current_version():
+        print("⚠️ 추천 테이블 버전이 현재 카탈로그/프롬프트와 달라 사용하지 않습니다. 다시 생성해 주세요.")
+        _table = None
+        return None
+    _table = table
+    return _table
+
+
+def lookup_recommendation(utterance: str) -> Optional[list]:
+    """
+    미리 계산된 추천 결과 조회
+
+    Returns:
+        list | None: recommend_category 와 같은 [True, {...}] 결과, 없으면 None
+    """
+    table = _load_table()
+    if table is None:
+        return None
+    entry = table["entries"].get(normalize_query(utterance))
+    record_cache("recommendation_table", entry is not None)
+    return entry["result"] if entry else None
+
+
+def table_size() -> int:
+    """현재 사용 가능한 테이블 항목 수 (없거나 버전이 다르면 0, 기동 시 warm-up 에서 미리 로드하는 용도)"""
+    table = _load_table()
+    return len(table["entries"]) if table else 0
+
+
+# =====================================================
+# 3️⃣ 배치 생성
+# =====================================================
+def read_query_log(path: Path) -> Iterator[str]:
+    opener = gzip.open if str(path).endswith(".gz") else open
+    with opener(path, "rt", encoding="utf-8") as f:
+        is_jsonl = ".jsonl" in Path(path).name
+        for line in f:
+            line = line.strip()
+            if not line:
+                continue
+            if not is_jsonl:
+                yield line
+                continue
+            try:
+                record = json.loads(line)
+            except json.JSONDecodeError:
+                continue
+            if record.get("stage", 1) == 1 and record.get("utterance"):
+                yield record["utterance"]
+
+
+def cluster_queries(utterances, min_count: int = 1, top: int = 200) -> list[dict]:
+    """
+    정규화 키로 군집화 → 빈도순 상위 top 개
+
+    Returns:
+        list[dict]: [{"key", "count", "utterance"(가장 많이 나온 원문)}, …]
+    """
+    clusters: dict[str, Counter] = {}
+    for utterance in utterances:
+        key = normalize_query(utterance)
+        if key:
+            clusters.setdefault(key, Counter())[utterance.strip()] += 1
+
+    ranked = sorted(clusters.items(), key=lambda kv: -sum(kv[1].values()))
+    return [
+        {"key": key, "count": sum(raw.values()), "utterance": raw.most_common(1)[0][0]}
+        for key, raw in ranked[:top]
+        if sum(raw.values()) >= min_count
+    ]
+
+
+async def build_table(clusters: list[dict], concurrency: int = 4) -> dict:
+    """
+    군집 대표 발화마다 recommend_category 를 1회 실행 (동시 실행 concurrency 개)
+    실패한 군집은 테이블에 넣지 않음
+    """
+    from app.services.category_recommendation_service import recommend_category
+
+    semaphore = asyncio.Semaphore(concurrency)
+    entries = {}
+
+    async def run(cluster: dict) -> None:
+        async with semaphore:
+            result = await recommend_category(cluster["utterance"])
+        if result and result[0] is True:
+            entries[cluster["key"]] = {"result": result, "utterance": cluster["utterance"], "count": cluster["count"]}
+        else:
+            print(f"⚠️ 추천 실패 → 제외: {cluster['utterance']}")
+
+    await asyncio.gather(*(run(c) for c in clusters))
+    return {
+        "version": current_version(),
+        "created_at": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "entries": entries,
+    }
+
+
+# =====================================================
+# CLI
+# =====================================================
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description="stage 1 추천 결과 사전 계산 테이블")
+    sub = parser.add_subparsers(dest="command", required=True)
+    build = sub.add_parser("build", help="질의 로그로 테이블 생성")
+    build.add_argument("log", type=Path, help="질의 로그 (텍스트 / JSONL / .gz)")
+    build.add_argument("--top", type=int, default=200, help="빈도 상위 N개 군집")
+    build.add_argument("--min-count", type=int, default=2, help="최소 등장 횟수")
+    build.add_argument("--concurrency", type=int, default=4, help="동시 recommend_category 실행 수")
+    build.add_argument("--out", type=Path, default=TABLE_PATH)
+    sub.add_parser("show", help="현재 테이블 요약")
+    args = parser.parse_args(argv)
+
+    if args.command == "build":
+        clusters = cluster_queries(read_query_log(args.log), args.min_count, args.top)
+        covered = sum(c["count"] for c in clusters)
+        print(f"📊 군집 {len(clusters)}개 (질의 {covered}건 커버)")
+        table = asyncio.run(build_table(clusters, args.concurrency))
+        write_json(args.out, table, pretty=True)
+        print(f"💾 저장: {args.out} (항목 {len(table['entries'])}개)")
+        return 0
+
+    if not TABLE_PATH.exists():
+        print(f"⚠️ 테이블이 없습니다: {TABLE_PATH}")
+        return 1
+    table = read_json(TABLE_PATH)
+    valid = table.get("version") == current_version()
+    print(f"📄 {TABLE_PATH} ({table.get('created_at')}) 항목 {len(table['entries'])}개, 버전 {'일치' if valid else '불일치 ❌'}")
+    for key, entry in sorted(table["entries"].items(), key=lambda kv: -kv[1]["count"])[:20]:
+        print(f"  {entry['count']:>6}  {key}  ← {entry['utterance']}")
+    return 0 if valid else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
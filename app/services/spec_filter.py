@@ -0,0 +1,321 @@
+"""
+spec_filter.py
+──────────────────────────────
+- stage 4: 크롤링한 스펙 옵션(제조사 / 브랜드 …, 또는 nav_3depth 링크)에서 사용자가 고른 항목을 LLM 없이 해석
+- 카테고리(URL)별로 옵션 역색인 1개 생성 → 프로세스 메모리 LRU 캐시 (없으면 spec_store 에서 다시 생성)
+  - exact : 정규화한 값(소문자 · 공백/기호 제거) → 옵션 ID
+  - grams : 정규화한 값의 글자 bigram(1글자 값은 그 글자) → 옵션 ID 집합
+- 입력 해석 순서
+  1. 번호 / 번호 목록 / 범위 ("3", "1, 4번", "2~5") → 화면에 표시된 목록(format_crawled_result 와 같은 순서) 기준
+  2. 발화 전체가 하나의 값과 정규화 후 완전 일치
+  3. 구분자(, / · 및 and, 붙여 쓴 와 · 과 · 랑 · 이랑 · 하고)로 나눈 각 부분이 모두 해석되면 → 다중 선택
+  4. 발화 전체를 bigram Dice 점수 (+ 포함 관계) 로 부분 일치
+- 결과
+  - options   : 선택한 (속성, 값) 목록 → 세션의 필터에 누적
+  - nav       : 선택한 nav 항목의 하위 카테고리 URL (stage 3 확인 → 크롤링으로 이어짐)
+  - ambiguous : 비슷한 값이 여러 개 → 후보 제시
+  - none      : 일치하는 항목 없음
+
+📌 환경 변수
+- SPEC_FILTER_CACHE_SIZE : 메모리에 유지할 카테고리 인덱스 수 (기본 256)
+- SPEC_FILTER_MIN_SCORE  : 부분 일치로 인정할 최소 점수 0~1 (기본 0.5)
+
+📌 사용 예
+    register_spec_options(url, crawled_data)
+    selection = get_option_index(url).resolve("삼성, LG", attr="제조사")
+"""
+
+import os
+import re
+import threading
+import time
+from collections import OrderedDict
+from typing import Optional
+
+from app.utils.metrics import counter
+from app.utils.tracing import span
+
+# =====================================================
+# 0️⃣ 전역 설정
+# =====================================================
+SPEC_FILTER_CACHE_SIZE = int(os.getenv("SPEC_FILTER_CACHE_SIZE", "256"))
+SPEC_FILTER_MIN_SCORE = float(os.getenv("SPEC_FILTER_MIN_SCORE", "0.5"))
+NAV_ATTR = "nav"
+
+NORMALIZE_PATTERN = re.compile(r"[\s\-_·/.,()\[\]]+")
+NUMBER_LIST_PATTERN = re.compile(r"^\s*\d+\s*번?(?:\s*(?:[,/~\-]|와|과|랑|이랑|및|하고|and)?\s*\d+\s*번?)*\s*$")
+RANGE_PATTERN = re.compile(r"(\d+)\s*번?\s*[~\-]\s*(\d+)")
+NUMBER_PATTERN = re.compile(r"\d+")
+SPLIT_PATTERN = re.compile(r"\s*(?:[,/·]|(?<=\S)(?:이랑|랑|와|과|하고)\s+|\s+(?:및|and)\s+)\s*")
+SUFFIX_PATTERN = re.compile(r"(?:으로|로|만|요|이요|을|를|번)$")
+
+SPEC_FILTER_SELECTIONS = counter(
+    "spec_filter_selections_total",
+    "stage 4 옵션 선택 해석 결과 (kind=options|nav|ambiguous|none)",
+    ("kind",),
+)
+
+
+def normalize(text: str) -> str:
+    return NORMALIZE_PATTERN.sub("", text).lower()
+
+
+def _grams(text: str) -> set[str]:
+    if len(text) < 2:
+        return {text} if text else set()
+    return {text[i:i + 2] for i in range(len(text) - 1)}
+
+
+# =====================================================
+# 1️⃣ 선택 결과
+# =====================================================
+class Selection:
+    """
+    resolve() 결과
+
+    Attributes:
+        kind (str): options | nav | ambiguous | none
+        options (list[tuple[str, str]]): 선택한 (속성, 값), nav 이면 (nav, 이름)
+        url (str | None): nav 선택 시 하위 카테고리 URL
+        candidates (list[tuple[str, str]]): ambiguous 일 때 후보
+        message (str): none 일 때 안내 문구
+    """
+
+    def __init__(self, kind: str, options: Optional[list] = None, url: Optional[str] = None,
+                 candidates: Optional[list] = None, message: str = ""):
+        self.kind = kind
+        self.options = options or []
+        self.url = url
+        self.candidates = candidates or []
+        self.message = message
+
+    def filters(self) -> dict[str, list[str]]:
+        """선택한 옵션을 {속성: [값, …]} 으로 (입력 순서 유지, 중복 제거)"""
+        grouped: dict[str, list[str]] = {}
+        for attr, value in self.options:
+            values = grouped.setdefault(attr, [])
+            if value not in values:
+                values.append(value)
+        return grouped
+
+
+# =====================================================
+# 2️⃣ 카테고리별 옵션 역색인
+# =====================================================
+class SpecOptionIndex:
+    """
+    크롤링 결과 1건 ({속성: [값, …]} 또는 {"nav": {이름: URL}})의 역색인
+
+    Args:
+        data (dict): extract_spec_options() 결과
+    """
+
+    def __init__(self, data: dict):
+        self.options: list[tuple[str, str]] = []
+        self.nav_urls: dict[str, str] = {}
+        self.by_attr: dict[str, list[int]] = {}
+        self.exact: dict[str, list[int]] = {}
+        self.grams: dict[str, set[int]] = {}
+        self._gram_counts: list[int] = []
+        self._norms: list[str] = []
+
+        for attr, values in data.items():
+            if attr == NAV_ATTR:
+                if isinstance(values, dict):
+                    self.nav_urls.update(values)
+                    for name in values:
+                        self._add(NAV_ATTR, name)
+            elif isinstance(values, list):
+                for value in values:
+                    self._add(attr, value)
+
+    def _add(self, attr: str, value: str) -> None:
+        option_id = len(self.options)
+        norm = normalize(value)
+        grams = _grams(norm)
+        self.options.append((attr, value))
+        self._norms.append(norm)
+        self._gram_counts.append(len(grams))
+        self.by_attr.setdefault(attr, []).append(option_id)
+        self.exact.setdefault(norm, []).append(option_id)
+        for gram in grams:
+            self.grams.setdefault(gram, set()).add(option_id)
+
+    @property
+    def attributes(self) -> list[str]:
+        return [attr for attr in self.by_attr if attr != NAV_ATTR]
+
+    def display_attr(self) -> Optional[str]:
+        """format_crawled_result 가 번호 목록으로 보여주는 속성 (첫 옵션 속성, 없으면 nav)"""
+        for attr in self.attributes:
+            return attr
+        return NAV_ATTR if NAV_ATTR in self.by_attr else None
+
+    def values(self, attr: str) -> list[str]:
+        return [self.options[i][1] for i in self.by_attr.get(attr, ())]
+
+    # ----------------------------- 해석 -----------------------------
+    def resolve(self, utterance: str, attr: Optional[str] = None) -> Selection:
+        """
+        사용자 입력 → 선택 결과
+
+        Args:
+            utterance (str): 사용자 입력
+            attr (str | None): 번호가 가리키는 현재 표시 목록의 속성 (기본 display_attr())
+        """
+        attr = attr or self.display_attr()
+        text = utterance.strip()
+
+        if NUMBER_LIST_PATTERN.match(text):
+            selection = self._resolve_numbers(text, attr)
+        else:
+            selection = self._resolve_text(text)
+        SPEC_FILTER_SELECTIONS.inc(kind=selection.kind)
+        return selection
+
+    def _resolve_numbers(self, text: str, attr: Optional[str]) -> Selection:
+        ids = self.by_attr.get(attr, []) if attr else []
+        if not ids:
+            return Selection("none", message="선택할 수 있는 항목이 없습니다.")
+
+        numbers: list[int] = []
+        for start, end in RANGE_PATTERN.findall(text):
+            # "5~2" 처럼 뒤집힌 범위는 빈 선택이 되어 같은 목록이 다시 표시되므로 번호 안내로 처리
+            if int(start) > int(end) or int(end) > len(ids):
+                return Selection("none", message=f"1~{len(ids)} 사이의 번호를 입력해 주세요.")
+            numbers.extend(range(int(start), int(end) + 1))
+        numbers.extend(int(n) for n in NUMBER_PATTERN.findall(RANGE_PATTERN.sub(" ", text)))
+
+        if any(not 1 <= n <= len(ids) for n in numbers):
+            return Selection("none", message=f"1~{len(ids)} 사이의 번호를 입력해 주세요.")
+        return self._selection([ids[n - 1] for n in numbers])
+
+    def _resolve_text(self, text: str) -> Selection:
+        norm = normalize(text)
+        whole = self._exact(norm)
+        if whole is not None:
+            return whole
+
+        parts = [p for p in SPLIT_PATTERN.split(text) if p.strip()]
+        split_result = None
+        if len(parts) >= 2:
+            chosen: list[int] = []
+            for part in parts:
+                matched = self._match(normalize(part))
+                if matched.kind != "options" and matched.kind != "nav":
+                    split_result = split_result or matched
+                    break
+                chosen.extend(self._id_of(option) for option in matched.options)
+            else:
+                return self._selection(chosen)
+
+        whole = self._fuzzy(norm)
+        if whole.kind == "none" and split_result is not None and split_result.kind == "ambiguous":
+            return split_result
+        return whole
+
+    def _match(self, norm: str) -> Selection:
+        """값 1개 해석: 완전 일치 (접미사 제거 포함) → bigram 점수"""
+        return self._exact(norm) or self._fuzzy(norm)
+
+    def _exact(self, norm: str) -> Optional[Selection]:
+        for key in (norm, SUFFIX_PATTERN.sub("", norm)):
+            ids = self.exact.get(key) if key else None
+            if ids:
+                if len({self.options[i][1] for i in ids}) == 1:
+                    return self._selection(ids[:1])
+                return Selection("ambiguous", candidates=[self.options[i] for i in ids])
+        return None
+
+    def _fuzzy(self, norm: str) -> Selection:
+        scored = self._score(SUFFIX_PATTERN.sub("", norm) or norm) if norm else []
+        if not scored or scored[0][0] < SPEC_FILTER_MIN_SCORE:
+            return Selection("none", message="일치하는 항목을 찾지 못했습니다.")
+        best = scored[0][0]
+        top = [option_id for score, option_id in scored if score == best]
+        if len(top) == 1:
+            return self._selection(top)
+        return Selection("ambiguous", candidates=[self.options[i] for i in top[:10]])
+
+    def _score(self, norm: str) -> list[tuple[float, int]]:
+        """bigram 역색인으로 후보를 모아 Dice 점수 (한쪽이 다른 쪽을 포함하면 최소 0.9)"""
+        query = _grams(norm)
+        hits: dict[int, int] = {}
+        for gram in query:
+            for option_id in self.grams.get(gram, ()):
+                hits[option_id] = hits.get(option_id, 0) + 1
+
+        scored = []
+        for option_id, shared in hits.items():
+            score = 2 * shared / (len(query) + self._gram_counts[option_id])
+            option_norm = self._norms[option_id]
+            if norm in option_norm or option_norm in norm:
+                score = max(score, 0.9)
+            scored.append((round(score, 6), option_id))
+        scored.sort(key=lambda item: (-item[0], item[1]))
+        return scored
+
+    def _id_of(self, option: tuple[str, str]) -> int:
+        return self.options.index(option)
+
+    def _selection(self, ids: list[int]) -> Selection:
+        options = [self.options[i] for i in dict.fromkeys(ids)]
+        nav = [name for attr, name in options if attr == NAV_ATTR]
+        if nav:
+            # nav 는 하위 카테고리 1개로 이동 (여러 개면 첫 항목)
+            return Selection("nav", options=[(NAV_ATTR, nav[0])], url=self.nav_urls.get(nav[0]))
+        return Selection("options", options=options)
+
+
+# =====================================================
+# 3️⃣ 카테고리별 인덱스 캐시
+# =====================================================
+_indexes: "OrderedDict[str, SpecOptionIndex]" = OrderedDict()
+_indexes_lock = threading.Lock()
+
+
+def register_spec_options(url: str, data: dict) -> SpecOptionIndex:
+    """크롤링 직후 인덱스 생성 · 캐시 (같은 URL 은 교체)"""
+    with span("spec_filter.build", url=url):
+        index = SpecOptionIndex(data)
+    with _indexes_lock:
+        _indexes[url] = index
+        _indexes.move_to_end(url)
+        while len(_indexes) > SPEC_FILTER_CACHE_SIZE:
+            _indexes.popitem(last=False)
+    return index
+
+
+def get_option_index(url: Optional[str]) -> Optional[SpecOptionIndex]:
+    """
+    URL 의 옵션 인덱스 (캐시에 없으면 spec_store 의 최신 크롤링 결과로 생성, 그래도 없으면 None)
+    """
+    if not url:
+        return None
+    with _indexes_lock:
+        index = _indexes.get(url)
+        if index is not None:
+            _indexes.move_to_end(url)
+            return index
+
+    from app.utils.spec_store import get_spec_store
+
+    record = get_spec_store().get(url)
+    if record is None:
+        return None
+    return register_spec_options(url, record["data"])
+
+
+# =====================================================
+# CLI 테스트
+# =====================================================
+if __name__ == "__main__":
+    sample = SpecOptionIndex({
+        "제조사": ["삼성전자", "LG전자", "애플", "레노버", "ASUS"],
+        "브랜드": ["갤럭시북", "그램", "맥북", "씽크패드", "ROG"],
+    })
+    for query in ["2", "1, 3번", "2~4", "삼성", "lg 전자", "그램이랑 맥북", "델"]:
+        start = time.perf_counter()
+        result = sample.resolve(query)
+        elapsed = (time.perf_counter() - start) * 1e6
+        print(f"{query!r:<14} → {result.kind:<9} {result.options or result.candidates or result.message} ({elapsed:.1f}µs)")
@@ -0,0 +1,231 @@
+"""
+warmup.py
+──────────────────────────────
+- 서버 기동 직후 warm-up: 첫 사용자가 떠안던 초기화 비용을 배포 시점에 미리 처리
+- FastAPI lifespan(app/main.py)에서 run_warmup() 을 백그라운드 작업으로 실행
+  → 끝나기 전까지 GET /ready 는 503, 필수 점검이 모두 통과하면 200 (롤링 배포 시 트래픽 투입 기준)
+
+📌 단계 (순서대로 실행, 단계별 소요 시간 / 결과를 WarmupState 에 기록)
+1. catalog   : 카탈로그 스냅샷 (없으면 category_structure*.json) 로드 · 구조 검증, 추천 테이블 로드, 스펙 저장소 열기
+2. prompts   : prompts/*.txt 캐시 적재 + format 자리표시자 검증 (chatbot_llm/prompt_loader.py)
+3. clients   : requests 세션(다나와) · AsyncOpenAI 클라이언트 생성, tiktoken 인코딩 로드, 크롤링 스케줄러 생성
+4. browsers  : Chrome 드라이버를 WARMUP_BROWSERS 개 미리 기동 (CRAWL_BROWSER_POOL 이하, 0 이면 건너뜀)
+5. synthetic : WARMUP_SYNTHETIC_REQUESTS 개 샘플 발화로 recommend_category 실행 (선택, 실패해도 ready 에 영향 없음)
+
+📌 환경 변수
+- WARMUP_ENABLED            : 0 이면 warm-up 없이 바로 ready (기본 1)
+- WARMUP_BLOCKING           : 1 이면 warm-up 이 끝난 뒤에 요청을 받기 시작 (기본 0 → /ready 로 판단)
+- WARMUP_BROWSERS           : 미리 띄울 드라이버 수 (기본 CRAWL_BROWSER_POOL)
+- WARMUP_SYNTHETIC_REQUESTS : 합성 요청 수 (기본 0, 실제 LLM 호출 비용 발생 — LLM_CASSETTE_MODE=replay 권장)
+- WARMUP_UTTERANCES         : 합성 요청 발화 목록 (쉼표 구분, 비우면 기본 샘플)
+"""
+
+import asyncio
+import json
+import os
+import time
+from pathlib import Path
+from typing import Optional
+
+from app.utils.metrics import gauge
+from app.utils.tracing import span
+
+# =====================================================
+# 0️⃣ 전역 설정
+# =====================================================
+PROJECT_ROOT = Path(__file__).resolve().parent.parent.parent
+CATEGORY_JSON_PATH = PROJECT_ROOT / "storage" / "category_structure.json"
+CATEGORY_KEYS_JSON = PROJECT_ROOT / "storage" / "category_structure_keys.json"
+
+WARMUP_ENABLED = os.getenv("WARMUP_ENABLED", "1") == "1"
+WARMUP_BLOCKING = os.getenv("WARMUP_BLOCKING", "0") == "1"
+WARMUP_BROWSERS = os.getenv("WARMUP_BROWSERS", "")  # 비우면 CRAWL_BROWSER_POOL
+WARMUP_SYNTHETIC_REQUESTS = int(os.getenv("WARMUP_SYNTHETIC_REQUESTS", "0"))
+WARMUP_UTTERANCES = [u.strip() for u in os.getenv("WARMUP_UTTERANCES", "").split(",") if u.strip()] or [
+    "사무실에서 쓸 만한 노트북 추천해줘",
+    "무선 청소기 추천 부탁해",
+    "거실용 75인치 TV",
+]
+
+APP_READY = gauge("app_ready", "warm-up 완료 여부 (1 = /ready 200)")
+WARMUP_STEP_DURATION = gauge("warmup_step_duration_seconds", "warm-up 단계별 소요 시간", ("step", "ok"))
+
+
+# =====================================================
+# 1️⃣ 상태
+# =====================================================
+class WarmupState:
+    """
+    warm-up 진행 상태 (/ready 응답 본문)
+
+    Attributes:
+        status (str): pending | running | ready | failed
+        steps (dict): {단계: {"ok", "required", "ms", "detail"}}
+    """
+
+    def __init__(self):
+        self.status = "pending"
+        self.steps: dict[str, dict] = {}
+        self.started_at: Optional[float] = None
+        self.finished_at: Optional[float] = None
+
+    @property
+    def ready(self) -> bool:
+        return self.status == "ready"
+
+    def record(self, name: str, ok: bool, required: bool, elapsed: float, detail) -> None:
+        self.steps[name] = {"ok": ok, "required": required, "ms": round(elapsed * 1000, 1), "detail": detail}
+        WARMUP_STEP_DURATION.set(elapsed, step=name, ok=str(ok).lower())
+        mark = "✅" if ok else ("❌" if required else "⚠️")
+        print(f"{mark} warm-up {name}: {detail} ({elapsed * 1000:.0f}ms)")
+
+    def to_dict(self) -> dict:
+        elapsed = None
+        if self.started_at is not None:
+            elapsed = round(((self.finished_at or time.time()) - self.started_at) * 1000, 1)
+        return {"ready": self.ready, "status": self.status, "elapsed_ms": elapsed, "steps": self.steps}
+
+
+warmup_state = WarmupState()
+
+
+# =====================================================
+# 2️⃣ 단계
+# =====================================================
+def warm_catalog() -> str:
+    """카탈로그 인덱스 로드 · 검증 (스냅샷이 없으면 JSON 을 읽어 구조 확인)"""
+    from app.services.keyword_spotter import get_keyword_spotter
+    from app.services.recommendation_table import table_size
+    from app.utils.catalog_snapshot import get_catalog_snapshot
+    from app.utils.spec_store import get_spec_store
+
+    snapshot = get_catalog_snapshot()
+    if snapshot is not None:
+        tops = snapshot.top_names()
+        if not tops:
+            raise ValueError("카탈로그 스냅샷이 비어 있습니다.")
+        source = f"snapshot 대분류 {len(tops)}개"
+    else:
+        with open(CATEGORY_KEYS_JSON, "r", encoding="utf-8") as f:
+            keys = json.load(f)
+        with open(CATEGORY_JSON_PATH, "r", encoding="utf-8") as f:
+            structure = json.load(f)
+        if not keys or not isinstance(keys, dict):
+            raise ValueError("category_structure_keys.json 이 비어 있거나 형식이 잘못되었습니다.")
+        for top, mids in structure.items():
+            for mid, details in mids.items():
+                if any(len(item) != 2 for item in details):
+                    raise ValueError(f"category_structure.json 형식 오류: {top} > {mid}")
+        source = f"JSON 대분류 {len(keys)}개 (스냅샷 없음)"
+
+    get_spec_store()
+    terms = len(get_keyword_spotter().automaton)
+    return f"{source}, 추천 테이블 {table_size()}건, 키워드 {terms}개"
+
+
+def warm_prompts() -> str:
+    from chatbot_llm.prompt_loader import PROMPT_FIELDS, preload_prompts
+
+    problems = preload_prompts()
+    if problems:
+        raise ValueError("; ".join(problems))
+    return f"프롬프트 {len(PROMPT_FIELDS)}개"
+
+
+def warm_clients() -> str:
+    """HTTP 커넥션 풀 / LLM 클라이언트 / 토크나이저 / 크롤링 스케줄러 생성"""
+    from app.utils.http_cache import get_http_session
+    from chatbot_llm.llm_client import get_openai_client
+    from chatbot_llm.prompt_budget import count_tokens
+    from selenium_utils.crawl_scheduler import get_crawl_scheduler
+
+    get_http_session()
+    get_openai_client()
+    count_tokens("warm-up")
+    get_crawl_scheduler()
+    return "requests · AsyncOpenAI · tokenizer · crawl scheduler"
+
+
+def warm_browsers(count: int) -> str:
+    from selenium_utils.manufacturer_brand_crawler import CRAWL_BROWSER_POOL, prespawn_drivers
+
+    if count > CRAWL_BROWSER_POOL:
+        print(f"⚠️ WARMUP_BROWSERS({count}) > CRAWL_BROWSER_POOL({CRAWL_BROWSER_POOL}) → {CRAWL_BROWSER_POOL}개만 유지")
+    spawned = prespawn_drivers(count)
+    return f"드라이버 {spawned}개 기동"
+
+
+async def warm_synthetic(count: int) -> str:
+    """샘플 발화로 stage 1 추천 경로(LLM 포함)를 실제로 한 번씩 실행"""
+    from app.services.category_recommendation_service import recommend_category
+
+    utterances = [WARMUP_UTTERANCES[i % len(WARMUP_UTTERANCES)] for i in range(count)]
+    results = await asyncio.gather(*(recommend_category(u) for u in utterances), return_exceptions=True)
+    succeeded = sum(1 for r in results if isinstance(r, list) and r and r[0] is True)
+    return f"합성 요청 {succeeded}/{len(utterances)}건 성공"
+
+
+def _browser_count() -> int:
+    if WARMUP_BROWSERS:
+        return int(WARMUP_BROWSERS)
+    from selenium_utils.manufacturer_brand_crawler import CRAWL_BROWSER_POOL
+
+    return CRAWL_BROWSER_POOL
+
+
+# =====================================================
+# 3️⃣ 실행
+# =====================================================
+async def _run_step(state: WarmupState, name: str, fn, *args, required: bool = True) -> bool:
+    start = time.perf_counter()
+    try:
+        with span(f"warmup.{name}"):
+            if asyncio.iscoroutinefunction(fn):
+                detail = await fn(*args)
+            else:
+                detail = await asyncio.to_thread(fn, *args)
+        ok = True
+    except (Exception, SystemExit) as e:  # setup_selenium_driver 는 실패 시 sys.exit
+        detail, ok = f"{type(e).__name__}: {e}", False
+    state.record(name, ok, required, time.perf_counter() - start, detail)
+    return ok or not required
+
+
+async def run_warmup(state: WarmupState = warmup_state) -> bool:
+    """
+    warm-up 전체 실행 → state.status = ready | failed
+
+    Returns:
+        bool: 필수 단계가 모두 통과했는지
+    """
+    state.status, state.started_at, state.steps = "running", time.time(), {}
+    APP_READY.set(0)
+
+    if not WARMUP_ENABLED:
+        state.status, state.finished_at = "ready", time.time()
+        APP_READY.set(1)
+        return True
+
+    ok = True
+    ok &= await _run_step(state, "catalog", warm_catalog)
+    ok &= await _run_step(state, "prompts", warm_prompts)
+    ok &= await _run_step(state, "clients", warm_clients)
+
+    browsers = _browser_count()
+    if browsers > 0:
+        ok &= await _run_step(state, "browsers", warm_browsers, browsers)
+    if WARMUP_SYNTHETIC_REQUESTS > 0:
+        await _run_step(state, "synthetic", warm_synthetic, WARMUP_SYNTHETIC_REQUESTS, required=False)
+
+    state.status, state.finished_at = ("ready" if ok else "failed"), time.time()
+    APP_READY.set(1 if ok else 0)
+    print(f"{'✅' if ok else '❌'} warm-up {state.status}: {(state.finished_at - state.started_at) * 1000:.0f}ms")
+    return ok
+
+
+# =====================================================
+# CLI 테스트
+# =====================================================
+if __name__ == "__main__":
+    asyncio.run(run_warmup())
+    print(json.dumps(warmup_state.to_dict(), ensure_ascii=False, indent=2))
@@ -3,9 +3,20 @@ webhook_handler.py
 ──────────────────────────────
 - 카카오톡 webhook 요청 처리
 - 인증 상태 관리 & 단계별 대화 처리
+- 카카오 재전송 / 중복 전달 요청은 처리 중인 첫 요청의 응답을 재사용 (app/utils/idempotency.py)
+- stage 1~3 은 동시 실행 수를 제한하고, 포화 시 바로 재시도 안내 (app/utils/admission.py)
+- 요청마다 stage / 카테고리 / 캐시 적중 / 단계별 지연을 이벤트 로그에 기록 (app/utils/event_log.py)
+- 추천 목록 · 확인 질문은 버튼(listCard carousel / quickReplies)으로 응답 (app/utils/kakao_response.py)
+  → 버튼의 액션 값(mid_key · detail_key / confirm)이 돌아오면 category_match · is_affirmative LLM 호출 생략
+- stage 4: 크롤링한 옵션 중 고른 항목을 역색인으로 바로 해석 (app/services/spec_filter.py, LLM 없음)
+- 같은 유저의 요청은 유저별 액터로 한 번에 하나씩 처리 (app/utils/user_actor.py)
+  → 연달아 보낸 자유 발화는 합쳐서 한 번만 처리, 새 메시지가 오면 진행 중인 stage 1·2 LLM 작업은 취소
 """
 
-from app.utils.parser import extract_utterance, extract_user_id
+import asyncio
+from typing import Optional
+
+from app.utils.parser import extract_action_params, extract_utterance, extract_user_id
 from storage.token_manager import (
     get_user_token,
     is_token_expired,
@@ -13,13 +24,16 @@ from storage.token_manager import (
 )
 from app.utils.kakao_oauth import build_kakao_auth_url
 from app.services.category_recommendation_service import recommend_category
+from app.services.recommendation_table import lookup_recommendation
+from app.services.spec_filter import get_option_index, register_spec_options
 from app.services.category_flow_executor import (
     prepare_category_flow,
     execute_category_crawling
 )
 from app.utils.recommendation_formatter import (
     format_recommendation_message,
-    format_crawled_result
+    format_crawled_result,
+    format_filter_result
 )
 from app.utils.session_manager import (
     get_session,
@@ -27,21 +41,38 @@ from app.utils.session_manager import (
     clear_session
 )
 from app.utils.category_spec_storage import save_category_spec
+from app.utils.event_log import current_event, note_categories, step, webhook_event
+from app.utils.admission import BUSY_MESSAGE, STAGE_GATES, AdmissionRejected
+from app.utils.idempotency import IdempotencyCache, make_idempotency_key
+from app.utils.user_actor import TurnSkipped, UserActors
+from app.utils.kakao_response import (
+    ACTION_CONFIRM,
+    ACTION_SELECT,
+    confirm_quick_replies,
+    make_response,
+    quick_reply,
+    recommendation_response,
+    simple_text
+)
+from app.utils.metrics import STAGE_DURATION, STRUCTURED_ACTIONS
+from app.utils.tracing import span
 from fastapi import BackgroundTasks
 from chatbot_llm.is_affirmative_llm import is_affirmative
 
+# 중복 webhook 응답 캐시 (처리 중이면 대기, 완료 후에는 X-Request-Id 가 있을 때만 TTL 동안 재사용)
+webhook_idempotency = IdempotencyCache("webhook_idempotency")
+
+# 유저별 요청 직렬화 · 연속 메시지 합치기 (합치기 / 취소 여부는 현재 stage 기준)
+webhook_actors = UserActors(stage_of=lambda user_id: get_session(user_id).get("stage", 1))
+
+# stage 4 에서 처음(stage 1)으로 돌아가는 입력
+RESET_UTTERANCES = {"처음", "처음으로", "다시", "다른 상품", "종료", "그만"}
+
 # =======================================================
 # 공통 응답 생성
 # =======================================================
-def make_kakao_response(text: str) -> dict:
-    return {
-        "version": "2.0",
-        "template": {
-            "outputs": [
-                {"simpleText": {"text": text}}
-            ]
-        }
-    }
+def make_kakao_response(text: str, quick_replies: Optional[list] = None) -> dict:
+    return make_response([simple_text(text)], quick_replies)
 
 
 # =======================================================
@@ -68,63 +99,75 @@ def handle_auth_state(user_id: str, utterance: str, token_info: dict) -> str:
 # =======================================================
 # stage 1 핸들러
 # =======================================================
-async def handle_stage_1(user_id: str, utterance: str) -> str:
-    result = await recommend_category(utterance)
+async def handle_stage_1(user_id: str, utterance: str) -> str | dict:
+    # 자주 들어오는 질의는 미리 계산된 추천 테이블에서 바로 응답 (LLM 호출 없음)
+    with span("recommendation_table.lookup"):
+        result = lookup_recommendation(utterance)
+    if result is None:
+        result = await recommend_category(utterance)
     if result[0]:
+        note_categories(list(result[1]))
         response_text = format_recommendation_message(
             "추천 결과입니다:",
             result[1],
             "원하시는 항목 번호를 입력해 주세요!"
         )
         update_session(user_id, stage=2, user_utterance=utterance, bot_raw_result=result[1])
-    else:
-        response_text = result[1]
-        update_session(user_id, stage=1, user_utterance=utterance)
+        return recommendation_response(
+            "추천 결과입니다. 원하시는 항목을 눌러 주세요! (번호 입력도 가능합니다)", result[1], response_text
+        )
+    response_text = result[1]
+    update_session(user_id, stage=1, user_utterance=utterance)
     return response_text
 
 
 # =======================================================
 # stage 2 핸들러
 # =======================================================
-async def handle_stage_2(user_id: str, utterance: str) -> str:
-    flow_result = await prepare_category_flow(user_id, utterance)
+async def handle_stage_2(user_id: str, utterance: str, choice: Optional[tuple[str, str]] = None) -> str | dict:
+    flow_result = await prepare_category_flow(user_id, utterance, choice)
 
     if not flow_result or (isinstance(flow_result, list) and not flow_result[0]):
         return flow_result[1] if isinstance(flow_result, list) and len(flow_result) > 1 \
             else "죄송합니다. 요청하신 작업을 처리하지 못했습니다. 다시 시도해 주세요."
 
     mid_key, detail_key, url = flow_result[1]
+    note_categories([mid_key, detail_key])
     update_session(user_id, stage=3, user_utterance=utterance, bot_raw_result={
         "mid_key": mid_key,
         "detail_key": detail_key,
         "url": url
     })
 
-    return (
+    return make_kakao_response(
         f"🔍 선택하신 항목은 다음과 같습니다:\n"
         f"• 카테고리: {mid_key}\n"
         f"• 세부 항목: {detail_key}\n\n"
-        f"이 항목으로 진행할까요? 진행을 원하시면 긍정의 의사를 알려주세요."
+        f"이 항목으로 진행할까요? 진행을 원하시면 긍정의 의사를 알려주세요.",
+        confirm_quick_replies()
     )
 
 
 # =======================================================
 # stage 3 핸들러
 # =======================================================
-async def handle_stage_3(user_id: str, utterance: str, background_tasks) -> str:
+async def handle_stage_3(user_id: str, utterance: str, background_tasks, confirm: Optional[bool] = None) -> str:
     session = get_session(user_id)
     bot_data = session.get("last_bot_message", {})
     detail_key = bot_data.get("detail_key")
     url = bot_data.get("url")
+    note_categories([bot_data.get("mid_key"), detail_key])
 
-    # 🔷 LLM으로 긍정/부정 판단
-    affirmative = await is_affirmative(utterance)
+    # 🔷 버튼 응답이면 그대로, 아니면 LLM으로 긍정/부정 판단
+    affirmative = confirm if confirm is not None else await is_affirmative(utterance)
 
     if not affirmative:
         update_session(user_id, stage=1, user_utterance=utterance)
         return "✅ 이전 단계로 돌아갑니다. 원하시는 상품을 다시 말씀해 주세요!"
 
-    crawl_result = execute_category_crawling(detail_key, url)
+    # Selenium 크롤링은 블로킹 → 스레드에서 실행 (이벤트 루프가 다른 요청을 계속 처리)
+    with step("crawl"):
+        crawl_result = await asyncio.to_thread(execute_category_crawling, detail_key, url, user_id)
 
     if not crawl_result or (isinstance(crawl_result, list) and not crawl_result[0]):
         return crawl_result[1] if isinstance(crawl_result, list) and len(crawl_result) > 1 \
@@ -133,36 +176,192 @@ async def handle_stage_3(user_id: str, utterance: str, background_tasks) -> str:
     crawled_data = crawl_result[1]
 
     # 💾 저장을 비동기적으로 진행
-    background_tasks.add_task(save_category_spec, url, detail_key, crawled_data)
+    background_tasks.add_task(save_category_spec, url, detail_key, crawled_data, bot_data.get("mid_key"))
 
-    update_session(user_id, stage=4, user_utterance=utterance)
+    # stage 4 에서 옵션 선택을 바로 해석할 수 있도록 역색인 생성
+    index = register_spec_options(url, crawled_data)
+    update_session(user_id, stage=4, user_utterance=utterance, bot_raw_result={
+        "mid_key": bot_data.get("mid_key"),
+        "detail_key": detail_key,
+        "url": url,
+        "attr": index.display_attr(),
+        "filters": {}
+    })
 
     return format_crawled_result(crawled_data)
 
 
+# =======================================================
+# stage 4 핸들러
+# =======================================================
+async def handle_stage_4(user_id: str, utterance: str) -> str | dict:
+    session = get_session(user_id)
+    state = dict(session.get("last_bot_message") or {})
+    note_categories([state.get("mid_key"), state.get("detail_key")])
+
+    if utterance.strip() in RESET_UTTERANCES:
+        update_session(user_id, stage=1, user_utterance=utterance)
+        return "✅ 처음으로 돌아갑니다. 원하시는 상품을 말씀해 주세요!"
+
+    with span("spec_filter.resolve"):
+        index = get_option_index(state.get("url"))
+        selection = index.resolve(utterance, state.get("attr")) if index is not None else None
+
+    if selection is None:
+        update_session(user_id, stage=1, user_utterance=utterance)
+        return "죄송합니다. 이전 크롤링 결과를 찾지 못했습니다. 원하시는 상품을 다시 말씀해 주세요!"
+
+    if selection.kind == "none":
+        update_session(user_id, stage=4, user_utterance=utterance, bot_raw_result=state)
+        return f"죄송합니다. {selection.message}"
+
+    if selection.kind == "ambiguous":
+        update_session(user_id, stage=4, user_utterance=utterance, bot_raw_result=state)
+        lines = ["어떤 항목을 말씀하신 건가요?"] + [f"• {value}" for _, value in selection.candidates]
+        return make_kakao_response("\n".join(lines), [quick_reply(value) for _, value in selection.candidates])
+
+    if selection.kind == "nav":
+        # 하위 카테고리 → stage 3 확인 후 다시 크롤링
+        name = selection.options[0][1]
+        update_session(user_id, stage=3, user_utterance=utterance, bot_raw_result={
+            "mid_key": state.get("mid_key"),
+            "detail_key": name,
+            "url": selection.url
+        })
+        note_categories([name])
+        return make_kakao_response(
+            f"🔍 하위 항목 '{name}'(으)로 이동할까요? 진행을 원하시면 긍정의 의사를 알려주세요.",
+            confirm_quick_replies()
+        )
+
+    filters = {attr: list(values) for attr, values in (state.get("filters") or {}).items()}
+    for attr, values in selection.filters().items():
+        merged = filters.setdefault(attr, [])
+        merged.extend(value for value in values if value not in merged)
+    next_attr = next((attr for attr in index.attributes if attr not in filters), None)
+
+    update_session(user_id, stage=4, user_utterance=utterance, bot_raw_result={
+        **state,
+        "attr": next_attr or state.get("attr"),
+        "filters": filters
+    })
+    return format_filter_result(filters, next_attr, index.values(next_attr) if next_attr else None)
+
+
 # =======================================================
 # 메인 핸들러
 # =======================================================
-async def handle_webhook(data: dict, background_tasks: BackgroundTasks) -> dict:
+async def handle_webhook(data: dict, background_tasks: BackgroundTasks, request_id: Optional[str] = None) -> dict:
+    """
+    webhook 1건 처리 (같은 유저 · 발화 · 액션 값 · request id 의 중복 요청은 한 번만 처리)
+
+    Args:
+        data (dict): 카카오 스킬 요청 본문
+        background_tasks (BackgroundTasks): 저장 등 응답 후 작업
+        request_id (str | None): 요청 식별자 (X-Request-Id 헤더, 없으면 None)
+
+    Returns:
+        dict: 카카오 응답 JSON
+    """
     user_id = extract_user_id(data)
     utterance = extract_utterance(data)
+    params = extract_action_params(data)
+    key = make_idempotency_key(user_id, utterance, request_id, params)
+
+    with webhook_event(user_id, utterance) as event:
+        try:
+            # request id 가 없으면 같은 발화의 다음 턴("1", "네" …)과 구분할 수 없으므로 완료된 응답은 보관하지 않음
+            # 합쳐짐 / 취소 / 대기 초과(TurnSkipped)는 예외라서 캐시에 남지 않음 → 다시 보내면 새로 처리
+            response, replayed = await webhook_idempotency.run(
+                key, lambda: _run_turn(user_id, utterance, background_tasks, params), keep=request_id is not None
+            )
+        except AdmissionRejected as e:
+            print(f"⚠️ {e}")
+            if event:
+                event.outcome = "busy"
+            return make_kakao_response(BUSY_MESSAGE)
+        except TurnSkipped as e:
+            if event:
+                event.outcome = e.outcome
+            return make_kakao_response(e.message)
+        if event and replayed:
+            event.outcome = "replayed"
+        return response
 
-    token_info = get_user_token(user_id)
-    auth_message = handle_auth_state(user_id, utterance, token_info)
+
+async def _run_turn(user_id: str, utterance: str, background_tasks: BackgroundTasks,
+                    params: Optional[dict] = None) -> dict:
+    """유저별 액터를 거쳐 처리 (합쳐지거나 취소된 요청은 TurnSkipped → handle_webhook 에서 안내 문구)"""
+    return await webhook_actors.submit(
+        user_id, utterance, params,
+        lambda text, turn_params: _process_webhook(user_id, text, background_tasks, turn_params)
+    )
+
+
+async def _process_webhook(user_id: str, utterance: str, background_tasks: BackgroundTasks,
+                           params: Optional[dict] = None) -> dict:
+    with span("auth_check"), step("auth_check"):
+        token_info = get_user_token(user_id)
+        auth_message = handle_auth_state(user_id, utterance, token_info)
     if auth_message:
+        _mark_event(outcome="auth")
         return make_kakao_response(auth_message)
 
     session = get_session(user_id)
     stage = session.get("stage", 1)
+    _mark_event(stage=stage)
+    choice, confirm = _structured_action(params or {}, stage)
 
+    # 동시 실행 제한 초과 시 AdmissionRejected → handle_webhook 에서 즉시 응답 (중복 요청 캐시에 남기지 않음)
     if stage == 1:
-        response_text = await handle_stage_1(user_id, utterance)
+        async with STAGE_GATES["1"].admit():
+            with STAGE_DURATION.time(stage="1"), span("stage_1"), step("stage_1"):
+                response_text = await handle_stage_1(user_id, utterance)
     elif stage == 2:
-        response_text = await handle_stage_2(user_id, utterance)
+        async with STAGE_GATES["2"].admit():
+            with STAGE_DURATION.time(stage="2"), span("stage_2"), step("stage_2"):
+                response_text = await handle_stage_2(user_id, utterance, choice)
     elif stage == 3:
-        response_text = await handle_stage_3(user_id, utterance, background_tasks)
+        async with STAGE_GATES["3"].admit():
+            with STAGE_DURATION.time(stage="3"), span("stage_3"), step("stage_3"):
+                response_text = await handle_stage_3(user_id, utterance, background_tasks, confirm)
+    elif stage == 4:
+        # 메모리 역색인 조회뿐이라 동시 실행 제한 없음
+        with STAGE_DURATION.time(stage="4"), span("stage_4"), step("stage_4"):
+            response_text = await handle_stage_4(user_id, utterance)
     else:
         update_session(user_id, stage=stage, user_utterance=utterance)
         response_text = "작업을 계속 진행합니다…"
 
+    _mark_event(next_stage=get_session(user_id).get("stage"))
+    if isinstance(response_text, dict):  # 버튼이 포함된 완성된 응답
+        return response_text
     return make_kakao_response(response_text)
+
+
+def _structured_action(params: dict, stage: int) -> tuple[Optional[tuple[str, str]], Optional[bool]]:
+    """
+    버튼 액션 값 → (stage 2 선택, stage 3 확인)
+    현재 stage 와 맞지 않는 버튼(이전 메시지의 버튼 등)은 무시하고 발화로 처리
+
+    Returns:
+        tuple: ((mid_key, detail_key) | None, True/False | None)
+    """
+    action = params.get("action")
+    if action == ACTION_SELECT and params.get("mid_key") and params.get("detail_key"):
+        used = stage == 2
+        STRUCTURED_ACTIONS.inc(action=ACTION_SELECT, result="used" if used else "ignored")
+        return ((params["mid_key"], params["detail_key"]) if used else None), None
+    if action == ACTION_CONFIRM and params.get("confirm") in ("yes", "no"):
+        used = stage == 3
+        STRUCTURED_ACTIONS.inc(action=ACTION_CONFIRM, result="used" if used else "ignored")
+        return None, ((params["confirm"] == "yes") if used else None)
+    return None, None
+
+
+def _mark_event(**fields) -> None:
+    """현재 요청의 이벤트 로그 항목 갱신 (이벤트 로그 비활성이면 무시)"""
+    event = current_event()
+    if event is not None:
+        for name, value in fields.items():
+            setattr(event, name, value)
@@ -0,0 +1,134 @@
+"""
+admission.py
+──────────────────────────────
+- 비용이 큰 stage(LLM 체인, Chrome 크롤링)의 동시 실행 수 제한 & 부하 차단(load shedding)
+- stage 별로 실행 슬롯(limit)과 대기열 길이(queue)를 두고,
+  대기열이 가득 찼거나 wait_timeout 안에 슬롯을 얻지 못하면 AdmissionRejected 발생
+  → 호출하는 쪽에서 "잠시 후 다시 시도해 주세요" 응답을 바로 반환
+- 실행 중 / 대기 중 요청 수와 거절 수는 /metrics 로 노출
+  (admission_in_flight, admission_queue_depth, admission_shed_total)
+
+📌 환경 변수 (N = 1 | 2 | 3)
+- ADMISSION_STAGE_N_LIMIT : 동시 실행 수 (기본 stage 1·2 = 16, stage 3 = 2)
+- ADMISSION_STAGE_N_QUEUE : 최대 대기 요청 수 (기본 stage 1·2 = 32, stage 3 = 4)
+- ADMISSION_WAIT_TIMEOUT  : 슬롯 대기 최대 시간(초), 카카오 스킬 응답 제한(5초)보다 짧게 (기본 2)
+"""
+
+import asyncio
+import os
+from contextlib import asynccontextmanager
+from typing import AsyncIterator
+
+from app.utils.metrics import ADMISSION_IN_FLIGHT, ADMISSION_QUEUE_DEPTH, ADMISSION_SHED
+
+# =====================================================
+# 0️⃣ 전역 설정
+# =====================================================
+ADMISSION_WAIT_TIMEOUT = float(os.getenv("ADMISSION_WAIT_TIMEOUT", "2"))
+
+DEFAULT_LIMITS = {
+    "1": (16, 32),  # 추천 LLM 체인 (validate → refine)
+    "2": (16, 32),  # 카테고리 매칭 LLM
+    "3": (2, 4),    # 긍정 판별 + Chrome 크롤링 (크롤링 1건 = Chrome 1개)
+}
+
+BUSY_MESSAGE = "⏳ 지금 요청이 많아 처리하지 못했습니다. 잠시 후 다시 시도해 주세요."
+
+
+class AdmissionRejected(Exception):
+    """실행 슬롯을 얻지 못해 요청을 거절함"""
+
+    def __init__(self, stage: str, reason: str):
+        super().__init__(f"stage {stage} 요청 거절 ({reason})")
+        self.stage = stage
+        self.reason = reason
+
+
+# =====================================================
+# 1️⃣ 게이트
+# =====================================================
+class AdmissionGate:
+    """
+    stage 1개의 동시 실행 제한
+
+    Args:
+        stage (str): stage 이름 (메트릭 라벨)
+        limit (int): 동시 실행 수
+        max_queue (int): 최대 대기 요청 수 (0 이면 슬롯이 없을 때 바로 거절)
+        wait_timeout (float): 슬롯 대기 최대 시간(초)
+    """
+
+    def __init__(self, stage: str, limit: int, max_queue: int, wait_timeout: float = ADMISSION_WAIT_TIMEOUT):
+        self.stage = stage
+        self.limit = limit
+        self.max_queue = max_queue
+        self.wait_timeout = wait_timeout
+        self.in_flight = 0
+        self.waiting = 0
+        self._semaphore = asyncio.Semaphore(limit)
+        ADMISSION_IN_FLIGHT.set_function(lambda: self.in_flight, stage=stage)
+        ADMISSION_QUEUE_DEPTH.set_function(lambda: self.waiting, stage=stage)
+
+    def _shed(self, reason: str) -> AdmissionRejected:
+        ADMISSION_SHED.inc(stage=self.stage, reason=reason)
+        return AdmissionRejected(self.stage, reason)
+
+    @asynccontextmanager
+    async def admit(self) -> AsyncIterator[None]:
+        """
+        실행 슬롯을 얻은 동안 블록 실행 (얻지 못하면 AdmissionRejected)
+        """
+        if self._semaphore.locked():
+            if self.waiting >= self.max_queue:
+                raise self._shed("queue_full")
+            self.waiting += 1
+            try:
+                await asyncio.wait_for(self._semaphore.acquire(), self.wait_timeout)
+            except asyncio.TimeoutError:
+                raise self._shed("timeout") from None
+            finally:
+                self.waiting -= 1
+        else:
+            await self._semaphore.acquire()
+
+        self.in_flight += 1
+        try:
+            yield
+        finally:
+            self.in_flight -= 1
+            self._semaphore.release()
+
+
+def _build_gates() -> dict[str, AdmissionGate]:
+    gates = {}
+    for stage, (limit, queue) in DEFAULT_LIMITS.items():
+        gates[stage] = AdmissionGate(
+            stage,
+            limit=int(os.getenv(f"ADMISSION_STAGE_{stage}_LIMIT", limit)),
+            max_queue=int(os.getenv(f"ADMISSION_STAGE_{stage}_QUEUE", queue)),
+        )
+    return gates
+
+
+STAGE_GATES = _build_gates()
+
+
+# =====================================================
+# CLI 테스트
+# =====================================================
+if __name__ == "__main__":
+    async def demo():
+        gate = AdmissionGate("demo", limit=2, max_queue=2, wait_timeout=0.2)
+
+        async def job(i: int) -> str:
+            try:
+                async with gate.admit():
+                    await asyncio.sleep(0.3)
+                    return f"{i}: 완료"
+            except AdmissionRejected as e:
+                return f"{i}: 거절 ({e.reason})"
+
+        for line in await asyncio.gather(*(job(i) for i in range(6))):
+            print(line)
+
+    asyncio.run(demo())
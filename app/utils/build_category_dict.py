@@ -2,11 +2,15 @@
 build_category_dict.py
 ──────────────────────────────
 - validate_llm 결과를 기반으로 category_structure_keys.json 에서 세부 항목 딕셔너리 생성
+- 카탈로그 스냅샷(category_structure.bin)이 있으면 JSON 대신 mmap 뷰 사용
 """
 
 import json
 from pathlib import Path
 
+from app.utils.catalog_snapshot import get_catalog_snapshot
+from app.utils.tracing import span
+
 def get_project_root() -> Path:
     return Path(__file__).resolve().parents[2]
 
@@ -16,7 +20,10 @@ CATEGORY_KEYS_JSON = get_project_root() / "storage" / "category_structure_keys.j
 # 유틸 함수: JSON 로드
 # =====================================================
 def load_category_keys() -> dict:
-    with open(CATEGORY_KEYS_JSON, "r", encoding="utf-8") as f:
+    snapshot = get_catalog_snapshot()
+    if snapshot is not None:
+        return snapshot.keys_view()
+    with span("catalog.load_keys"), open(CATEGORY_KEYS_JSON, "r", encoding="utf-8") as f:
         return json.load(f)
 
 # =====================================================
@@ -0,0 +1,405 @@
+"""
+catalog_snapshot.py
+──────────────────────────────
+- category_structure.json 을 compact 바이너리 스냅샷(category_structure.bin)으로 컴파일
+- 리더는 파일을 mmap(읽기 전용)으로 열어 uvicorn 워커들이 OS 페이지 캐시를 공유
+  → 워커마다 JSON 파싱 / dict 트리 생성 비용 없이 거의 즉시 로드
+- 기존 조회(build_category_dict, validate_llm, resolve_category_url)는
+  keys_view() / resolve_url() 을 통해 그대로 동작
+
+📌 파일 레이아웃 (little-endian, u32 = 4바이트 부호 없는 정수)
+- header         : magic, version, 원본 파일 stat(size, mtime_ns) × 2, 섹션 개수
+- str_offsets    : u32 × (n_strings + 1)   문자열 i = blob[off[i]:off[i+1]] (UTF-8, 중복 제거된 intern 테이블)
+- str_blob       : bytes (4바이트 정렬 패딩)
+- tops           : u32 × 3 × n_tops        (name_sid, mid_start, mid_count)
+- mids           : u32 × 4 × n_mids        (name_sid, detail_start, detail_count, top_idx)
+- details        : u32 × 2 × n_details     (name_sid, url_sid)
+- str_hash       : u32 × n_slots           crc32 open addressing, 값 = sid + 1 (0 = 빈 칸)
+- mid_index      : u32 × 2 × n_mids        (name_sid, mid_idx) name_sid 순 정렬 → 이분 탐색
+
+📌 CLI
+    python -m app.utils.catalog_snapshot          # 컴파일
+    python -m app.utils.catalog_snapshot --check  # 컴파일 후 JSON 과 결과 일치 검증
+"""
+
+import bisect
+import json
+import mmap
+import os
+import struct
+import sys
+import zlib
+from collections.abc import Mapping
+from pathlib import Path
+from typing import Iterator, Optional
+
+# =====================================================
+# 0️⃣ 전역 설정
+# =====================================================
+PROJECT_ROOT = Path(__file__).resolve().parent.parent.parent
+CATEGORY_JSON_PATH = PROJECT_ROOT / "storage" / "category_structure.json"
+CATEGORY_KEYS_JSON = PROJECT_ROOT / "storage" / "category_structure_keys.json"
+SNAPSHOT_PATH = PROJECT_ROOT / "storage" / "category_structure.bin"
+
+MAGIC = b"DNWCAT01"
+VERSION = 1
+NO_URL = 0xFFFFFFFF
+
+# magic, version, (structure size, mtime_ns), (keys size, mtime_ns),
+# n_strings, blob_size, n_tops, n_mids, n_details, n_slots
+HEADER = struct.Struct("<8sIQqQqIIIIII")
+
+
+# =====================================================
+# 1️⃣ 컴파일러
+# =====================================================
+def _source_stat(path: Path) -> tuple[int, int]:
+    try:
+        st = path.stat()
+        return st.st_size, st.st_mtime_ns
+    except FileNotFoundError:
+        return 0, 0
+
+
+def _hash_slots(n_strings: int) -> int:
+    slots = 1
+    while slots < n_strings * 2:  # load factor ≤ 0.5
+        slots <<= 1
+    return slots
+
+
+def compile_snapshot(
+    structure: Optional[dict] = None,
+    out_path: Path = SNAPSHOT_PATH,
+    structure_path: Path = CATEGORY_JSON_PATH,
+    keys_path: Path = CATEGORY_KEYS_JSON,
+) -> Path:
+    """
+    카탈로그 구조(top → mid → [(detail, url), …])를 바이너리 스냅샷으로 저장
+
+    Args:
+        structure: 이미 로드한 구조 dict (없으면 structure_path 에서 로드)
+        out_path: 스냅샷 저장 경로
+        structure_path / keys_path: 원본 JSON 경로 (stat 을 기록해 stale 여부 판단)
+    """
+    if structure is None:
+        with open(structure_path, "r", encoding="utf-8") as f:
+            structure = json.load(f)
+
+    strings: list[bytes] = []
+    sid_of: dict[str, int] = {}
+
+    def intern(text: str) -> int:
+        sid = sid_of.get(text)
+        if sid is None:
+            sid = sid_of[text] = len(strings)
+            strings.append(text.encode("utf-8"))
+        return sid
+
+    tops, mids, details = [], [], []
+    for top_name, mid_dict in structure.items():
+        tops.append((intern(top_name), len(mids), len(mid_dict)))
+        for mid_name, items in mid_dict.items():
+            mids.append((intern(mid_name), len(details), len(items), len(tops) - 1))
+            for item in items:
+                detail_name, url = (item[0], item[1]) if isinstance(item, (list, tuple)) else (item, None)
+                details.append((intern(detail_name), intern(url) if url else NO_URL))
+
+    offsets = [0]
+    for raw in strings:
+        offsets.append(offsets[-1] + len(raw))
+    blob = b"".join(strings)
+    blob += b"\0" * (-len(blob) % 4)
+
+    n_slots = _hash_slots(len(strings))
+    table = [0] * n_slots
+    for sid, raw in enumerate(strings):
+        slot = zlib.crc32(raw) & (n_slots - 1)
+        while table[slot]:
+            slot = (slot + 1) & (n_slots - 1)
+        table[slot] = sid + 1
+
+    mid_index = sorted((name_sid, idx) for idx, (name_sid, *_rest) in enumerate(mids))
+
+    header = HEADER.pack(
+        MAGIC, VERSION,
+        *_source_stat(structure_path), *_source_stat(keys_path),
+        len(strings), len(blob), len(tops), len(mids), len(details), n_slots,
+    )
+
+    def u32s(values) -> bytes:
+        values = list(values)
+        return struct.pack(f"<{len(values)}I", *values)
+
+    body = b"".join([
+        u32s(offsets),
+        blob,
+        u32s(v for row in tops for v in row),
+        u32s(v for row in mids for v in row),
+        u32s(v for row in details for v in row),
+        u32s(table),
+        u32s(v for row in mid_index for v in row),
+    ])
+
+    out_path = Path(out_path)
+    out_path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = out_path.with_name(f".{out_path.name}.{os.getpid()}.tmp")
+    with open(tmp_path, "wb") as f:
+        f.write(header)
+        f.write(body)
+    os.replace(tmp_path, out_path)  # 기존 mmap 사용자는 이전 inode 를 계속 참조
+    return out_path
+
+
+# =====================================================
+# 2️⃣ 리더
+# =====================================================
+class CatalogSnapshot:
+    """mmap 으로 연 카탈로그 스냅샷 (읽기 전용, 프로세스 간 페이지 캐시 공유)"""
+
+    def __init__(self, path: Path = SNAPSHOT_PATH):
+        self.path = Path(path)
+        with open(self.path, "rb") as f:
+            self._mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+
+        (magic, version, s_size, s_mtime, k_size, k_mtime,
+         n_strings, blob_size, n_tops, n_mids, n_details, n_slots) = HEADER.unpack_from(self._mm, 0)
+        if magic != MAGIC or version != VERSION:
+            raise ValueError(f"❌ 카탈로그 스냅샷 형식이 올바르지 않습니다: {self.path}")
+
+        self.source_stats = ((s_size, s_mtime), (k_size, k_mtime))
+        self.n_strings, self.n_tops, self.n_mids, self.n_details = n_strings, n_tops, n_mids, n_details
+        self._n_slots = n_slots
+
+        view = memoryview(self._mm)
+        pos = HEADER.size
+
+        def take_u32(count: int) -> memoryview:
+            nonlocal pos
+            section = view[pos:pos + count * 4].cast("I")
+            pos += count * 4
+            return section
+
+        self._offsets = take_u32(n_strings + 1)
+        self._blob = view[pos:pos + blob_size]
+        pos += blob_size
+        self._tops = take_u32(n_tops * 3)
+        self._mids = take_u32(n_mids * 4)
+        self._details = take_u32(n_details * 2)
+        self._table = take_u32(n_slots)
+        self._mid_index = take_u32(n_mids * 2)
+        self._mid_index_sids = self._mid_index[0::2].tolist()
+        self._strings: list[Optional[str]] = [None] * n_strings
+        # 프로세스 로컬 메모 (조회된 항목만 디코딩해 보관)
+        self._sid_cache: dict[str, Optional[int]] = {}
+        self._top_cache: Optional[dict[str, int]] = None
+        self._details_cache: dict[int, tuple[str, ...]] = {}
+
+    # -------------------------------------------------
+    # 문자열 테이블
+    # -------------------------------------------------
+    def string(self, sid: int) -> str:
+        text = self._strings[sid]
+        if text is None:
+            text = self._strings[sid] = bytes(self._blob[self._offsets[sid]:self._offsets[sid + 1]]).decode("utf-8")
+        return text
+
+    def sid(self, text: str) -> Optional[int]:
+        """문자열 → sid (없으면 None), crc32 해시 인덱스 조회"""
+        try:
+            return self._sid_cache[text]
+        except KeyError:
+            pass
+        sid = self._lookup_sid(text)
+        if len(self._sid_cache) < 65536:
+            self._sid_cache[text] = sid
+        return sid
+
+    def _lookup_sid(self, text: str) -> Optional[int]:
+        raw = text.encode("utf-8")
+        mask = self._n_slots - 1
+        slot = zlib.crc32(raw) & mask
+        while True:
+            entry = self._table[slot]
+            if entry == 0:
+                return None
+            sid = entry - 1
+            if self._blob[self._offsets[sid]:self._offsets[sid + 1]] == raw:
+                return sid
+            slot = (slot + 1) & mask
+
+    # -------------------------------------------------
+    # 구조 조회
+    # -------------------------------------------------
+    def top_names(self) -> list[str]:
+        return [self.string(self._tops[i * 3]) for i in range(self.n_tops)]
+
+    def top_index(self, top_name: str) -> Optional[int]:
+        if self._top_cache is None:
+            self._top_cache = {}
+            for i in range(self.n_tops):
+                self._top_cache.setdefault(self.string(self._tops[i * 3]), i)
+        return self._top_cache.get(top_name)
+
+    def mid_range(self, top_idx: int) -> range:
+        start, count = self._tops[top_idx * 3 + 1], self._tops[top_idx * 3 + 2]
+        return range(start, start + count)
+
+    def mid_name(self, mid_idx: int) -> str:
+        return self.string(self._mids[mid_idx * 4])
+
+    def detail_names(self, mid_idx: int) -> list[str]:
+        names = self._details_cache.get(mid_idx)
+        if names is None:
+            start, count = self._mids[mid_idx * 4 + 1], self._mids[mid_idx * 4 + 2]
+            names = self._details_cache[mid_idx] = tuple(
+                self.string(self._details[d * 2]) for d in range(start, start + count)
+            )
+        return list(names)
+
+    def mids_named(self, mid_name: str) -> list[int]:
+        """같은 이름의 중간키 인덱스 목록 (카탈로그 순서)"""
+        sid = self.sid(mid_name)
+        if sid is None:
+            return []
+        lo = bisect.bisect_left(self._mid_index_sids, sid)
+        hi = bisect.bisect_right(self._mid_index_sids, sid)
+        return [self._mid_index[i * 2 + 1] for i in range(lo, hi)]
+
+    def resolve_url(self, mid_key: str, detail_key: str) -> Optional[str]:
+        """resolve_category_url 과 같은 의미: 카탈로그 순서상 첫 (mid, detail) 일치 URL"""
+        detail_sid = self.sid(detail_key)
+        if detail_sid is None:
+            return None
+        for mid_idx in self.mids_named(mid_key):
+            start, count = self._mids[mid_idx * 4 + 1], self._mids[mid_idx * 4 + 2]
+            for d in range(start, start + count):
+                if self._details[d * 2] == detail_sid:
+                    url_sid = self._details[d * 2 + 1]
+                    return None if url_sid == NO_URL else self.string(url_sid)
+        return None
+
+    def keys_view(self) -> "CatalogKeysView":
+        """category_structure_keys.json 과 같은 모양의 읽기 전용 Mapping"""
+        return CatalogKeysView(self)
+
+    def is_stale(self, structure_path: Path = CATEGORY_JSON_PATH, keys_path: Path = CATEGORY_KEYS_JSON) -> bool:
+        current = (_source_stat(structure_path), _source_stat(keys_path))
+        return any(now != (0, 0) and now != recorded for now, recorded in zip(current, self.source_stats))
+
+
+class CatalogKeysView(Mapping):
+    """{top: {mid: [detail, …]}} 읽기 전용 뷰"""
+
+    def __init__(self, snapshot: CatalogSnapshot):
+        self._snapshot = snapshot
+
+    def __getitem__(self, top_name: str) -> "_MidsView":
+        idx = self._snapshot.top_index(top_name) if isinstance(top_name, str) else None
+        if idx is None:
+            raise KeyError(top_name)
+        return _MidsView(self._snapshot, idx)
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._snapshot.top_names())
+
+    def __len__(self) -> int:
+        return self._snapshot.n_tops
+
+
+class _MidsView(Mapping):
+    def __init__(self, snapshot: CatalogSnapshot, top_idx: int):
+        self._snapshot = snapshot
+        self._range = snapshot.mid_range(top_idx)
+
+    def _find(self, mid_name: str) -> Optional[int]:
+        for mid_idx in self._snapshot.mids_named(mid_name):
+            if mid_idx in self._range:
+                return mid_idx
+        return None
+
+    def __getitem__(self, mid_name: str) -> list[str]:
+        idx = self._find(mid_name) if isinstance(mid_name, str) else None
+        if idx is None:
+            raise KeyError(mid_name)
+        return self._snapshot.detail_names(idx)
+
+    def __contains__(self, mid_name) -> bool:
+        return isinstance(mid_name, str) and self._find(mid_name) is not None
+
+    def __iter__(self) -> Iterator[str]:
+        return (self._snapshot.mid_name(i) for i in self._range)
+
+    def __len__(self) -> int:
+        return len(self._range)
+
+
+# =====================================================
+# 3️⃣ 프로세스 단위 캐시
+# =====================================================
+_snapshot: Optional[CatalogSnapshot] = None
+_snapshot_checked = False
+
+
+def get_catalog_snapshot() -> Optional[CatalogSnapshot]:
+    """
+    유효한 스냅샷을 반환 (없거나 JSON 보다 오래되었으면 None → 호출부는 JSON 으로 폴백)
+    """
+    global _snapshot, _snapshot_checked
+    if _snapshot_checked:
+        return _snapshot
+    _snapshot_checked = True
+
+    if sys.byteorder != "little" or not SNAPSHOT_PATH.exists():
+        return None
+    try:
+        snapshot = CatalogSnapshot(SNAPSHOT_PATH)
+    except (OSError, ValueError, struct.error) as e:
+        print(f"⚠️ 카탈로그 스냅샷 로드 실패, JSON 으로 대체합니다: {e}")
+        return None
+    if snapshot.is_stale():
+        print(f"⚠️ 카탈로그 스냅샷이 JSON 보다 오래되었습니다. 다시 컴파일하세요: python -m app.utils.catalog_snapshot")
+        return None
+    _snapshot = snapshot
+    return _snapshot
+
+
+def reset_catalog_snapshot() -> None:
+    """스냅샷 재컴파일 후 다음 조회에서 다시 열도록 캐시 초기화"""
+    global _snapshot, _snapshot_checked
+    _snapshot, _snapshot_checked = None, False
+
+
+# =====================================================
+# CLI: 컴파일 / 검증
+# =====================================================
+def verify_snapshot(path: Path = SNAPSHOT_PATH) -> bool:
+    with open(CATEGORY_JSON_PATH, "r", encoding="utf-8") as f:
+        structure = json.load(f)
+    with open(CATEGORY_KEYS_JSON, "r", encoding="utf-8") as f:
+        keys = json.load(f)
+
+    snapshot = CatalogSnapshot(path)
+    view = snapshot.keys_view()
+    if {top: {mid: list(details) for mid, details in mids.items()} for top, mids in view.items()} != keys:
+        print("❌ keys_view 가 category_structure_keys.json 과 다릅니다.")
+        return False
+
+    for mid_dict in structure.values():
+        for mid_key, items in mid_dict.items():
+            for detail_key, _ in items:
+                expected = next(
+                    url for m in structure.values() if mid_key in m
+                    for name, url in m[mid_key] if name == detail_key
+                )
+                if snapshot.resolve_url(mid_key, detail_key) != expected:
+                    print(f"❌ URL 불일치: ({mid_key}, {detail_key})")
+                    return False
+    return True
+
+
+if __name__ == "__main__":
+    out = compile_snapshot()
+    print(f"💾 카탈로그 스냅샷 저장: {out} ({out.stat().st_size:,} bytes)")
+    if "--check" in sys.argv:
+        print("✅ 검증 완료" if verify_snapshot(out) else "❌ 검증 실패")
@@ -2,22 +2,29 @@
 category_spec_storage.py
 ────────────────────────────────────────────────────────────
 - 크롤링한 카테고리 스펙 데이터를 저장/불러오기 위한 모듈
-- 저장 위치: storage/category_spec/
-- 파일명: <세부항목명>.json
+- 저장 위치: storage/category_spec.sqlite3 (app/utils/spec_store.py, URL 단위 행)
+- 기존 파일 저장소(storage/category_spec/<세부항목명>.json)는 읽기 전용 fallback
+- 저장할 때마다 전문 검색 색인(app/utils/spec_search.py)의 해당 URL 문서도 갱신
+  → python -m app.utils.spec_store migrate 로 DB 에 옮길 수 있음
 
 📌 함수
-- save_category_spec(url: str, detail_name: str, data: dict) -> None
+- save_category_spec(url: str, detail_name: str, data: dict, mid_key: str | None = None) -> None
 - load_category_spec(detail_name: str) -> dict
 """
 
-import json
 import re
 from pathlib import Path
+from typing import Optional
+
+from app.utils.serializer import read_json
+from app.utils.spec_search import SPEC_SEARCH_ENABLED, get_spec_search
+from app.utils.spec_store import get_spec_store
+from app.utils.tracing import span
 
 # =====================================================
 # 0️⃣ 전역 설정
 # =====================================================
-STORAGE_DIR = Path("storage/category_spec")
+STORAGE_DIR = Path("storage/category_spec")  # 기존 파일 저장소 (마이그레이션 전 fallback)
 
 
 # =====================================================
@@ -39,27 +46,26 @@ def sanitize_filename(detail_name: str) -> str:
 # =====================================================
 # 2️⃣ 저장 함수
 # =====================================================
-def save_category_spec(url: str, detail_name: str, data: dict) -> None:
+def save_category_spec(url: str, detail_name: str, data: dict, mid_key: Optional[str] = None) -> None:
     """
-    크롤링한 데이터를 JSON 파일로 저장
-    - url: 크롤링한 페이지 URL (로그 용도)
-    - detail_name: 저장할 파일명 (확장자 제외)
+    크롤링한 데이터를 스펙 저장소에 저장 (같은 URL 은 최신 크롤링 결과로 갱신)
+    - url: 크롤링한 페이지 URL (행 키)
+    - detail_name: 세부 항목명
     - data: 크롤링 데이터 dict
+    - mid_key: 중간 카테고리 (알 수 있으면 전달 → 중간 카테고리 단위 조회에 사용)
     """
-    STORAGE_DIR.mkdir(parents=True, exist_ok=True)
-
-    filename = sanitize_filename(detail_name)
-    file_path = STORAGE_DIR / f"{filename}.json"
+    with span("storage.save_category_spec", detail_name=detail_name):
+        get_spec_store().put(url, detail_name, data, mid_key=mid_key)
 
-    payload = {
-        "url": url,
-        "data": data
-    }
+    if SPEC_SEARCH_ENABLED:
+        # 색인 실패는 저장 실패로 취급하지 않음 (python -m app.utils.spec_search rebuild 로 복구)
+        try:
+            with span("storage.index_category_spec", detail_name=detail_name):
+                get_spec_search().update(url, detail_name, data, mid_key=mid_key)
+        except Exception as e:
+            print(f"⚠️ 검색 색인 갱신 실패: {detail_name} ({e})")
 
-    with open(file_path, "w", encoding="utf-8") as f:
-        json.dump(payload, f, ensure_ascii=False, indent=2)
-
-    print(f"💾 저장 완료: {file_path}")
+    print(f"💾 저장 완료: {detail_name} ({url})")
 
 
 # =====================================================
@@ -67,18 +73,24 @@ def save_category_spec(url: str, detail_name: str, data: dict) -> None:
 # =====================================================
 def load_category_spec(detail_name: str) -> dict:
     """
-    저장된 JSON 파일을 불러와 dict로 반환
-    - detail_name: 파일명 (확장자 제외)
+    세부 항목의 가장 최근 크롤링 결과를 dict로 반환
+    - detail_name: 세부 항목명
     - return: dict ({"url": str, "data": dict})
     """
-    filename = sanitize_filename(detail_name)
-    file_path = STORAGE_DIR / f"{filename}.json"
+    with span("storage.load_category_spec", detail_name=detail_name):
+        record = get_spec_store().latest_by_detail(detail_name)
+
+    if record is not None:
+        print(f"📄 불러오기 완료: {detail_name} ({record['url']})")
+        return {"url": record["url"], "data": record["data"]}
 
+    # 마이그레이션 전 파일 저장소
+    file_path = STORAGE_DIR / f"{sanitize_filename(detail_name)}.json"
     if not file_path.exists():
-        raise FileNotFoundError(f"❌ 파일이 존재하지 않습니다: {file_path}")
+        raise FileNotFoundError(f"❌ 저장된 스펙이 없습니다: {detail_name}")
 
-    with open(file_path, "r", encoding="utf-8") as f:
-        payload = json.load(f)
+    with span("storage.load_category_spec", detail_name=detail_name, legacy=True):
+        payload = read_json(file_path)
 
     print(f"📄 불러오기 완료: {file_path}")
     return payload
@@ -2,12 +2,16 @@
 category_url_resolver.py
 ──────────────────────────────
 - 중간키 + 세부항목 쌍으로 크롤링 데이터에서 URL을 찾아 반환하는 유틸리티
+- 카탈로그 스냅샷(category_structure.bin)이 있으면 해시 인덱스로 조회, 없으면 JSON 스캔
 """
 
 import json
 from pathlib import Path
 from typing import Optional
 
+from app.utils.catalog_snapshot import get_catalog_snapshot
+from app.utils.tracing import span
+
 # =====================================================
 # 상수: 카테고리 데이터 파일 경로
 # =====================================================
@@ -29,12 +33,19 @@ def resolve_category_url(mid_key: str, detail_key: str) -> Optional[str]:
     Returns:
         str | None: 해당 카테고리의 URL
     """
+    snapshot = get_catalog_snapshot()
+    if snapshot is not None:
+        url = snapshot.resolve_url(mid_key, detail_key)
+        if not url:
+            print(f"⚠️ ({mid_key}, {detail_key})에 해당하는 URL을 찾을 수 없습니다.")
+        return url
+
     if not CATEGORY_JSON_PATH.exists():
         print(f"⚠️ 카테고리 데이터 파일이 존재하지 않습니다: {CATEGORY_JSON_PATH}")
         return None
 
     try:
-        with open(CATEGORY_JSON_PATH, "r", encoding="utf-8") as f:
+        with span("catalog.load_structure"), open(CATEGORY_JSON_PATH, "r", encoding="utf-8") as f:
             category_data = json.load(f)
     except Exception as e:
         print(f"❌ 카테고리 데이터 로드 실패: {e}")
@@ -1,11 +1,41 @@
 import json
 from pathlib import Path
 
+SETTINGS_PATH = Path(__file__).resolve().parent.parent / "config" / "settings.json"
+
+_settings = None
+_env_loaded = False
+
+
 def load_settings() -> dict:
-    settings_path = Path(__file__).resolve().parent.parent / "config" / "settings.json"
-    with open(settings_path, encoding="utf-8") as f:
+    with open(SETTINGS_PATH, encoding="utf-8") as f:
         return json.load(f)
 
-settings = load_settings()
 
-BASE_URL = settings.get("BASE_URL")
+def get_settings() -> dict:
+    """settings.json 을 첫 사용 시 한 번만 읽어 캐시"""
+    global _settings
+    if _settings is None:
+        _settings = load_settings()
+    return _settings
+
+
+def load_env() -> None:
+    """
+    .env 를 프로세스당 한 번만 로드 (모듈마다 load_dotenv 를 반복하지 않음)
+    - 이미 설정된 환경 변수는 덮어쓰지 않음
+    """
+    global _env_loaded
+    if _env_loaded:
+        return
+    from dotenv import load_dotenv
+
+    load_dotenv()
+    _env_loaded = True
+
+
+def __getattr__(name: str):
+    # 기존 `from app.utils.config import BASE_URL` 호환 (접근 시점에 settings.json 로드)
+    if name == "BASE_URL":
+        return get_settings().get("BASE_URL")
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -0,0 +1,407 @@
+"""
+event_log.py
+──────────────────────────────
+- webhook 1건 = 이벤트 1줄인 append-only 로그 (캐시 크기 산정 / 사전 워밍용 인기 카테고리 / 지연 추이 분석용)
+- 기록 항목: 시각, 유저 해시, stage(처리 전 → 후), 발화, 추천 · 선택된 카테고리, 캐시 적중 / 미스,
+  단계별 지연(ms), 전체 지연, 결과(ok|auth|busy|replayed|superseded|cancelled|error)
+- 요청 경로에서는 dict 를 큐에 넣기만 하고, 직렬화 · 파일 쓰기 · 압축은 백그라운드 스레드가 배치로 처리
+  (큐가 가득 차면 이벤트를 버리고 event_log_events_total{result=dropped} 증가 — 요청을 막지 않음)
+- 프로세스별 활성 파일 events-<pid>.jsonl → 크기 초과 / 날짜 변경 시 events-<시각>-<pid>.jsonl.gz 로 회전
+
+📌 환경 변수
+- EVENT_LOG_ENABLED        : 0 이면 비활성 (기본 1)
+- EVENT_LOG_DIR            : 로그 디렉터리 (기본 storage/events)
+- EVENT_LOG_ROTATE_MB      : 활성 파일 회전 크기(MB) (기본 32)
+- EVENT_LOG_FLUSH_INTERVAL : 배치 쓰기 간격(초) (기본 1.0)
+- EVENT_LOG_QUEUE          : 쓰기 대기 이벤트 최대 수 (기본 10000)
+- EVENT_LOG_USER_SALT      : 유저 ID 해시 salt (기본 "")
+
+📌 사용 예
+    with webhook_event(user_id, utterance) as event:
+        event.stage = 1
+        with step("stage_1"):
+            …
+
+📌 분석 CLI
+    python -m app.utils.event_log summarize
+    python -m app.utils.event_log summarize storage/events --days 7 --top 30 --json
+"""
+
+import argparse
+import atexit
+import gzip
+import hashlib
+import json
+import os
+import queue
+import shutil
+import sys
+import threading
+import time
+from collections import Counter
+from contextlib import contextmanager
+from contextvars import ContextVar
+from pathlib import Path
+from typing import Iterator, Optional
+
+from app.utils.metrics import counter
+from app.utils.serializer import dumps
+
+# =====================================================
+# 0️⃣ 전역 설정
+# =====================================================
+PROJECT_ROOT = Path(__file__).resolve().parent.parent.parent
+
+EVENT_LOG_ENABLED = os.getenv("EVENT_LOG_ENABLED", "1") != "0"
+EVENT_LOG_DIR = Path(os.getenv("EVENT_LOG_DIR") or PROJECT_ROOT / "storage" / "events")
+EVENT_LOG_ROTATE_MB = float(os.getenv("EVENT_LOG_ROTATE_MB", "32"))
+EVENT_LOG_FLUSH_INTERVAL = float(os.getenv("EVENT_LOG_FLUSH_INTERVAL", "1.0"))
+EVENT_LOG_QUEUE = int(os.getenv("EVENT_LOG_QUEUE", "10000"))
+EVENT_LOG_USER_SALT = os.getenv("EVENT_LOG_USER_SALT", "")
+
+EVENT_LOG_EVENTS = counter(
+    "event_log_events_total",
+    "이벤트 로그 기록 결과 (result=queued|dropped)",
+    ("result",),
+)
+
+_current_event: ContextVar[Optional["WebhookEvent"]] = ContextVar("current_event", default=None)
+
+
+# =====================================================
+# 1️⃣ 요청 단위 이벤트
+# =====================================================
+def hash_user(user_id: str) -> str:
+    return hashlib.sha256((EVENT_LOG_USER_SALT + user_id).encode("utf-8")).hexdigest()[:16]
+
+
+class WebhookEvent:
+    """webhook 1건 처리 중 모이는 기록 (같은 요청의 태스크 / 스레드가 같은 객체를 공유)"""
+
+    def __init__(self, user_id: str, utterance: str):
+        self.ts = time.time()
+        self.user = hash_user(user_id)
+        self.utterance = utterance
+        self.stage: Optional[int] = None
+        self.next_stage: Optional[int] = None
+        self.categories: list[str] = []
+        self.cache_hits: list[str] = []
+        self.cache_misses: list[str] = []
+        self.steps: dict[str, float] = {}
+        self.outcome = "ok"
+        self._start = time.perf_counter()
+
+    def add_step(self, name: str, seconds: float) -> None:
+        # 같은 단계가 여러 번 실행되면 합산 (예: llm.category_match 재시도)
+        self.steps[name] = self.steps.get(name, 0.0) + seconds * 1000
+
+    def to_dict(self) -> dict:
+        return {
+            "ts": round(self.ts, 3),
+            "user": self.user,
+            "stage": self.stage,
+            "next_stage": self.next_stage,
+            "utterance": self.utterance,
+            "categories": self.categories,
+            "cache_hits": self.cache_hits,
+            "cache_misses": self.cache_misses,
+            "steps": {name: round(ms, 3) for name, ms in self.steps.items()},
+            "total_ms": round((time.perf_counter() - self._start) * 1000, 3),
+            "outcome": self.outcome,
+        }
+
+
+def current_event() -> Optional[WebhookEvent]:
+    return _current_event.get()
+
+
+@contextmanager
+def webhook_event(user_id: str, utterance: str) -> Iterator[Optional[WebhookEvent]]:
+    """
+    webhook 1건의 이벤트 수집 시작 → 종료 시 로그 큐에 추가
+    (비활성이면 None 을 넘기고 아무 것도 기록하지 않음)
+    """
+    if not EVENT_LOG_ENABLED:
+        yield None
+        return
+
+    event = WebhookEvent(user_id, utterance)
+    token = _current_event.set(event)
+    try:
+        yield event
+    except BaseException:
+        event.outcome = "error"
+        raise
+    finally:
+        _current_event.reset(token)
+        get_event_log().emit(event.to_dict())
+
+
+@contextmanager
+def step(name: str) -> Iterator[None]:
+    """현재 이벤트에 단계 지연 기록 (이벤트 밖이면 아무 것도 하지 않음)"""
+    event = _current_event.get()
+    if event is None:
+        yield
+        return
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        event.add_step(name, time.perf_counter() - start)
+
+
+def note_step(name: str, seconds: float) -> None:
+    """이미 잰 지연 시간을 현재 이벤트에 기록"""
+    event = _current_event.get()
+    if event is not None:
+        event.add_step(name, seconds)
+
+
+def note_cache(cache: str, hit: bool) -> None:
+    event = _current_event.get()
+    if event is not None:
+        (event.cache_hits if hit else event.cache_misses).append(cache)
+
+
+def note_categories(categories: list[str]) -> None:
+    event = _current_event.get()
+    if event is not None:
+        event.categories.extend(c for c in categories if c)
+
+
+# =====================================================
+# 2️⃣ 비동기 writer (배치 쓰기 + 회전 압축)
+# =====================================================
+class EventLog:
+    """
+    이벤트 큐 → 백그라운드 스레드가 flush_interval 마다 한 번에 기록
+
+    Args:
+        directory (Path): 로그 디렉터리
+        rotate_bytes (int): 활성 파일 회전 크기
+        flush_interval (float): 배치 쓰기 간격(초)
+        max_queue (int): 쓰기 대기 이벤트 최대 수
+    """
+
+    def __init__(
+        self,
+        directory: Path = EVENT_LOG_DIR,
+        rotate_bytes: int = int(EVENT_LOG_ROTATE_MB * 1024 * 1024),
+        flush_interval: float = EVENT_LOG_FLUSH_INTERVAL,
+        max_queue: int = EVENT_LOG_QUEUE,
+    ):
+        self.directory = Path(directory)
+        self.rotate_bytes = rotate_bytes
+        self.flush_interval = flush_interval
+        self._queue: "queue.Queue[Optional[dict]]" = queue.Queue(maxsize=max_queue)
+        self._thread: Optional[threading.Thread] = None
+        self._lock = threading.Lock()
+
+    @property
+    def active_path(self) -> Path:
+        return self.directory / f"events-{os.getpid()}.jsonl"
+
+    def emit(self, record: dict) -> None:
+        self._ensure_thread()
+        try:
+            self._queue.put_nowait(record)
+        except queue.Full:
+            EVENT_LOG_EVENTS.inc(result="dropped")
+            return
+        EVENT_LOG_EVENTS.inc(result="queued")
+
+    def _ensure_thread(self) -> None:
+        if self._thread is not None and self._thread.is_alive():
+            return
+        with self._lock:
+            if self._thread is None or not self._thread.is_alive():
+                self._thread = threading.Thread(target=self._loop, name="event-log-writer", daemon=True)
+                self._thread.start()
+
+    def close(self, timeout: float = 5.0) -> None:
+        """남은 이벤트를 모두 쓰고 writer 종료 (프로세스 종료 시 atexit 로 호출)"""
+        if self._thread is None or not self._thread.is_alive():
+            return
+        self._queue.put(None)
+        self._thread.join(timeout)
+
+    def _loop(self) -> None:
+        while True:
+            try:
+                first = self._queue.get(timeout=self.flush_interval)
+            except queue.Empty:
+                continue
+            batch = [first]
+            while True:
+                try:
+                    batch.append(self._queue.get_nowait())
+                except queue.Empty:
+                    break
+
+            stop = None in batch
+            try:
+                self._write([r for r in batch if r is not None])
+            except Exception as e:
+                print(f"⚠️ 이벤트 로그 쓰기 실패: {e}")
+            if stop:
+                return
+            time.sleep(self.flush_interval)  # 다음 배치까지 모아서 한 번에 쓰기
+
+    def _write(self, records: list[dict]) -> None:
+        if not records:
+            return
+        self.directory.mkdir(parents=True, exist_ok=True)
+        path = self.active_path
+        if path.exists():
+            stat = path.stat()
+            if stat.st_size >= self.rotate_bytes or time.localtime(stat.st_mtime)[:3] != time.localtime()[:3]:
+                self.rotate()
+        with open(path, "ab") as f:
+            f.write(b"".join(dumps(r) + b"\n" for r in records))
+
+    def rotate(self) -> Optional[Path]:
+        """활성 파일을 gzip 으로 압축해 보관 (활성 파일이 없으면 None)"""
+        path = self.active_path
+        if not path.exists():
+            return None
+        stamp = time.strftime("%Y%m%d-%H%M%S", time.localtime(path.stat().st_mtime))
+        target = self.directory / f"events-{stamp}-{os.getpid()}.jsonl.gz"
+        with open(path, "rb") as src, gzip.open(target, "wb") as dst:
+            shutil.copyfileobj(src, dst)
+        path.unlink()
+        return target
+
+
+_event_log: Optional[EventLog] = None
+
+
+def get_event_log() -> EventLog:
+    global _event_log
+    if _event_log is None:
+        _event_log = EventLog()
+        atexit.register(_event_log.close)
+    return _event_log
+
+
+# =====================================================
+# 3️⃣ 분석 CLI
+# =====================================================
+def iter_events(directory: Path = EVENT_LOG_DIR, since: float = 0.0) -> Iterator[dict]:
+    """디렉터리의 활성 / 회전된 로그를 시각 순서와 무관하게 모두 읽음"""
+    for path in sorted(Path(directory).glob("events-*.jsonl*")):
+        opener = gzip.open if path.suffix == ".gz" else open
+        with opener(path, "rt", encoding="utf-8") as f:
+            for line in f:
+                try:
+                    record = json.loads(line)
+                except json.JSONDecodeError:
+                    continue  # 쓰다 만 마지막 줄
+                if record.get("ts", 0) >= since:
+                    yield record
+
+
+def _percentiles(values: list[float]) -> dict:
+    if not values:
+        return {"count": 0}
+    ordered = sorted(values)
+
+    def at(q: float) -> float:
+        return round(ordered[min(len(ordered) - 1, int(q * len(ordered)))], 1)
+
+    return {"count": len(ordered), "p50": at(0.5), "p90": at(0.9), "p99": at(0.99)}
+
+
+def summarize_events(events) -> dict:
+    """
+    이벤트 묶음 요약
+
+    Returns:
+        dict: outcome / stage 분포, stage · 단계별 지연, 캐시 적중률, 인기 카테고리, 일별 추이
+    """
+    outcomes, stages, categories, selections, users = Counter(), Counter(), Counter(), Counter(), set()
+    stage_latency: dict[str, list[float]] = {}
+    step_latency: dict[str, list[float]] = {}
+    cache: dict[str, Counter] = {}
+    daily: dict[str, list[float]] = {}
+
+    for e in events:
+        outcomes[e.get("outcome", "ok")] += 1
+        users.add(e.get("user"))
+        stage = str(e.get("stage"))
+        stages[stage] += 1
+        stage_latency.setdefault(stage, []).append(e.get("total_ms", 0.0))
+        daily.setdefault(time.strftime("%Y-%m-%d", time.localtime(e.get("ts", 0))), []).append(e.get("total_ms", 0.0))
+        for name, ms in (e.get("steps") or {}).items():
+            step_latency.setdefault(name, []).append(ms)
+        for name in e.get("cache_hits") or ():
+            cache.setdefault(name, Counter())["hit"] += 1
+        for name in e.get("cache_misses") or ():
+            cache.setdefault(name, Counter())["miss"] += 1
+        # stage 1 = 추천된 카테고리, stage 2 이후 = 유저가 선택한 세부 항목
+        (categories if e.get("stage") == 1 else selections).update(e.get("categories") or ())
+
+    return {
+        "events": sum(outcomes.values()),
+        "users": len(users),
+        "outcomes": dict(outcomes),
+        "stages": dict(stages),
+        "stage_latency_ms": {k: _percentiles(v) for k, v in sorted(stage_latency.items())},
+        "step_latency_ms": {k: _percentiles(v) for k, v in sorted(step_latency.items())},
+        "cache_hit_rate": {
+            name: {"hit": c["hit"], "miss": c["miss"], "rate": round(c["hit"] / (c["hit"] + c["miss"]), 3)}
+            for name, c in sorted(cache.items())
+        },
+        "recommended_categories": categories.most_common(),
+        "selected_categories": selections.most_common(),
+        "daily_latency_ms": {day: _percentiles(v) for day, v in sorted(daily.items())},
+    }
+
+
+def _print_summary(summary: dict, top: int) -> None:
+    print(f"📊 이벤트 {summary['events']}건, 유저 {summary['users']}명")
+    print(f"  결과: {summary['outcomes']}")
+    print(f"  stage: {summary['stages']}")
+
+    def table(title: str, rows: dict) -> None:
+        print(f"\n⏱️ {title}")
+        print(f"  {'':<28}{'count':>8}{'p50':>10}{'p90':>10}{'p99':>10}")
+        for name, p in rows.items():
+            if p["count"]:
+                print(f"  {name:<28}{p['count']:>8}{p['p50']:>10}{p['p90']:>10}{p['p99']:>10}")
+
+    table("stage 별 전체 지연 (ms)", summary["stage_latency_ms"])
+    table("단계별 지연 (ms)", summary["step_latency_ms"])
+    table("일별 전체 지연 (ms)", summary["daily_latency_ms"])
+
+    print("\n🗃️ 캐시 적중률")
+    for name, c in summary["cache_hit_rate"].items():
+        print(f"  {name:<28}{c['rate'] * 100:>7.1f}%  (hit {c['hit']} / miss {c['miss']})")
+
+    for title, key in (("추천된 카테고리", "recommended_categories"), ("선택된 세부 항목 (사전 워밍 후보)", "selected_categories")):
+        print(f"\n🔥 {title} 상위 {top}")
+        for name, count in summary[key][:top]:
+            print(f"  {count:>6}  {name}")
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description="webhook 이벤트 로그 분석")
+    sub = parser.add_subparsers(dest="command", required=True)
+    summarize = sub.add_parser("summarize", help="이벤트 로그 요약")
+    summarize.add_argument("directory", type=Path, nargs="?", default=EVENT_LOG_DIR)
+    summarize.add_argument("--days", type=float, default=0, help="최근 N일만 (기본: 전체)")
+    summarize.add_argument("--top", type=int, default=20, help="인기 카테고리 출력 개수")
+    summarize.add_argument("--json", action="store_true", help="요약을 JSON 으로 출력")
+    args = parser.parse_args(argv)
+
+    since = time.time() - args.days * 86400 if args.days > 0 else 0.0
+    summary = summarize_events(iter_events(args.directory, since))
+    if args.json:
+        print(json.dumps(summary, ensure_ascii=False, indent=2))
+    else:
+        _print_summary(summary, args.top)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,279 @@
+"""
+http_cache.py
+──────────────────────────────
+- 다나와 페이지 GET 용 디스크 HTTP 캐시 (ETag / Last-Modified 조건부 요청)
+- URL 마다 메타(JSON) + 본문(zlib 압축) 파일 1쌍 저장: storage/http_cache/<sha256(url)>.{json,body}
+- 신선도: HTTP_CACHE_TTL 이 설정되어 있으면 그 값, 아니면 Cache-Control max-age (no-store 는 저장하지 않음)
+  → 신선하면 네트워크 요청 없이 반환, 만료되면 If-None-Match / If-Modified-Since 로 재검증 (304 면 본문 재사용)
+- 네트워크 오류 시 만료된 캐시라도 있으면 그대로 반환 (stale-if-error)
+- fetch_parsed(): 본문이 바뀌지 않았으면 이전 파싱 결과까지 재사용 (BeautifulSoup 파싱 생략)
+- requests 세션(커넥션 풀)은 프로세스당 1개, 첫 요청 시 생성
+
+📌 환경 변수
+- HTTP_CACHE_DIR : 캐시 디렉터리 (기본 storage/http_cache)
+- HTTP_CACHE_TTL : 신선도 강제 지정(초) — 비워두면 Cache-Control 사용, 0 이면 매번 재검증
+
+📌 메트릭
+- http_cache_requests_total{result=fresh|revalidated|miss|stale_error} : fresh = 요청 없음, revalidated = 304
+- http_cache_bytes_total{kind=downloaded|served}                        : 실제 전송량 / 캐시에서 제공한 양
+
+📌 사용 예
+    response = cached_get("https://www.danawa.com/", headers=DEFAULT_HEADERS)
+    hrefs = fetch_parsed("https://www.danawa.com/", "category_hrefs", parse_hrefs, headers=DEFAULT_HEADERS)
+"""
+
+import hashlib
+import os
+import re
+import threading
+import time
+import zlib
+from pathlib import Path
+from typing import Any, Callable, Optional
+
+from app.utils.metrics import counter, record_cache
+from app.utils.serializer import read_json, write_json
+
+# =====================================================
+# 0️⃣ 전역 설정
+# =====================================================
+PROJECT_ROOT = Path(__file__).resolve().parent.parent.parent
+HTTP_CACHE_DIR = Path(os.getenv("HTTP_CACHE_DIR") or PROJECT_ROOT / "storage" / "http_cache")
+_ttl_env = os.getenv("HTTP_CACHE_TTL", "").strip()
+HTTP_CACHE_TTL: Optional[float] = float(_ttl_env) if _ttl_env else None
+
+DEFAULT_HEADERS = {
+    "User-Agent": (
+        "Mozilla/5.0 (Windows NT 10.0; Win64; x64) "
+        "AppleWebKit/537.36 (KHTML, like Gecko) "
+        "Chrome/115.0.0.0 Safari/537.36"
+    )
+}
+
+HTTP_CACHE_REQUESTS = counter(
+    "http_cache_requests_total",
+    "HTTP 캐시 조회 결과 (result=fresh|revalidated|miss|stale_error)",
+    ("result",),
+)
+HTTP_CACHE_BYTES = counter(
+    "http_cache_bytes_total",
+    "HTTP 캐시 본문 크기 (kind=downloaded: 실제 전송, served: 캐시에서 제공)",
+    ("kind",),
+)
+
+MAX_AGE_PATTERN = re.compile(r"(?:s-maxage|max-age)\s*=\s*(\d+)")
+
+_session = None
+_session_lock = threading.Lock()
+
+
+def get_http_session():
+    """공용 requests.Session (keep-alive 커넥션 풀 재사용)"""
+    global _session
+    if _session is None:
+        with _session_lock:
+            if _session is None:
+                import requests
+
+                _session = requests.Session()
+    return _session
+
+
+# =====================================================
+# 1️⃣ 응답 / 캐시 항목
+# =====================================================
+class CachedResponse:
+    """
+    requests.Response 중 크롤러가 쓰는 부분만 가진 응답
+
+    Attributes:
+        source (str): fresh | revalidated | miss | stale_error
+        changed (bool): 이전 캐시와 본문이 다른지 (miss 이면서 본문 해시가 달라진 경우만 True)
+    """
+
+    def __init__(self, url: str, status_code: int, headers: dict, content: bytes, encoding: str,
+                 source: str, changed: bool):
+        self.url = url
+        self.status_code = status_code
+        self.headers = headers
+        self.content = content
+        self.encoding = encoding
+        self.source = source
+        self.changed = changed
+
+    @property
+    def text(self) -> str:
+        return self.content.decode(self.encoding or "utf-8", errors="replace")
+
+    @property
+    def from_cache(self) -> bool:
+        return self.source != "miss"
+
+    def raise_for_status(self) -> None:
+        if self.status_code >= 400:
+            raise RuntimeError(f"HTTP {self.status_code}: {self.url}")
+
+
+def _paths(url: str, directory: Path) -> tuple[Path, Path]:
+    digest = hashlib.sha256(url.encode("utf-8")).hexdigest()[:32]
+    return directory / f"{digest}.json", directory / f"{digest}.body"
+
+
+def _max_age(cache_control: str) -> Optional[float]:
+    """Cache-Control 기준 신선도(초), 저장하면 안 되면 -1"""
+    directives = cache_control.lower()
+    if "no-store" in directives:
+        return -1
+    if "no-cache" in directives:
+        return 0
+    match = MAX_AGE_PATTERN.search(directives)
+    return float(match.group(1)) if match else None
+
+
+def _is_fresh(meta: dict, ttl: Optional[float]) -> bool:
+    age = time.time() - meta["fetched_at"]
+    if ttl is not None:
+        return age < ttl
+    max_age = meta.get("max_age")
+    return max_age is not None and age < max_age
+
+
+# =====================================================
+# 2️⃣ 조건부 GET
+# =====================================================
+def cached_get(url: str, headers: Optional[dict] = None, ttl: Optional[float] = HTTP_CACHE_TTL,
+               timeout: float = 10.0, directory: Path = HTTP_CACHE_DIR) -> CachedResponse:
+    """
+    캐시를 거친 GET
+
+    Args:
+        url (str): 요청 URL
+        headers (dict | None): 요청 헤더 (기본 DEFAULT_HEADERS)
+        ttl (float | None): 신선도 강제 지정(초), None 이면 Cache-Control
+        timeout (float): 요청 타임아웃(초)
+        directory (Path): 캐시 디렉터리
+
+    Returns:
+        CachedResponse: 2xx 이외 응답은 저장하지 않고 그대로 반환
+    """
+    meta_path, body_path = _paths(url, directory)
+    meta = read_json(meta_path) if meta_path.exists() and body_path.exists() else None
+
+    if meta is not None and _is_fresh(meta, ttl):
+        return _serve(meta, body_path, "fresh")
+
+    request_headers = dict(headers or DEFAULT_HEADERS)
+    if meta is not None:
+        if meta.get("etag"):
+            request_headers["If-None-Match"] = meta["etag"]
+        if meta.get("last_modified"):
+            request_headers["If-Modified-Since"] = meta["last_modified"]
+
+    try:
+        response = get_http_session().get(url, headers=request_headers, timeout=timeout)
+    except Exception as e:
+        if meta is None:
+            raise
+        print(f"⚠️ HTTP 요청 실패 → 만료된 캐시 사용: {url} ({e})")
+        return _serve(meta, body_path, "stale_error")
+
+    if response.status_code == 304 and meta is not None:
+        meta["fetched_at"] = time.time()
+        cache_control = response.headers.get("Cache-Control")
+        if cache_control is not None:
+            meta["max_age"] = _max_age(cache_control)
+        write_json(meta_path, meta)
+        return _serve(meta, body_path, "revalidated")
+
+    content = response.content
+    HTTP_CACHE_REQUESTS.inc(result="miss")
+    HTTP_CACHE_BYTES.inc(len(content), kind="downloaded")
+    record_cache("http_cache", False)
+
+    changed = meta is None or meta.get("sha256") != hashlib.sha256(content).hexdigest()
+    result = CachedResponse(url, response.status_code, dict(response.headers), content,
+                            response.encoding or "utf-8", "miss", changed)
+    max_age = _max_age(response.headers.get("Cache-Control", ""))
+    if 200 <= response.status_code < 300 and max_age != -1:
+        _store(url, meta_path, body_path, response, content, max_age,
+               parsed=None if changed or meta is None else meta.get("parsed"))
+    elif max_age == -1:  # no-store → 이전 캐시도 제거
+        meta_path.unlink(missing_ok=True)
+        body_path.unlink(missing_ok=True)
+    return result
+
+
+def _serve(meta: dict, body_path: Path, source: str) -> CachedResponse:
+    content = zlib.decompress(body_path.read_bytes())
+    HTTP_CACHE_REQUESTS.inc(result=source)
+    HTTP_CACHE_BYTES.inc(len(content), kind="served")
+    record_cache("http_cache", True)
+    return CachedResponse(meta["url"], meta["status"], meta.get("headers", {}), content,
+                          meta.get("encoding") or "utf-8", source, changed=False)
+
+
+def _store(url: str, meta_path: Path, body_path: Path, response, content: bytes,
+           max_age: Optional[float], parsed: Optional[dict]) -> None:
+    directory = meta_path.parent
+    directory.mkdir(parents=True, exist_ok=True)
+    tmp_path = body_path.with_suffix(f".body.{os.getpid()}.tmp")
+    tmp_path.write_bytes(zlib.compress(content, 6))
+    os.replace(tmp_path, body_path)
+    write_json(meta_path, {
+        "url": url,
+        "status": response.status_code,
+        "headers": {k: v for k, v in response.headers.items() if k.lower() in ("content-type", "cache-control")},
+        "encoding": response.encoding,
+        "etag": response.headers.get("ETag"),
+        "last_modified": response.headers.get("Last-Modified"),
+        "max_age": max_age,
+        "fetched_at": time.time(),
+        "sha256": hashlib.sha256(content).hexdigest(),
+        "parsed": parsed or {},
+    })
+
+
+# =====================================================
+# 3️⃣ 파싱 결과 재사용
+# =====================================================
+def fetch_parsed(url: str, name: str, parse: Callable[[str], Any], headers: Optional[dict] = None,
+                 ttl: Optional[float] = HTTP_CACHE_TTL, directory: Path = HTTP_CACHE_DIR) -> Any:
+    """
+    cached_get + parse(text), 본문이 바뀌지 않았으면 저장된 파싱 결과 반환
+
+    Args:
+        name (str): 파싱 결과 이름 (한 URL 에 여러 파서를 쓸 수 있도록 구분)
+        parse: HTML 텍스트 → JSON 직렬화 가능한 값
+
+    Returns:
+        parse 결과
+    """
+    response = cached_get(url, headers=headers, ttl=ttl, directory=directory)
+    response.raise_for_status()
+    meta_path, _ = _paths(url, directory)
+
+    if not response.changed and meta_path.exists():
+        meta = read_json(meta_path)
+        if name in meta.get("parsed", {}):
+            return meta["parsed"][name]
+    else:
+        meta = read_json(meta_path) if meta_path.exists() else None
+
+    value = parse(response.text)
+    if meta is not None:
+        meta.setdefault("parsed", {})[name] = value
+        write_json(meta_path, meta)
+    return value
+
+
+# =====================================================
+# CLI 테스트
+# =====================================================
+if __name__ == "__main__":
+    import sys
+
+    target = sys.argv[1] if len(sys.argv) > 1 else "https://www.danawa.com/"
+    for _ in range(2):
+        start = time.perf_counter()
+        r = cached_get(target)
+        print(f"{r.source:<12} {r.status_code} {len(r.content):>9,}B {(time.perf_counter() - start) * 1000:.1f}ms")
@@ -0,0 +1,143 @@
+"""
+idempotency.py
+──────────────────────────────
+- 카카오 재전송 / 중복 전달된 webhook 요청을 한 번만 처리하기 위한 짧은 TTL 캐시
+- 같은 키의 요청이 처리 중이면 첫 요청의 결과를 기다리고,
+  처리가 끝났으면 TTL 동안 저장된 응답을 그대로 반환 (LLM 호출 / 크롤링 / 세션 갱신 재실행 없음)
+- 첫 요청이 예외로 끝나거나 취소되면 캐시에 남기지 않음 → 대기 중이던 중복 요청이 다시 처리
+- 프로세스(워커) 단위 캐시
+
+📌 환경 변수
+- IDEMPOTENCY_TTL         : 완료된 응답 보관 시간(초), 0 이면 비활성화 (기본 10)
+- IDEMPOTENCY_MAX_ENTRIES : 완료된 응답 최대 보관 개수 (기본 10000)
+
+📌 키
+- (user id, utterance, 액션 값(clientExtra), request id) — request id 는 X-Request-Id 헤더가 있을 때만 사용
+- request id 가 있으면 완료된 응답을 TTL 동안 재사용
+- 카카오 스킬 요청에는 요청별 ID가 없으므로, 이 경우 처리 중인 요청에만 합류하고 완료된 응답은 보관하지 않음
+  → stage 4 에서 "1" 을 두 번 고르거나 확인 질문에 연달아 "네" 라고 답해도 매번 새로 처리
+"""
+
+import asyncio
+import json
+import os
+import time
+from collections import OrderedDict
+from typing import Any, Awaitable, Callable, Optional
+
+from app.utils.metrics import record_cache
+
+# =====================================================
+# 0️⃣ 전역 설정
+# =====================================================
+IDEMPOTENCY_TTL = float(os.getenv("IDEMPOTENCY_TTL", "10"))
+IDEMPOTENCY_MAX_ENTRIES = int(os.getenv("IDEMPOTENCY_MAX_ENTRIES", "10000"))
+
+
+def make_idempotency_key(user_id: str, utterance: str, request_id: Optional[str] = None,
+                         params: Optional[dict] = None) -> str:
+    extra = json.dumps(params, ensure_ascii=False, sort_keys=True, default=str) if params else ""
+    return "\x1f".join((user_id, utterance, extra, request_id or ""))
+
+
+# =====================================================
+# 1️⃣ 캐시
+# =====================================================
+class IdempotencyCache:
+    """
+    key → 처리 중(Future) / 완료(만료 시각, 응답) 저장소
+
+    Args:
+        name (str): 메트릭 라벨 (cache_requests_total{cache=name})
+        ttl (float): 완료 응답 보관 시간(초)
+        max_entries (int): 완료 응답 최대 보관 개수 (초과 시 오래된 것부터 제거)
+    """
+
+    def __init__(self, name: str, ttl: float = IDEMPOTENCY_TTL, max_entries: int = IDEMPOTENCY_MAX_ENTRIES):
+        self.name = name
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self._inflight: dict[str, asyncio.Future] = {}
+        self._done: OrderedDict[str, tuple[float, Any]] = OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self._inflight) + len(self._done)
+
+    def _purge(self, now: float) -> None:
+        # TTL 이 고정이므로 먼저 들어온 항목이 먼저 만료됨
+        while self._done:
+            expires_at = next(iter(self._done.values()))[0]
+            if expires_at > now and len(self._done) <= self.max_entries:
+                break
+            self._done.popitem(last=False)
+
+    async def run(self, key: str, factory: Callable[[], Awaitable[Any]], keep: bool = True) -> tuple[Any, bool]:
+        """
+        key 로 factory() 를 최대 한 번 실행
+
+        Args:
+            keep (bool): False 면 처리 중인 동안만 합류하고 완료된 응답은 보관하지 않음
+
+        Returns:
+            (result, replayed): replayed=True 면 이전(또는 동시 진행 중) 요청의 결과
+        """
+        if self.ttl <= 0:
+            return await factory(), False
+
+        while True:
+            self._purge(time.monotonic())
+            done = self._done.get(key)
+            if done is not None:
+                record_cache(self.name, True)
+                return done[1], True
+
+            pending = self._inflight.get(key)
+            if pending is None:
+                break
+            # 첫 요청이 끝날 때까지 대기 (실패 / 취소면 다음 루프에서 직접 처리)
+            await asyncio.wait({pending})
+            if not pending.cancelled() and pending.exception() is None:
+                record_cache(self.name, True)
+                return pending.result(), True
+
+        record_cache(self.name, False)
+        future = asyncio.get_running_loop().create_future()
+        self._inflight[key] = future
+        try:
+            result = await factory()
+        except BaseException:
+            self._inflight.pop(key, None)
+            future.cancel()
+            raise
+
+        self._inflight.pop(key, None)
+        future.set_result(result)
+        if keep:
+            self._done[key] = (time.monotonic() + self.ttl, result)
+            self._done.move_to_end(key)
+        return result, False
+
+    def clear(self) -> None:
+        self._inflight.clear()
+        self._done.clear()
+
+
+# =====================================================
+# CLI 테스트
+# =====================================================
+if __name__ == "__main__":
+    calls = 0
+
+    async def slow_handler():
+        global calls
+        calls += 1
+        await asyncio.sleep(0.1)
+        return {"text": "응답"}
+
+    async def demo():
+        cache = IdempotencyCache("example", ttl=1)
+        key = make_idempotency_key("user", "노트북 추천")
+        results = await asyncio.gather(*(cache.run(key, slow_handler) for _ in range(3)))
+        print(results, await cache.run(key, slow_handler), f"handler 호출 {calls}회")
+
+    asyncio.run(demo())
@@ -1,12 +1,11 @@
 import os
-import requests
 
-from dotenv import load_dotenv
-from app.utils.config import BASE_URL
+from app.utils.config import get_settings, load_env
 
 # 환경 변수 로드
-load_dotenv()
+load_env()
 KAKAO_REST_API_KEY = os.getenv("KAKAO_REST_API_KEY")
+KAKAO_AUTH_HOST = os.getenv("KAKAO_AUTH_HOST", "https://kauth.kakao.com")  # 부하 테스트 시 fake 서버로 교체
 
 
 def build_kakao_auth_url(user_id: str = "") -> str:
@@ -14,9 +13,9 @@ def build_kakao_auth_url(user_id: str = "") -> str:
     카카오 로그인 인증 URL 생성
     - user_id를 state 파라미터로 전달
     """
-    redirect_uri = f"{BASE_URL}/oauth"
+    redirect_uri = f"{get_settings().get('BASE_URL')}/oauth"
     url = (
-        f"https://kauth.kakao.com/oauth/authorize"
+        f"{KAKAO_AUTH_HOST}/oauth/authorize"
         f"?client_id={KAKAO_REST_API_KEY}"
         f"&redirect_uri={redirect_uri}"
         f"&response_type=code"
@@ -31,8 +30,8 @@ def get_kakao_access_token(code: str) -> dict:
     카카오 access_token 발급
     - 인자로 전달받은 일회성 code를 이용해 토큰 발급 요청
     """
-    redirect_uri = f"{BASE_URL}/oauth"
-    url = "https://kauth.kakao.com/oauth/token"
+    redirect_uri = f"{get_settings().get('BASE_URL')}/oauth"
+    url = f"{KAKAO_AUTH_HOST}/oauth/token"
     headers = {"Content-Type": "application/x-www-form-urlencoded"}
     data = {
         "grant_type": "authorization_code",
@@ -41,6 +40,8 @@ def get_kakao_access_token(code: str) -> dict:
         "code": code,
     }
 
+    import requests  # 인증 콜백에서만 사용 → 서버 기동 시 임포트하지 않음
+
     response = requests.post(url, headers=headers, data=data)
     response.raise_for_status()
     return response.json()
@@ -0,0 +1,152 @@
+"""
+kakao_response.py
+──────────────────────────────
+- 카카오 i 오픈빌더 스킬 응답(version 2.0) 생성
+- simpleText 외에 quickReplies / listCard / carousel 출력 지원
+- 버튼 · 목록 항목 · 바로가기 응답에 구조화된 액션 값(extra)을 실어 보냄
+  → 다음 요청의 action.clientExtra 로 돌아오므로 webhook 에서 LLM 없이 바로 처리
+    (select: mid_key / detail_key, confirm: yes | no)
+
+📌 버튼 동작
+- KAKAO_SKILL_BLOCK_ID 설정 시: action="block" → 같은 스킬 블록으로 이동하면서 extra 전달
+- 미설정 시: action="message" → 라벨과 같은 문구(세부 항목명 / "네" / "아니요")가 발화로 전송,
+  webhook 은 로컬 규칙(정확한 항목명 · 짧은 긍정/부정)으로 LLM 없이 처리
+
+📌 카카오 제한 (초과분은 잘라냄)
+- outputs 3개, quickReplies 10개 (라벨 14자), carousel 카드 10개, listCard 항목 5개 (carousel 안에서는 4개)
+
+📌 사용 예
+    make_response([simple_text("진행할까요?")], quick_replies=confirm_quick_replies())
+"""
+
+import os
+from typing import Optional
+
+# =====================================================
+# 0️⃣ 전역 설정
+# =====================================================
+KAKAO_SKILL_BLOCK_ID = os.getenv("KAKAO_SKILL_BLOCK_ID", "")
+
+MAX_OUTPUTS = 3
+MAX_QUICK_REPLIES = 10
+MAX_QUICK_REPLY_LABEL = 14
+MAX_CAROUSEL_CARDS = 10
+MAX_LIST_ITEMS = 5
+MAX_LIST_ITEMS_IN_CAROUSEL = 4
+
+ACTION_SELECT = "select"
+ACTION_CONFIRM = "confirm"
+
+
+# =====================================================
+# 1️⃣ 기본 출력
+# =====================================================
+def simple_text(text: str) -> dict:
+    return {"simpleText": {"text": text}}
+
+
+def _action(message_text: str, extra: Optional[dict]) -> dict:
+    """버튼 / 목록 항목 / 바로가기 공통 동작 필드"""
+    if KAKAO_SKILL_BLOCK_ID and extra:
+        return {"action": "block", "blockId": KAKAO_SKILL_BLOCK_ID, "messageText": message_text, "extra": extra}
+    action = {"action": "message", "messageText": message_text}
+    if extra:
+        action["extra"] = extra
+    return action
+
+
+def quick_reply(label: str, message_text: Optional[str] = None, extra: Optional[dict] = None) -> dict:
+    """
+    바로가기 응답 1개
+
+    Args:
+        label (str): 버튼 라벨 (14자 초과 시 잘림)
+        message_text (str | None): 눌렀을 때 전송될 발화 (기본 label 전체)
+        extra (dict | None): 다음 요청의 action.clientExtra 로 전달될 값
+    """
+    short = label if len(label) <= MAX_QUICK_REPLY_LABEL else label[:MAX_QUICK_REPLY_LABEL - 1] + "…"
+    return {"label": short, **_action(message_text or label, extra)}
+
+
+def list_item(title: str, description: str = "", message_text: Optional[str] = None,
+              extra: Optional[dict] = None) -> dict:
+    item = {"title": title, **_action(message_text or title, extra)}
+    if description:
+        item["description"] = description
+    return item
+
+
+def list_card(header: str, items: list[dict], buttons: Optional[list[dict]] = None,
+              max_items: int = MAX_LIST_ITEMS) -> dict:
+    """
+    listCard 출력 (carousel 안에 넣을 때는 {"listCard": …} 가 아닌 내부 dict 가 필요 → carousel() 이 처리)
+    """
+    card = {"header": {"title": header}, "items": items[:max_items]}
+    if buttons:
+        card["buttons"] = buttons[:2]
+    return {"listCard": card}
+
+
+def carousel(cards: list[dict]) -> dict:
+    """
+    같은 종류 카드 목록 → carousel 출력 (listCard(…) / basicCard 형태의 출력 dict 를 그대로 받음)
+    """
+    cards = cards[:MAX_CAROUSEL_CARDS]
+    card_type = next(iter(cards[0])) if cards else "listCard"
+    return {"carousel": {"type": card_type, "items": [card[card_type] for card in cards]}}
+
+
+def make_response(outputs: list[dict], quick_replies: Optional[list[dict]] = None) -> dict:
+    template = {"outputs": outputs[:MAX_OUTPUTS]}
+    if quick_replies:
+        template["quickReplies"] = quick_replies[:MAX_QUICK_REPLIES]
+    return {"version": "2.0", "template": template}
+
+
+# =====================================================
+# 2️⃣ 챗봇 단계별 응답
+# =====================================================
+def select_extra(mid_key: str, detail_key: str) -> dict:
+    return {"action": ACTION_SELECT, "mid_key": mid_key, "detail_key": detail_key}
+
+
+def confirm_quick_replies() -> list[dict]:
+    """stage 3 확인용 예 / 아니요 바로가기 (문구는 is_affirmative 로컬 규칙과 일치)"""
+    return [
+        quick_reply("네", extra={"action": ACTION_CONFIRM, "confirm": "yes"}),
+        quick_reply("아니요", extra={"action": ACTION_CONFIRM, "confirm": "no"}),
+    ]
+
+
+def recommendation_response(header_text: str, recommended: dict[str, list[str]], text: str) -> dict:
+    """
+    stage 1 추천 결과 응답
+
+    - 모든 세부 항목이 carousel(중간키별 listCard) 안에 들어가면: 안내 문구 + carousel
+    - 넘치면: 기존 번호 목록 텍스트 + 앞쪽 세부 항목 바로가기
+    항목 제목에는 번호 목록과 같은 번호를 붙여 번호 입력과 버튼 선택이 같은 결과가 되도록 함
+
+    Args:
+        header_text (str): carousel 위에 표시할 문구
+        recommended (dict): {중간키: [세부항목, …]}
+        text (str): 넘칠 때 사용할 번호 목록 텍스트 (format_recommendation_message 결과)
+    """
+    fits = 0 < len(recommended) <= MAX_CAROUSEL_CARDS and all(
+        0 < len(details) <= MAX_LIST_ITEMS_IN_CAROUSEL for details in recommended.values()
+    )
+
+    if fits:
+        cards, idx = [], 1
+        for mid_key, details in recommended.items():
+            items = []
+            for detail in details:
+                items.append(list_item(f"{idx}. {detail}", message_text=detail, extra=select_extra(mid_key, detail)))
+                idx += 1
+            cards.append(list_card(mid_key, items, max_items=MAX_LIST_ITEMS_IN_CAROUSEL))
+        return make_response([simple_text(header_text), carousel(cards)])
+
+    replies = [
+        quick_reply(detail, extra=select_extra(mid_key, detail))
+        for mid_key, details in recommended.items() for detail in details
+    ]
+    return make_response([simple_text(text)], quick_replies=replies)
@@ -0,0 +1,343 @@
+"""
+metrics.py
+──────────────────────────────
+- 프로세스 내 메트릭 레지스트리 (Counter / Gauge / Histogram)
+- Prometheus 텍스트 포맷(0.0.4)으로 렌더링 → /metrics 엔드포인트에서 노출
+- 외부 의존성 없이 동작하며, 모든 메트릭은 라벨 조합별로 누적됨
+
+📌 사용 예
+- STAGE_DURATION.observe(0.42, stage="1")
+- with LLM_REQUEST_DURATION.time(module="refine", model="gpt-4o-mini"): …
+- SESSION_STORE_SIZE.set_function(lambda: len(session_states))
+"""
+
+import math
+import threading
+import time
+from contextlib import contextmanager
+from typing import Callable, Iterator, Optional
+
+# =====================================================
+# 0️⃣ 전역 설정
+# =====================================================
+CONTENT_TYPE_LATEST = "text/plain; version=0.0.4; charset=utf-8"
+
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+
+_registry: dict[str, "_Metric"] = {}
+_registry_lock = threading.Lock()
+
+
+# =====================================================
+# 1️⃣ 메트릭 타입
+# =====================================================
+def _escape(value: str) -> str:
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_labels(labelnames: tuple, labelvalues: tuple, extra: Optional[dict] = None) -> str:
+    pairs = [f'{k}="{_escape(v)}"' for k, v in zip(labelnames, labelvalues)]
+    if extra:
+        pairs.extend(f'{k}="{_escape(v)}"' for k, v in extra.items())
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+
+def _format_value(value: float) -> str:
+    if math.isinf(value):
+        return "+Inf" if value > 0 else "-Inf"
+    if float(value).is_integer():
+        return str(int(value))
+    return repr(float(value))
+
+
+class _Metric:
+    kind = "untyped"
+
+    def __init__(self, name: str, documentation: str, labelnames: tuple = ()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._lock = threading.Lock()
+
+    def _key(self, labels: dict) -> tuple:
+        if set(labels) != set(self.labelnames):
+            raise ValueError(f"{self.name}: 라벨이 일치하지 않습니다. 필요: {self.labelnames}, 전달: {tuple(labels)}")
+        return tuple(str(labels[name]) for name in self.labelnames)
+
+    def render(self) -> list[str]:
+        return [
+            f"# HELP {self.name} {self.documentation}",
+            f"# TYPE {self.name} {self.kind}",
+        ]
+
+
+class Counter(_Metric):
+    """단조 증가 카운터"""
+    kind = "counter"
+
+    def __init__(self, name: str, documentation: str, labelnames: tuple = ()):
+        super().__init__(name, documentation, labelnames)
+        self._values: dict[tuple, float] = {}
+
+    def inc(self, amount: float = 1.0, **labels) -> None:
+        if amount < 0:
+            raise ValueError(f"{self.name}: Counter는 감소할 수 없습니다.")
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0.0) + amount
+
+    def value(self, **labels) -> float:
+        return self._values.get(self._key(labels), 0.0)
+
+    def render(self) -> list[str]:
+        lines = super().render()
+        with self._lock:
+            items = list(self._values.items())
+        for key, value in items:
+            lines.append(f"{self.name}{_format_labels(self.labelnames, key)} {_format_value(value)}")
+        return lines
+
+
+class Gauge(_Metric):
+    """임의로 증감 가능한 게이지 (콜백 지정 시 렌더링 시점에 계산)"""
+    kind = "gauge"
+
+    def __init__(self, name: str, documentation: str, labelnames: tuple = ()):
+        super().__init__(name, documentation, labelnames)
+        self._values: dict[tuple, float] = {}
+        self._functions: dict[tuple, Callable[[], float]] = {}
+
+    def set(self, value: float, **labels) -> None:
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = float(value)
+
+    def inc(self, amount: float = 1.0, **labels) -> None:
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0.0) + amount
+
+    def dec(self, amount: float = 1.0, **labels) -> None:
+        self.inc(-amount, **labels)
+
+    def set_function(self, fn: Callable[[], float], **labels) -> None:
+        key = self._key(labels)
+        with self._lock:
+            self._functions[key] = fn
+
+    def value(self, **labels) -> float:
+        key = self._key(labels)
+        fn = self._functions.get(key)
+        return float(fn()) if fn else self._values.get(key, 0.0)
+
+    def render(self) -> list[str]:
+        lines = super().render()
+        with self._lock:
+            items = dict(self._values)
+            functions = dict(self._functions)
+        for key, fn in functions.items():
+            try:
+                items[key] = float(fn())
+            except Exception as e:
+                print(f"⚠️ 게이지 콜백 실패 ({self.name}): {e}")
+        for key, value in items.items():
+            lines.append(f"{self.name}{_format_labels(self.labelnames, key)} {_format_value(value)}")
+        return lines
+
+
+class Histogram(_Metric):
+    """누적 버킷 히스토그램"""
+    kind = "histogram"
+
+    def __init__(self, name: str, documentation: str, labelnames: tuple = (), buckets: tuple = DEFAULT_BUCKETS):
+        super().__init__(name, documentation, labelnames)
+        self.buckets = tuple(sorted(buckets)) + (math.inf,)
+        self._counts: dict[tuple, list[int]] = {}
+        self._sums: dict[tuple, float] = {}
+
+    def observe(self, value: float, **labels) -> None:
+        key = self._key(labels)
+        with self._lock:
+            counts = self._counts.setdefault(key, [0] * len(self.buckets))
+            for idx, bound in enumerate(self.buckets):
+                if value <= bound:
+                    counts[idx] += 1
+                    break
+            self._sums[key] = self._sums.get(key, 0.0) + value
+
+    @contextmanager
+    def time(self, **labels) -> Iterator[None]:
+        """with 블록 실행 시간을 초 단위로 기록 (예외 발생 시에도 기록)"""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(time.perf_counter() - start, **labels)
+
+    def count(self, **labels) -> int:
+        return sum(self._counts.get(self._key(labels), []))
+
+    def render(self) -> list[str]:
+        lines = super().render()
+        with self._lock:
+            items = [(key, list(counts), self._sums[key]) for key, counts in self._counts.items()]
+        for key, counts, total in items:
+            cumulative = 0
+            for bound, count in zip(self.buckets, counts):
+                cumulative += count
+                labels = _format_labels(self.labelnames, key, {"le": _format_value(bound)})
+                lines.append(f"{self.name}_bucket{labels} {cumulative}")
+            labels = _format_labels(self.labelnames, key)
+            lines.append(f"{self.name}_sum{labels} {_format_value(total)}")
+            lines.append(f"{self.name}_count{labels} {cumulative}")
+        return lines
+
+
+# =====================================================
+# 2️⃣ 레지스트리
+# =====================================================
+def _get_or_create(cls, name: str, documentation: str, labelnames: tuple, **kwargs):
+    with _registry_lock:
+        metric = _registry.get(name)
+        if metric is None:
+            metric = cls(name, documentation, labelnames, **kwargs)
+            _registry[name] = metric
+        elif not isinstance(metric, cls) or metric.labelnames != tuple(labelnames):
+            raise ValueError(f"❌ 메트릭 정의 충돌: {name}")
+        return metric
+
+
+def counter(name: str, documentation: str, labelnames: tuple = ()) -> Counter:
+    return _get_or_create(Counter, name, documentation, labelnames)
+
+
+def gauge(name: str, documentation: str, labelnames: tuple = ()) -> Gauge:
+    return _get_or_create(Gauge, name, documentation, labelnames)
+
+
+def histogram(name: str, documentation: str, labelnames: tuple = (), buckets: tuple = DEFAULT_BUCKETS) -> Histogram:
+    return _get_or_create(Histogram, name, documentation, labelnames, buckets=buckets)
+
+
+def render_metrics() -> str:
+    """레지스트리 전체를 Prometheus 텍스트 포맷으로 렌더링"""
+    with _registry_lock:
+        metrics = list(_registry.values())
+    lines = []
+    for metric in metrics:
+        lines.extend(metric.render())
+    return "\n".join(lines) + "\n"
+
+
+# =====================================================
+# 3️⃣ 공용 메트릭 정의
+# =====================================================
+STAGE_DURATION = histogram(
+    "chatbot_stage_duration_seconds",
+    "handle_stage_N 처리 시간",
+    ("stage",),
+)
+
+STRUCTURED_ACTIONS = counter(
+    "chatbot_structured_actions_total",
+    "버튼 / 바로가기 액션 값 처리 결과 (action=select|confirm, result=used|ignored)",
+    ("action", "result"),
+)
+
+KEYWORD_SPOTTER = counter(
+    "keyword_spotter_total",
+    "stage 1 카탈로그 키워드 빠른 경로 판정 (result=hit|ambiguous|negated|miss, hit 이면 validate_llm 생략)",
+    ("result",),
+)
+
+LLM_REQUESTS = counter(
+    "llm_requests_total",
+    "chatbot_llm 모듈별 OpenAI 호출 수",
+    ("module", "status"),
+)
+LLM_REQUEST_DURATION = histogram(
+    "llm_request_duration_seconds",
+    "chatbot_llm 모듈별 OpenAI 호출 지연 시간",
+    ("module", "model"),
+)
+LLM_TOKENS = counter(
+    "llm_tokens_total",
+    "chatbot_llm 모듈별 OpenAI 토큰 사용량 (kind=prompt|completion)",
+    ("module", "kind"),
+)
+
+CRAWL_PAGE_LOAD = histogram(
+    "crawl_page_load_seconds",
+    "크롤러 페이지 로드(driver.get / HTTP GET) 시간",
+    ("crawler",),
+)
+CRAWL_DURATION = histogram(
+    "crawl_duration_seconds",
+    "크롤링 1회 전체 소요 시간 (드라이버 기동 포함)",
+    ("crawler",),
+)
+CRAWL_FAILURES = counter(
+    "crawl_failures_total",
+    "크롤링 단계별 실패 수",
+    ("crawler", "step"),
+)
+
+ADMISSION_IN_FLIGHT = gauge(
+    "admission_in_flight",
+    "stage 별 현재 실행 중인 요청 수",
+    ("stage",),
+)
+ADMISSION_QUEUE_DEPTH = gauge(
+    "admission_queue_depth",
+    "stage 별 실행 슬롯을 기다리는 요청 수",
+    ("stage",),
+)
+ADMISSION_SHED = counter(
+    "admission_shed_total",
+    "stage 별 거절된 요청 수 (reason=queue_full|timeout)",
+    ("stage", "reason"),
+)
+
+USER_ACTORS = gauge(
+    "user_actors",
+    "메모리에 있는 유저별 실행 액터 수 (유휴 시간이 지나면 제거)",
+)
+USER_ACTOR_TURNS = counter(
+    "user_actor_turns_total",
+    "유저별 액터가 처리한 요청 결과 (result=processed|coalesced|superseded|cancelled|busy)",
+    ("result",),
+)
+
+CACHE_REQUESTS = counter(
+    "cache_requests_total",
+    "캐시 조회 결과 (result=hit|miss)",
+    ("cache", "result"),
+)
+
+SESSION_STORE_SIZE = gauge(
+    "session_store_users",
+    "메모리 세션 저장소에 있는 유저 수",
+)
+TOKEN_STORE_SIZE = gauge(
+    "token_store_users",
+    "tokens.json 에 저장된 유저 수",
+)
+
+
+def record_cache(cache: str, hit: bool) -> None:
+    """캐시 조회 결과 기록 (hit rate = hit / (hit + miss))"""
+    CACHE_REQUESTS.inc(cache=cache, result="hit" if hit else "miss")
+    from app.utils.event_log import note_cache  # 순환 import 방지 (event_log 가 metrics 를 사용)
+
+    note_cache(cache, hit)
+
+
+# =====================================================
+# CLI 테스트
+# =====================================================
+if __name__ == "__main__":
+    STAGE_DURATION.observe(0.3, stage="1")
+    LLM_TOKENS.inc(120, module="refine", kind="prompt")
+    record_cache("example", True)
+    SESSION_STORE_SIZE.set_function(lambda: 3)
+    print(render_metrics())
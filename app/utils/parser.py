@@ -46,3 +46,23 @@ def extract_params(data: dict) -> dict:
         return data["action"].get("params", {})
     except (KeyError, TypeError):
         return {}
+
+
+def extract_client_extra(data: dict) -> dict:
+    """
+    카카오톡 webhook 요청 데이터에서 버튼 / 바로가기의 extra(action.clientExtra)를 추출합니다.
+    """
+    try:
+        return data["action"].get("clientExtra") or {}
+    except (KeyError, TypeError, AttributeError):
+        return {}
+
+
+def extract_action_params(data: dict) -> dict:
+    """
+    블록 파라미터(action.params)와 버튼 extra(action.clientExtra)를 합친 구조화된 액션 값을 추출합니다.
+    (같은 키는 버튼 extra 가 우선)
+    """
+    params = dict(extract_params(data) or {})
+    params.update(extract_client_extra(data))
+    return params
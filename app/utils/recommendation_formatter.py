@@ -74,4 +74,32 @@ def format_crawled_result(result: dict) -> str:
         lines.append("원하시는 유사 항목 번호를 입력해 주세요!")
         return "\n".join(lines)
 
-    return "죄송합니다. 추천할 정보를 찾지 못했습니다."
\ No newline at end of file
+    return "죄송합니다. 추천할 정보를 찾지 못했습니다."
+
+def format_filter_result(filters: dict[str, list[str]], next_attr: str | None = None,
+                         next_values: list[str] | None = None) -> str:
+    """
+    stage 4 에서 지금까지 고른 조건 + 다음으로 고를 속성 목록을 문자열로 변환
+
+    Args:
+        filters (dict): {속성: [선택한 값, …]}
+        next_attr (str | None): 아직 고르지 않은 다음 속성 (없으면 선택 완료 안내)
+        next_values (list | None): next_attr 의 값 목록
+
+    Returns:
+        str: 포맷팅된 메시지 문자열
+    """
+    lines = ["✅ 선택하신 조건입니다:"]
+    for attr, values in filters.items():
+        lines.append(f"• {attr}: {', '.join(values)}")
+    lines.append("")
+
+    if next_attr and next_values:
+        lines.append(f"=====  ⭐️ {next_attr} ⭐️  =====")
+        for idx, value in enumerate(next_values, start=1):
+            lines.append(f"{idx}. {value}")
+        lines.append("")
+        lines.append("원하시는 항목 번호나 이름을 입력해 주세요! (여러 개는 쉼표로 구분, 다른 상품은 '처음')")
+    else:
+        lines.append("조건 선택이 끝났습니다. 다른 상품을 찾으시려면 '처음'이라고 입력해 주세요!")
+    return "\n".join(lines)
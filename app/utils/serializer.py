@@ -0,0 +1,127 @@
+"""
+serializer.py
+──────────────────────────────
+- JSON 직렬화 공용 레이어 (orjson → msgspec → 표준 json 순으로 사용 가능한 백엔드 선택)
+- 기계가 읽는 파일은 compact 인코딩, 사람이 읽을 파일만 pretty=True
+- 항상 UTF-8 bytes 로 인코딩 (한글은 escape 하지 않음)
+
+📌 환경 변수
+- JSON_BACKEND : orjson | msgspec | json (기본: 설치된 것 중 가장 빠른 백엔드)
+
+📌 함수
+- dumps(obj, pretty=False) -> bytes
+- loads(data: bytes | str) -> object
+- write_json(path, obj, pretty=False) -> None   (임시 파일 → rename 으로 원자적 교체)
+- read_json(path) -> object
+"""
+
+import json
+import os
+from pathlib import Path
+from typing import Any, Callable
+
+# =====================================================
+# 0️⃣ 백엔드 선택
+# =====================================================
+def _stdlib_backend() -> tuple[Callable, Callable, Callable]:
+    def dumps(obj: Any) -> bytes:
+        return json.dumps(obj, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+
+    def dumps_pretty(obj: Any) -> bytes:
+        return json.dumps(obj, ensure_ascii=False, indent=2).encode("utf-8")
+
+    return dumps, dumps_pretty, json.loads
+
+
+def _orjson_backend() -> tuple[Callable, Callable, Callable]:
+    import orjson
+
+    def dumps(obj: Any) -> bytes:
+        return orjson.dumps(obj)
+
+    def dumps_pretty(obj: Any) -> bytes:
+        return orjson.dumps(obj, option=orjson.OPT_INDENT_2)
+
+    return dumps, dumps_pretty, orjson.loads
+
+
+def _msgspec_backend() -> tuple[Callable, Callable, Callable]:
+    import msgspec
+
+    encoder = msgspec.json.Encoder()
+    decoder = msgspec.json.Decoder()
+
+    def dumps_pretty(obj: Any) -> bytes:
+        return msgspec.json.format(encoder.encode(obj), indent=2)
+
+    return encoder.encode, dumps_pretty, decoder.decode
+
+
+_BACKENDS = {
+    "orjson": _orjson_backend,
+    "msgspec": _msgspec_backend,
+    "json": _stdlib_backend,
+}
+
+
+def _select_backend() -> tuple[str, tuple[Callable, Callable, Callable]]:
+    preferred = os.getenv("JSON_BACKEND")
+    order = [preferred] if preferred in _BACKENDS else []
+    order += [name for name in _BACKENDS if name not in order]
+    for name in order:
+        try:
+            return name, _BACKENDS[name]()
+        except ImportError:
+            continue
+    return "json", _stdlib_backend()
+
+
+BACKEND, (_dumps, _dumps_pretty, _loads) = _select_backend()
+
+
+# =====================================================
+# 1️⃣ 인코딩 / 디코딩
+# =====================================================
+def dumps(obj: Any, pretty: bool = False) -> bytes:
+    """
+    obj 를 UTF-8 JSON bytes 로 인코딩
+
+    Args:
+        obj: 직렬화할 값 (dict / list / str / 숫자 …)
+        pretty (bool): True 면 2칸 들여쓰기 (사람이 읽을 파일용)
+    """
+    return _dumps_pretty(obj) if pretty else _dumps(obj)
+
+
+def loads(data: bytes | str) -> Any:
+    """JSON bytes / str 디코딩"""
+    return _loads(data)
+
+
+# =====================================================
+# 2️⃣ 파일 I/O
+# =====================================================
+def write_json(path: Path, obj: Any, pretty: bool = False) -> None:
+    """
+    JSON 파일 저장 (같은 디렉토리의 임시 파일에 쓴 뒤 교체 → 읽는 쪽이 반쯤 쓰인 파일을 보지 않음)
+    """
+    path = Path(path)
+    tmp_path = path.with_name(f".{path.name}.{os.getpid()}.tmp")
+    with open(tmp_path, "wb") as f:
+        f.write(dumps(obj, pretty=pretty))
+    os.replace(tmp_path, path)
+
+
+def read_json(path: Path) -> Any:
+    with open(path, "rb") as f:
+        return loads(f.read())
+
+
+# =====================================================
+# CLI 테스트
+# =====================================================
+if __name__ == "__main__":
+    sample = {"노트북": ["노트북 전체", "AI 노트북"], "count": 2}
+    print(f"backend: {BACKEND}")
+    print(dumps(sample).decode("utf-8"))
+    print(dumps(sample, pretty=True).decode("utf-8"))
@@ -0,0 +1,438 @@
+"""
+spec_search.py
+──────────────────────────────
+- 크롤링 결과 저장소(spec_store) 전문 검색 색인: "브랜드 X 가 있는 카테고리는?" 을 전체 스캔 없이 조회
+- 색인 대상 (필드별 가중치)
+  - category  : 세부 항목명 · 중간 카테고리 (3.0)
+  - value     : 옵션 값 — 제조사 / 브랜드 … (2.0)
+  - nav       : 하위 카테고리(nav_3depth) 이름 (1.5)
+  - attribute : 옵션 속성명 (1.0)
+- 한국어 토큰화 (띄어쓰기 · 조사와 무관하게 부분 일치)
+  - g:<글자 bigram>  정규화(NFC · 전각→반각 · 소문자 · 공백/기호 제거)한 텍스트의 글자 2-gram (1글자면 그 글자)
+  - c:<초성 bigram>  한글 음절을 초성으로 바꾼 텍스트의 2-gram → "ㅅㅅㅈㅈ" 같은 초성 검색
+- 저장: SQLite (docs: URL 별 문서 / postings: 용어 → 문서, 가중치), WAL + 스레드별 커넥션
+- 갱신: save_category_spec() 이 저장할 때마다 해당 URL 문서만 교체 (update)
+- 후보: 질의 용어의 절반 이상이 일치하는 문서만 (흔한 bigram 하나만 겹치는 문서 제외)
+- 순위: BM25 (필드 가중치를 tf 로 사용) + 정규화한 질의가 필드 값에 그대로 포함되면 가산점 → 상위 K개
+
+📌 환경 변수
+- SPEC_SEARCH_PATH    : DB 파일 경로 (기본 storage/spec_search.sqlite3)
+- SPEC_SEARCH_ENABLED : 0 이면 저장 시 색인 갱신 생략 (기본 1)
+
+📌 CLI
+    python -m app.utils.spec_search rebuild            # spec_store 전체 재색인
+    python -m app.utils.spec_search query "삼성전자" --top 10
+    python -m app.utils.spec_search stats
+"""
+
+import argparse
+import math
+import os
+import re
+import sqlite3
+import sys
+import threading
+import time
+import unicodedata
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Iterable, Iterator, Optional
+
+from app.utils.serializer import dumps, loads
+
+# =====================================================
+# 0️⃣ 전역 설정
+# =====================================================
+PROJECT_ROOT = Path(__file__).resolve().parent.parent.parent
+SPEC_SEARCH_PATH = Path(os.getenv("SPEC_SEARCH_PATH") or PROJECT_ROOT / "storage" / "spec_search.sqlite3")
+SPEC_SEARCH_ENABLED = os.getenv("SPEC_SEARCH_ENABLED", "1") == "1"
+
+FIELD_WEIGHTS = {"category": 3.0, "value": 2.0, "nav": 1.5, "attribute": 1.0}
+BM25_K1 = 1.2
+BM25_B = 0.75
+PHRASE_BONUS = 1.5   # 질의 전체가 필드 값에 포함될 때 (필드 가중치 배)
+MIN_TERM_COVERAGE = 0.5  # 후보 문서가 포함해야 하는 질의 용어 비율
+RERANK_POOL = 50     # BM25 상위 몇 개를 포함 여부로 다시 정렬할지 (top_k 보다 작으면 top_k × 5)
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS docs (
+    doc_id      INTEGER PRIMARY KEY,
+    url         TEXT NOT NULL UNIQUE,
+    detail_name TEXT NOT NULL,
+    mid_key     TEXT,
+    length      REAL NOT NULL,
+    fields      BLOB NOT NULL
+);
+CREATE TABLE IF NOT EXISTS postings (
+    term   TEXT NOT NULL,
+    doc_id INTEGER NOT NULL,
+    weight REAL NOT NULL,
+    PRIMARY KEY (term, doc_id)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS idx_postings_doc ON postings (doc_id);
+"""
+
+HANGUL_START, HANGUL_END = 0xAC00, 0xD7A3
+CHOSEONG = "ㄱㄲㄴㄷㄸㄹㅁㅂㅃㅅㅆㅇㅈㅉㅊㅋㅌㅍㅎ"
+CHOSEONG_SET = set(CHOSEONG)
+STRIP_PATTERN = re.compile(r"[^0-9a-z가-힣ㄱ-ㅎ]+")
+FULLWIDTH = {code: code - 0xFEE0 for code in range(0xFF01, 0xFF5F)}  # 전각 영숫자 → 반각
+
+
+# =====================================================
+# 1️⃣ 토큰화
+# =====================================================
+def normalize(text: str) -> str:
+    # NFKC 는 호환 자모(ㅅ)를 첫가끝 자모로 바꿔 초성 검색이 깨지므로 NFC + 전각 변환만 적용
+    return STRIP_PATTERN.sub("", unicodedata.normalize("NFC", text).translate(FULLWIDTH).lower())
+
+
+def to_choseong(norm: str) -> str:
+    """정규화된 텍스트의 한글 음절 → 초성 (그 외 글자는 제외)"""
+    out = []
+    for ch in norm:
+        code = ord(ch)
+        if HANGUL_START <= code <= HANGUL_END:
+            out.append(CHOSEONG[(code - HANGUL_START) // 588])
+        elif ch in CHOSEONG_SET:
+            out.append(ch)
+    return "".join(out)
+
+
+def _bigrams(text: str) -> list[str]:
+    if len(text) < 2:
+        return [text] if text else []
+    return [text[i:i + 2] for i in range(len(text) - 1)]
+
+
+def tokenize(text: str) -> list[str]:
+    """색인용 용어 (중복 포함 — 빈도가 가중치에 반영됨)"""
+    norm = normalize(text)
+    terms = ["g:" + gram for gram in _bigrams(norm)]
+    initials = to_choseong(norm)
+    if initials:
+        terms.extend("c:" + gram for gram in _bigrams(initials))
+    return terms
+
+
+def query_terms(query: str) -> list[str]:
+    """질의 용어 (초성만으로 된 질의는 초성 bigram 만 사용)"""
+    norm = normalize(query)
+    if norm and all(ch in CHOSEONG_SET for ch in norm):
+        return sorted({"c:" + gram for gram in _bigrams(norm)})
+    return sorted({"g:" + gram for gram in _bigrams(norm)})
+
+
+def build_document(detail_name: str, data: dict, mid_key: Optional[str] = None) -> dict:
+    """크롤링 결과 → 필드별 텍스트 {"category", "attribute", "value": [[속성, 값]], "nav"}"""
+    fields = {"category": [detail_name] + ([mid_key] if mid_key else []), "attribute": [], "value": [], "nav": []}
+    for attr, values in (data or {}).items():
+        if attr == "nav":
+            if isinstance(values, dict):
+                fields["nav"].extend(values)
+            continue
+        fields["attribute"].append(attr)
+        if isinstance(values, list):
+            fields["value"].extend([attr, value] for value in values)
+    return fields
+
+
+def _field_texts(fields: dict) -> Iterator[tuple[str, str, str]]:
+    """(필드, 표시용 라벨, 텍스트)"""
+    for name in fields["category"]:
+        yield "category", name, name
+    for attr in fields["attribute"]:
+        yield "attribute", attr, attr
+    for attr, value in fields["value"]:
+        yield "value", f"{attr}: {value}", value
+    for name in fields["nav"]:
+        yield "nav", f"nav: {name}", name
+
+
+def weigh_terms(fields: dict) -> tuple[dict[str, float], float]:
+    """문서의 용어별 가중치 합 + 문서 길이(가중치 총합)"""
+    weights: dict[str, float] = {}
+    for field, _, text in _field_texts(fields):
+        w = FIELD_WEIGHTS[field]
+        for term in tokenize(text):
+            weights[term] = weights.get(term, 0.0) + w
+    return weights, sum(weights.values())
+
+
+# =====================================================
+# 2️⃣ 색인
+# =====================================================
+class SpecSearchIndex:
+    """
+    URL 단위 문서의 전문 검색 색인
+
+    Args:
+        path (Path): SQLite DB 파일 경로
+    """
+
+    def __init__(self, path: Path = SPEC_SEARCH_PATH):
+        self.path = Path(path)
+        self._local = threading.local()
+        self._init_lock = threading.Lock()
+        self._initialized = False
+
+    def _connect(self) -> sqlite3.Connection:
+        conn = getattr(self._local, "conn", None)
+        if conn is not None:
+            return conn
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        conn = sqlite3.connect(self.path, timeout=5.0, isolation_level=None)
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=NORMAL")
+        with self._init_lock:
+            if not self._initialized:
+                conn.executescript(SCHEMA)
+                self._initialized = True
+        self._local.conn = conn
+        return conn
+
+    @contextmanager
+    def _transaction(self) -> Iterator[sqlite3.Connection]:
+        conn = self._connect()
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            yield conn
+        except BaseException:
+            conn.execute("ROLLBACK")
+            raise
+        conn.execute("COMMIT")
+
+    # ---------- 쓰기 ----------
+    def update(self, url: str, detail_name: str, data: dict, mid_key: Optional[str] = None) -> None:
+        """URL 1건 문서 교체 (기존 용어 삭제 → 새 용어 추가)"""
+        self.update_many([(url, detail_name, data, mid_key)])
+
+    def update_many(self, rows: Iterable[tuple]) -> int:
+        """
+        (url, detail_name, data, mid_key) 묶음을 한 트랜잭션으로 교체
+
+        Returns:
+            int: 색인한 문서 수
+        """
+        count = 0
+        with self._transaction() as conn:
+            for url, detail_name, data, mid_key in rows:
+                fields = build_document(detail_name, data, mid_key)
+                weights, length = weigh_terms(fields)
+                row = conn.execute("SELECT doc_id, mid_key FROM docs WHERE url = ?", (url,)).fetchone()
+                if row is not None:
+                    doc_id = row[0]
+                    if mid_key is None and row[1]:  # 중간 카테고리를 모르고 갱신하면 기존 값 유지
+                        fields["category"].append(row[1])
+                        weights, length = weigh_terms(fields)
+                        mid_key = row[1]
+                    conn.execute("DELETE FROM postings WHERE doc_id = ?", (doc_id,))
+                    conn.execute(
+                        "UPDATE docs SET detail_name = ?, mid_key = ?, length = ?, fields = ? WHERE doc_id = ?",
+                        (detail_name, mid_key, length, dumps(fields), doc_id),
+                    )
+                else:
+                    doc_id = conn.execute(
+                        "INSERT INTO docs (url, detail_name, mid_key, length, fields) VALUES (?, ?, ?, ?, ?)",
+                        (url, detail_name, mid_key, length, dumps(fields)),
+                    ).lastrowid
+                conn.executemany(
+                    "INSERT INTO postings (term, doc_id, weight) VALUES (?, ?, ?)",
+                    [(term, doc_id, weight) for term, weight in weights.items()],
+                )
+                count += 1
+        return count
+
+    def delete(self, url: str) -> bool:
+        with self._transaction() as conn:
+            row = conn.execute("SELECT doc_id FROM docs WHERE url = ?", (url,)).fetchone()
+            if row is None:
+                return False
+            conn.execute("DELETE FROM postings WHERE doc_id = ?", (row[0],))
+            conn.execute("DELETE FROM docs WHERE doc_id = ?", (row[0],))
+            return True
+
+    def clear(self) -> None:
+        with self._transaction() as conn:
+            conn.execute("DELETE FROM postings")
+            conn.execute("DELETE FROM docs")
+
+    # ---------- 검색 ----------
+    def search(self, query: str, top_k: int = 10, field: Optional[str] = None) -> list[dict]:
+        """
+        순위가 매겨진 상위 top_k 문서
+
+        Args:
+            query (str): 검색어 (부분 문자열 · 초성 가능)
+            top_k (int): 반환할 최대 개수
+            field (str | None): 포함 여부 가산점 · matches 를 이 필드로 한정 (category | value | nav | attribute)
+
+        Returns:
+            list[dict]: [{"url", "detail_name", "mid_key", "score", "matches": [일치한 필드 값, …]}]
+        """
+        terms = query_terms(query)
+        if not terms:
+            return []
+        conn = self._connect()
+        n_docs, total_length = conn.execute("SELECT COUNT(*), COALESCE(SUM(length), 0) FROM docs").fetchone()
+        if n_docs == 0:
+            return []
+        avg_length = total_length / n_docs
+
+        marks = ",".join("?" * len(terms))
+        postings: dict[str, list[tuple[int, float]]] = {}
+        for term, doc_id, weight in conn.execute(
+            f"SELECT term, doc_id, weight FROM postings WHERE term IN ({marks})", terms
+        ):
+            postings.setdefault(term, []).append((doc_id, weight))
+        if not postings:
+            return []
+
+        hits: dict[int, int] = {}
+        for rows in postings.values():
+            for doc_id, _ in rows:
+                hits[doc_id] = hits.get(doc_id, 0) + 1
+        quorum = math.ceil(len(terms) * MIN_TERM_COVERAGE)
+        doc_ids = {doc_id for doc_id, count in hits.items() if count >= quorum}
+        if not doc_ids:
+            return []
+        lengths = self._lengths(conn, doc_ids)
+
+        scores: dict[int, float] = {}
+        for term, rows in postings.items():
+            idf = math.log(1 + (n_docs - len(rows) + 0.5) / (len(rows) + 0.5))
+            for doc_id, tf in rows:
+                if doc_id not in doc_ids:
+                    continue
+                norm = BM25_K1 * (1 - BM25_B + BM25_B * lengths[doc_id] / avg_length)
+                scores[doc_id] = scores.get(doc_id, 0.0) + idf * tf * (BM25_K1 + 1) / (tf + norm)
+
+        pool = sorted(scores, key=scores.get, reverse=True)[:max(RERANK_POOL, top_k * 5)]
+        return self._rerank(conn, query, pool, scores, top_k, field)
+
+    def _lengths(self, conn: sqlite3.Connection, doc_ids: set[int]) -> dict[int, float]:
+        lengths = {}
+        ids = list(doc_ids)
+        for start in range(0, len(ids), 500):  # SQLite 변수 개수 제한
+            chunk = ids[start:start + 500]
+            marks = ",".join("?" * len(chunk))
+            lengths.update(conn.execute(f"SELECT doc_id, length FROM docs WHERE doc_id IN ({marks})", chunk))
+        return lengths
+
+    def _rerank(self, conn: sqlite3.Connection, query: str, pool: list[int], scores: dict[int, float],
+                top_k: int, field: Optional[str]) -> list[dict]:
+        """BM25 상위 후보의 필드 값에 질의가 그대로 포함되는지 확인해 가산점 · matches 계산"""
+        if not pool:
+            return []
+        norm_query = normalize(query)
+        initials_only = all(ch in CHOSEONG_SET for ch in norm_query)
+        marks = ",".join("?" * len(pool))
+        rows = conn.execute(
+            f"SELECT doc_id, url, detail_name, mid_key, fields FROM docs WHERE doc_id IN ({marks})", pool
+        ).fetchall()
+
+        results = []
+        for doc_id, url, detail_name, mid_key, blob in rows:
+            matches, bonus = [], 0.0
+            for name, label, text in _field_texts(loads(blob)):
+                if field and name != field:
+                    continue
+                norm_text = normalize(text)
+                haystack = to_choseong(norm_text) if initials_only else norm_text
+                if norm_query in haystack:
+                    matches.append(label)
+                    bonus = max(bonus, PHRASE_BONUS * FIELD_WEIGHTS[name])
+            if field and not matches:
+                continue
+            results.append({
+                "url": url,
+                "detail_name": detail_name,
+                "mid_key": mid_key,
+                "score": round(scores[doc_id] + bonus, 4),
+                "matches": matches[:10],
+            })
+        results.sort(key=lambda r: (-r["score"], r["detail_name"]))
+        return results[:top_k]
+
+    def stats(self) -> dict:
+        conn = self._connect()
+        docs = conn.execute("SELECT COUNT(*) FROM docs").fetchone()[0]
+        postings, terms = conn.execute("SELECT COUNT(*), COUNT(DISTINCT term) FROM postings").fetchone()
+        size = self.path.stat().st_size if self.path.exists() else 0
+        return {"docs": docs, "terms": terms, "postings": postings, "bytes": size}
+
+    def close(self) -> None:
+        conn = getattr(self._local, "conn", None)
+        if conn is not None:
+            conn.close()
+            self._local.conn = None
+
+
+_index: Optional[SpecSearchIndex] = None
+_index_lock = threading.Lock()
+
+
+def get_spec_search() -> SpecSearchIndex:
+    global _index
+    if _index is None:
+        with _index_lock:
+            if _index is None:
+                _index = SpecSearchIndex()
+    return _index
+
+
+def rebuild_from_store(index: SpecSearchIndex, store=None, chunk: int = 200) -> int:
+    """spec_store 전체 → 색인 재생성 (기존 색인 삭제)"""
+    if store is None:
+        from app.utils.spec_store import get_spec_store
+
+        store = get_spec_store()
+    index.clear()
+    total, rows = 0, []
+    for record in store.iter_all():
+        rows.append((record["url"], record["detail_name"], record["data"], record["mid_key"]))
+        if len(rows) >= chunk:
+            total += index.update_many(rows)
+            rows = []
+    return total + index.update_many(rows)
+
+
+# =====================================================
+# CLI
+# =====================================================
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description="크롤링 결과 전문 검색 색인")
+    parser.add_argument("--db", type=Path, default=SPEC_SEARCH_PATH)
+    sub = parser.add_subparsers(dest="command", required=True)
+    sub.add_parser("rebuild", help="spec_store 전체 재색인")
+    query = sub.add_parser("query", help="검색")
+    query.add_argument("text")
+    query.add_argument("--top", type=int, default=10)
+    query.add_argument("--field", choices=sorted(FIELD_WEIGHTS))
+    sub.add_parser("stats", help="색인 요약")
+    args = parser.parse_args(argv)
+
+    index = SpecSearchIndex(args.db)
+    if args.command == "rebuild":
+        start = time.perf_counter()
+        count = rebuild_from_store(index)
+        print(f"✅ 재색인: 문서 {count}개 ({time.perf_counter() - start:.2f}s)")
+        return 0
+
+    if args.command == "query":
+        start = time.perf_counter()
+        results = index.search(args.text, args.top, args.field)
+        elapsed = (time.perf_counter() - start) * 1000
+        print(f"🔎 '{args.text}' → {len(results)}건 ({elapsed:.2f}ms)")
+        for rank, r in enumerate(results, start=1):
+            where = f"{r['mid_key']} > " if r["mid_key"] else ""
+            print(f"  {rank:>2}. {where}{r['detail_name']} ({r['score']}) {', '.join(r['matches'])}")
+        return 0
+
+    stats = index.stats()
+    print(f"📄 {args.db}: 문서 {stats['docs']}개, 용어 {stats['terms']:,}개, posting {stats['postings']:,}개, {stats['bytes']:,}B")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,354 @@
+"""
+spec_store.py
+──────────────────────────────
+- 크롤링한 카테고리 스펙 저장소 (SQLite)
+- 행 키: 크롤링한 URL (세부 항목명이 sanitize 후 겹쳐도 서로 덮어쓰지 않음)
+- 컬럼: url / detail_name / mid_key / crawled_at / codec / raw_size / payload(zlib 압축 JSON)
+- 보조 인덱스: (detail_name, crawled_at), (mid_key, detail_name) → 세부 항목 / 중간 카테고리 단위 조회
+- 쓰기는 트랜잭션 단위로 묶어서 처리 (put_many / batch())
+- WAL 모드 + 스레드별 커넥션 (BackgroundTasks 스레드풀 / 여러 워커에서 동시 사용)
+
+📌 환경 변수
+- SPEC_STORE_PATH : DB 파일 경로 (기본 storage/category_spec.sqlite3)
+
+📌 CLI
+    python -m app.utils.spec_store migrate [storage/category_spec]   # 기존 JSON 디렉터리 → DB
+    python -m app.utils.spec_store stats
+"""
+
+import argparse
+import json
+import os
+import sqlite3
+import sys
+import threading
+import time
+import zlib
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Iterable, Iterator, Optional
+
+from app.utils.serializer import dumps, loads
+
+# =====================================================
+# 0️⃣ 전역 설정
+# =====================================================
+PROJECT_ROOT = Path(__file__).resolve().parent.parent.parent
+SPEC_STORE_PATH = Path(os.getenv("SPEC_STORE_PATH") or PROJECT_ROOT / "storage" / "category_spec.sqlite3")
+CATEGORY_JSON_PATH = PROJECT_ROOT / "storage" / "category_structure.json"
+
+SCHEMA_VERSION = 1
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS specs (
+    url         TEXT PRIMARY KEY,
+    detail_name TEXT NOT NULL,
+    mid_key     TEXT,
+    crawled_at  REAL NOT NULL,
+    codec       TEXT NOT NULL,
+    raw_size    INTEGER NOT NULL,
+    payload     BLOB NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_specs_detail ON specs (detail_name, crawled_at);
+CREATE INDEX IF NOT EXISTS idx_specs_mid ON specs (mid_key, detail_name);
+"""
+UPSERT = """
+INSERT INTO specs (url, detail_name, mid_key, crawled_at, codec, raw_size, payload)
+VALUES (?, ?, ?, ?, ?, ?, ?)
+ON CONFLICT(url) DO UPDATE SET
+    detail_name = excluded.detail_name,
+    mid_key     = COALESCE(excluded.mid_key, specs.mid_key),
+    crawled_at  = excluded.crawled_at,
+    codec       = excluded.codec,
+    raw_size    = excluded.raw_size,
+    payload     = excluded.payload
+"""
+COLUMNS = "url, detail_name, mid_key, crawled_at, codec, payload"
+
+
+# =====================================================
+# 1️⃣ 압축
+# =====================================================
+def encode_payload(data: dict) -> tuple[str, int, bytes]:
+    raw = dumps(data)
+    return "zlib", len(raw), zlib.compress(raw, 6)
+
+
+def decode_payload(codec: str, blob: bytes) -> dict:
+    if codec == "zlib":
+        return loads(zlib.decompress(blob))
+    if codec == "json":
+        return loads(blob)
+    raise ValueError(f"알 수 없는 codec: {codec}")
+
+
+def _to_record(row: tuple) -> dict:
+    url, detail_name, mid_key, crawled_at, codec, blob = row
+    return {
+        "url": url,
+        "detail_name": detail_name,
+        "mid_key": mid_key,
+        "crawled_at": crawled_at,
+        "data": decode_payload(codec, blob),
+    }
+
+
+# =====================================================
+# 2️⃣ 저장소
+# =====================================================
+class SpecStore:
+    """
+    URL 단위 스펙 저장소
+
+    Args:
+        path (Path): SQLite DB 파일 경로
+    """
+
+    def __init__(self, path: Path = SPEC_STORE_PATH):
+        self.path = Path(path)
+        self._local = threading.local()
+        self._init_lock = threading.Lock()
+        self._initialized = False
+
+    def _connect(self) -> sqlite3.Connection:
+        conn = getattr(self._local, "conn", None)
+        if conn is not None:
+            return conn
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        conn = sqlite3.connect(self.path, timeout=5.0, isolation_level=None)
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=NORMAL")
+        with self._init_lock:
+            if not self._initialized:
+                conn.executescript(SCHEMA)
+                conn.execute(f"PRAGMA user_version={SCHEMA_VERSION}")
+                self._initialized = True
+        self._local.conn = conn
+        return conn
+
+    @contextmanager
+    def _transaction(self) -> Iterator[sqlite3.Connection]:
+        conn = self._connect()
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            yield conn
+        except BaseException:
+            conn.execute("ROLLBACK")
+            raise
+        conn.execute("COMMIT")
+
+    # ---------- 쓰기 ----------
+    def put(self, url: str, detail_name: str, data: dict, mid_key: Optional[str] = None,
+            crawled_at: Optional[float] = None) -> None:
+        self.put_many([(url, detail_name, data, mid_key, crawled_at)])
+
+    def put_many(self, rows: Iterable[tuple]) -> int:
+        """
+        (url, detail_name, data, mid_key, crawled_at) 묶음을 한 트랜잭션으로 저장 (같은 URL 은 갱신)
+
+        Returns:
+            int: 저장한 행 수
+        """
+        now = time.time()
+        params = []
+        for url, detail_name, data, mid_key, crawled_at in rows:
+            codec, raw_size, blob = encode_payload(data)
+            params.append((url, detail_name, mid_key, crawled_at or now, codec, raw_size, blob))
+        if not params:
+            return 0
+        with self._transaction() as conn:
+            conn.executemany(UPSERT, params)
+        return len(params)
+
+    @contextmanager
+    def batch(self) -> Iterator["_Batch"]:
+        """
+        with store.batch() as batch: batch.put(...) → 블록이 끝날 때 한 트랜잭션으로 저장
+        (블록 안에서 예외가 나면 아무 것도 저장하지 않음)
+        """
+        pending = _Batch()
+        yield pending
+        self.put_many(pending.rows)
+
+    def delete(self, url: str) -> bool:
+        with self._transaction() as conn:
+            return conn.execute("DELETE FROM specs WHERE url = ?", (url,)).rowcount > 0
+
+    # ---------- 읽기 ----------
+    def get(self, url: str) -> Optional[dict]:
+        row = self._connect().execute(f"SELECT {COLUMNS} FROM specs WHERE url = ?", (url,)).fetchone()
+        return _to_record(row) if row else None
+
+    def get_many(self, urls: Iterable[str]) -> dict[str, dict]:
+        urls = list(urls)
+        records = {}
+        conn = self._connect()
+        for start in range(0, len(urls), 500):  # SQLite 변수 개수 제한
+            chunk = urls[start:start + 500]
+            marks = ",".join("?" * len(chunk))
+            for row in conn.execute(f"SELECT {COLUMNS} FROM specs WHERE url IN ({marks})", chunk):
+                records[row[0]] = _to_record(row)
+        return records
+
+    def latest_by_detail(self, detail_name: str) -> Optional[dict]:
+        row = self._connect().execute(
+            f"SELECT {COLUMNS} FROM specs WHERE detail_name = ? ORDER BY crawled_at DESC LIMIT 1",
+            (detail_name,),
+        ).fetchone()
+        return _to_record(row) if row else None
+
+    def find_by_detail(self, detail_name: str) -> list[dict]:
+        rows = self._connect().execute(
+            f"SELECT {COLUMNS} FROM specs WHERE detail_name = ? ORDER BY crawled_at DESC", (detail_name,)
+        )
+        return [_to_record(row) for row in rows]
+
+    def find_by_mid(self, mid_key: str) -> list[dict]:
+        rows = self._connect().execute(
+            f"SELECT {COLUMNS} FROM specs WHERE mid_key = ? ORDER BY detail_name", (mid_key,)
+        )
+        return [_to_record(row) for row in rows]
+
+    def iter_all(self, chunk: int = 500) -> Iterator[dict]:
+        """전체 행을 URL 순서로 chunk 개씩 읽어 반환 (전체 재색인 등)"""
+        conn = self._connect()
+        last_url = ""
+        while True:
+            rows = conn.execute(
+                f"SELECT {COLUMNS} FROM specs WHERE url > ? ORDER BY url LIMIT ?", (last_url, chunk)
+            ).fetchall()
+            if not rows:
+                return
+            for row in rows:
+                yield _to_record(row)
+            last_url = rows[-1][0]
+
+    def crawled_at(self, url: str) -> Optional[float]:
+        """URL 의 마지막 크롤링 시각 (payload 를 풀지 않음)"""
+        row = self._connect().execute("SELECT crawled_at FROM specs WHERE url = ?", (url,)).fetchone()
+        return row[0] if row else None
+
+    def stats(self) -> dict:
+        rows, raw, stored, oldest, newest = self._connect().execute(
+            "SELECT COUNT(*), COALESCE(SUM(raw_size), 0), COALESCE(SUM(LENGTH(payload)), 0),"
+            " MIN(crawled_at), MAX(crawled_at) FROM specs"
+        ).fetchone()
+        return {"rows": rows, "raw_bytes": raw, "stored_bytes": stored, "oldest": oldest, "newest": newest}
+
+    def close(self) -> None:
+        conn = getattr(self._local, "conn", None)
+        if conn is not None:
+            conn.close()
+            self._local.conn = None
+
+
+class _Batch:
+    def __init__(self):
+        self.rows: list[tuple] = []
+
+    def put(self, url: str, detail_name: str, data: dict, mid_key: Optional[str] = None,
+            crawled_at: Optional[float] = None) -> None:
+        self.rows.append((url, detail_name, data, mid_key, crawled_at))
+
+
+_store: Optional[SpecStore] = None
+_store_lock = threading.Lock()
+
+
+def get_spec_store() -> SpecStore:
+    global _store
+    if _store is None:
+        with _store_lock:
+            if _store is None:
+                _store = SpecStore()
+    return _store
+
+
+# =====================================================
+# 3️⃣ 마이그레이션 (storage/category_spec/*.json → DB)
+# =====================================================
+def _url_index(structure_path: Path = CATEGORY_JSON_PATH) -> dict[str, tuple[str, str]]:
+    """category_structure.json 에서 URL → (중간 카테고리, 세부 항목명) 역인덱스"""
+    if not structure_path.exists():
+        return {}
+    with open(structure_path, encoding="utf-8") as f:
+        structure = json.load(f)
+    index = {}
+    for mids in structure.values():
+        for mid_key, details in mids.items():
+            for detail_name, url in details:
+                index.setdefault(url, (mid_key, detail_name))
+    return index
+
+
+def migrate_directory(directory: Path, store: Optional[SpecStore] = None, chunk: int = 200) -> dict:
+    """
+    기존 파일 저장소(<세부항목명>.json = {"url", "data"})를 DB 로 옮김
+    - 중간 카테고리 / 세부 항목명은 category_structure.json 에서 URL 로 복원 (없으면 파일명 사용)
+    - 크롤링 시각은 파일 수정 시각
+    - 같은 URL 이 이미 DB 에 있고 더 최신이면 건너뜀 (여러 번 실행해도 안전)
+
+    Returns:
+        dict: {"files", "migrated", "skipped", "failed"}
+    """
+    store = store or get_spec_store()
+    url_index = _url_index()
+    result = {"files": 0, "migrated": 0, "skipped": 0, "failed": 0}
+    rows = []
+
+    for path in sorted(Path(directory).glob("*.json")):
+        result["files"] += 1
+        try:
+            with open(path, "rb") as f:
+                payload = loads(f.read())
+            url, data = payload["url"], payload["data"]
+        except Exception as e:
+            print(f"⚠️ 읽기 실패 → 건너뜀: {path} ({e})")
+            result["failed"] += 1
+            continue
+        mtime = path.stat().st_mtime
+        existing = store.crawled_at(url)
+        if existing is not None and existing >= mtime:
+            result["skipped"] += 1
+            continue
+        mid_key, detail_name = url_index.get(url, (None, path.stem))
+        rows.append((url, detail_name, data, mid_key, mtime))
+        if len(rows) >= chunk:
+            result["migrated"] += store.put_many(rows)
+            rows = []
+
+    result["migrated"] += store.put_many(rows)
+    return result
+
+
+# =====================================================
+# CLI
+# =====================================================
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description="카테고리 스펙 저장소 (SQLite)")
+    parser.add_argument("--db", type=Path, default=SPEC_STORE_PATH)
+    sub = parser.add_subparsers(dest="command", required=True)
+    migrate = sub.add_parser("migrate", help="기존 JSON 디렉터리 → DB")
+    migrate.add_argument("directory", type=Path, nargs="?", default=PROJECT_ROOT / "storage" / "category_spec")
+    sub.add_parser("stats", help="저장소 요약")
+    args = parser.parse_args(argv)
+
+    store = SpecStore(args.db)
+    if args.command == "migrate":
+        if not args.directory.is_dir():
+            print(f"⚠️ 디렉터리가 없습니다: {args.directory}")
+            return 1
+        result = migrate_directory(args.directory, store)
+        print(f"✅ 마이그레이션: 파일 {result['files']}개 → 저장 {result['migrated']} / 건너뜀 {result['skipped']} / 실패 {result['failed']}")
+        return 0 if result["failed"] == 0 else 1
+
+    stats = store.stats()
+    ratio = stats["stored_bytes"] / stats["raw_bytes"] if stats["raw_bytes"] else 0
+    print(f"📄 {args.db}: {stats['rows']}행, 원본 {stats['raw_bytes']:,}B → 저장 {stats['stored_bytes']:,}B ({ratio:.0%})")
+    for label in ("oldest", "newest"):
+        if stats[label]:
+            print(f"  {label}: {time.strftime('%Y-%m-%d %H:%M:%S', time.localtime(stats[label]))}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,284 @@
+"""
+tracing.py
+──────────────────────────────
+- 요청 단위 경량 트레이싱 (webhook → stage → LLM / 카탈로그 / 저장소 / 크롤링)
+- contextvars 로 부모 span을 추적하므로 async 태스크, asyncio.to_thread 에서도 계층 유지
+- 루트 span 종료 시 trace 전체를 한 번에 export (JSONL 파일 또는 OTLP/JSON 수집기)
+
+📌 환경 변수
+- TRACE_SAMPLE_RATE      : 0.0 ~ 1.0, 루트 span 기준 샘플링 비율 (기본 0.0 = 비활성)
+- TRACE_SLOW_MS          : 샘플링되지 않아도 이 시간(ms) 이상 걸린 trace는 export (기본 0 = 사용 안 함)
+- TRACE_EXPORTER         : "jsonl" | "otlp" (기본 jsonl)
+- TRACE_EXPORT_PATH      : JSONL 파일 경로 (기본 storage/traces.jsonl)
+- TRACE_OTLP_ENDPOINT    : OTLP/HTTP JSON 엔드포인트 (기본 http://localhost:4318/v1/traces)
+
+📌 사용 예
+    with start_trace("webhook", user_id=user_id):
+        with span("stage_1"):
+            …
+"""
+
+import json
+import os
+import queue
+import random
+import threading
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from pathlib import Path
+from typing import Iterator, Optional
+
+# =====================================================
+# 0️⃣ 전역 설정
+# =====================================================
+PROJECT_ROOT = Path(__file__).resolve().parent.parent.parent
+
+TRACE_SAMPLE_RATE = float(os.getenv("TRACE_SAMPLE_RATE", "0") or 0)
+TRACE_SLOW_MS = float(os.getenv("TRACE_SLOW_MS", "0") or 0)
+TRACE_EXPORTER = os.getenv("TRACE_EXPORTER", "jsonl")
+TRACE_EXPORT_PATH = Path(os.getenv("TRACE_EXPORT_PATH", str(PROJECT_ROOT / "storage" / "traces.jsonl")))
+TRACE_OTLP_ENDPOINT = os.getenv("TRACE_OTLP_ENDPOINT", "http://localhost:4318/v1/traces")
+SERVICE_NAME = "kakaotalk-shopping-bot"
+
+_current_span: ContextVar[Optional["Span"]] = ContextVar("current_span", default=None)
+
+
+# =====================================================
+# 1️⃣ Span / Trace
+# =====================================================
+class Trace:
+    """루트 span 하나에 속한 span 묶음"""
+
+    def __init__(self, sampled: bool):
+        self.trace_id = os.urandom(16).hex()
+        self.sampled = sampled
+        self.spans: list["Span"] = []
+
+
+class Span:
+    def __init__(self, trace: Trace, name: str, parent: Optional["Span"], attributes: dict):
+        self.trace = trace
+        self.span_id = os.urandom(8).hex()
+        self.parent_id = parent.span_id if parent else None
+        self.name = name
+        self.attributes = dict(attributes)
+        self.status = "ok"
+        self.start_time = time.time()
+        self._start = time.perf_counter()
+        self.duration = 0.0
+
+    def set_attribute(self, key: str, value) -> None:
+        self.attributes[key] = value
+
+    def to_dict(self) -> dict:
+        return {
+            "trace_id": self.trace.trace_id,
+            "span_id": self.span_id,
+            "parent_id": self.parent_id,
+            "name": self.name,
+            "start": self.start_time,
+            "duration_ms": round(self.duration * 1000, 3),
+            "status": self.status,
+            "attributes": self.attributes,
+        }
+
+
+class _NoopSpan:
+    """트레이스 밖에서 호출될 때 사용하는 빈 span"""
+
+    def set_attribute(self, key: str, value) -> None:
+        pass
+
+
+_NOOP_SPAN = _NoopSpan()
+
+
+def _tracing_enabled() -> bool:
+    return TRACE_SAMPLE_RATE > 0 or TRACE_SLOW_MS > 0
+
+
+@contextmanager
+def _run_span(trace: Trace, name: str, parent: Optional[Span], attributes: dict) -> Iterator[Span]:
+    current = Span(trace, name, parent, attributes)
+    token = _current_span.set(current)
+    try:
+        yield current
+    except BaseException as e:
+        current.status = "error"
+        current.attributes.setdefault("error", f"{type(e).__name__}: {e}")
+        raise
+    finally:
+        current.duration = time.perf_counter() - current._start
+        _current_span.reset(token)
+        trace.spans.append(current)
+        if parent is None:
+            _finish_trace(trace, current)
+
+
+@contextmanager
+def start_trace(name: str, **attributes) -> Iterator:
+    """
+    루트 span 시작 (샘플링 결정은 여기서 1회)
+    - 이미 trace 안이라면 일반 자식 span으로 동작
+    """
+    parent = _current_span.get()
+    if parent is not None:
+        with _run_span(parent.trace, name, parent, attributes) as current:
+            yield current
+        return
+
+    if not _tracing_enabled():
+        yield _NOOP_SPAN
+        return
+
+    trace = Trace(sampled=random.random() < TRACE_SAMPLE_RATE)
+    with _run_span(trace, name, None, attributes) as current:
+        yield current
+
+
+@contextmanager
+def span(name: str, **attributes) -> Iterator:
+    """
+    현재 trace 의 자식 span (trace 밖이면 아무 것도 기록하지 않음)
+    """
+    parent = _current_span.get()
+    if parent is None:
+        yield _NOOP_SPAN
+        return
+    with _run_span(parent.trace, name, parent, attributes) as current:
+        yield current
+
+
+def current_trace_id() -> Optional[str]:
+    current = _current_span.get()
+    return current.trace.trace_id if current else None
+
+
+# =====================================================
+# 2️⃣ Export
+# =====================================================
+_export_queue: "queue.Queue[list[dict]]" = queue.Queue(maxsize=1000)
+_export_thread: Optional[threading.Thread] = None
+_export_lock = threading.Lock()
+
+
+def _finish_trace(trace: Trace, root: Span) -> None:
+    slow = TRACE_SLOW_MS > 0 and root.duration * 1000 >= TRACE_SLOW_MS
+    if not (trace.sampled or slow):
+        return
+    records = [s.to_dict() for s in trace.spans]
+    _ensure_export_thread()
+    try:
+        _export_queue.put_nowait(records)
+    except queue.Full:
+        print("⚠️ trace export 큐가 가득 차 trace를 버립니다.")
+
+
+def _ensure_export_thread() -> None:
+    global _export_thread
+    with _export_lock:
+        if _export_thread is None or not _export_thread.is_alive():
+            _export_thread = threading.Thread(target=_export_loop, name="trace-exporter", daemon=True)
+            _export_thread.start()
+
+
+def _export_loop() -> None:
+    while True:
+        records = _export_queue.get()
+        try:
+            if TRACE_EXPORTER == "otlp":
+                _export_otlp(records)
+            else:
+                _export_jsonl(records)
+        except Exception as e:
+            print(f"⚠️ trace export 실패: {e}")
+
+
+def _export_jsonl(records: list[dict]) -> None:
+    TRACE_EXPORT_PATH.parent.mkdir(parents=True, exist_ok=True)
+    with open(TRACE_EXPORT_PATH, "a", encoding="utf-8") as f:
+        for record in records:
+            f.write(json.dumps(record, ensure_ascii=False, default=str) + "\n")
+
+
+def _otlp_value(value) -> dict:
+    if isinstance(value, bool):
+        return {"boolValue": value}
+    if isinstance(value, int):
+        return {"intValue": str(value)}
+    if isinstance(value, float):
+        return {"doubleValue": value}
+    return {"stringValue": str(value)}
+
+
+def _export_otlp(records: list[dict]) -> None:
+    """OTLP/HTTP JSON (ExportTraceServiceRequest) 형식으로 전송"""
+    spans = []
+    for record in records:
+        start_ns = int(record["start"] * 1e9)
+        spans.append({
+            "traceId": record["trace_id"],
+            "spanId": record["span_id"],
+            "parentSpanId": record["parent_id"] or "",
+            "name": record["name"],
+            "kind": 1,
+            "startTimeUnixNano": str(start_ns),
+            "endTimeUnixNano": str(start_ns + int(record["duration_ms"] * 1e6)),
+            "attributes": [{"key": k, "value": _otlp_value(v)} for k, v in record["attributes"].items()],
+            "status": {"code": 2 if record["status"] == "error" else 1},
+        })
+    body = {
+        "resourceSpans": [{
+            "resource": {"attributes": [{"key": "service.name", "value": {"stringValue": SERVICE_NAME}}]},
+            "scopeSpans": [{"scope": {"name": "app.utils.tracing"}, "spans": spans}],
+        }]
+    }
+    import urllib.request  # otlp exporter 사용 시에만 로드
+
+    request = urllib.request.Request(
+        TRACE_OTLP_ENDPOINT,
+        data=json.dumps(body).encode("utf-8"),
+        headers={"Content-Type": "application/json"},
+        method="POST",
+    )
+    urllib.request.urlopen(request, timeout=5).close()
+
+
+# =====================================================
+# 3️⃣ 분석 CLI: 느린 trace 분해
+# =====================================================
+def summarize_traces(path: Path = TRACE_EXPORT_PATH, top: int = 5) -> None:
+    """
+    JSONL 파일에서 가장 느린 trace N개를 span 트리로 출력
+    """
+    traces: dict[str, list[dict]] = {}
+    with open(path, encoding="utf-8") as f:
+        for line in f:
+            record = json.loads(line)
+            traces.setdefault(record["trace_id"], []).append(record)
+
+    def root_of(spans: list[dict]) -> dict:
+        return next((s for s in spans if s["parent_id"] is None), spans[0])
+
+    ranked = sorted(traces.values(), key=lambda spans: root_of(spans)["duration_ms"], reverse=True)
+    for spans in ranked[:top]:
+        children: dict[Optional[str], list[dict]] = {}
+        for s in spans:
+            children.setdefault(s["parent_id"], []).append(s)
+
+        def walk(node: dict, depth: int) -> None:
+            print(f"{'  ' * depth}- {node['name']}: {node['duration_ms']:.1f}ms [{node['status']}]")
+            for child in sorted(children.get(node["span_id"], []), key=lambda s: s["start"]):
+                walk(child, depth + 1)
+
+        root = root_of(spans)
+        print(f"🔎 trace {root['trace_id']}")
+        walk(root, 1)
+        print()
+
+
+if __name__ == "__main__":
+    import sys
+
+    summarize_traces(Path(sys.argv[1]) if len(sys.argv) > 1 else TRACE_EXPORT_PATH)
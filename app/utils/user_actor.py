@@ -0,0 +1,267 @@
+"""
+user_actor.py
+──────────────────────────────
+- 유저별 실행 액터: 같은 유저의 webhook 요청을 한 번에 하나씩 처리 (세션 상태 경쟁 · 병렬 LLM 체인 방지)
+- 짧은 시간에 연달아 온 메시지
+  - 자유 발화 stage(기본 stage 1): debounce 시간 동안 기다렸다가 한 문장으로 합쳐 한 번만 처리
+    ("노트북 추천해줘" + "게이밍용으로" → "노트북 추천해줘 게이밍용으로")
+  - 그 외 stage / 버튼 액션: 마지막 메시지만 처리 (이전 메시지는 건너뜀)
+- 처리 중인 요청이 취소 가능한 stage(기본 stage 1 · 2 — LLM 대기 중이고 세션은 끝에서만 갱신)면
+  새 메시지가 오는 즉시 취소하고 그 발화를 다음 처리에 포함
+  stage 3(크롤링) · 4 는 취소하지 않고 끝날 때까지 기다린 뒤 순서대로 처리
+- 건너뛴 / 취소된 요청, 앞 요청이 wait_timeout 안에 끝나지 않은 요청은 TurnSkipped 예외
+  → 호출하는 쪽에서 안내 문구로 바로 응답 (예외라서 중복 요청 캐시에도 남지 않음)
+- 실제 처리는 요청한 쪽 task 의 자식 task 로 실행 → 이벤트 로그 · 트레이싱 contextvar 가 그대로 이어짐
+- 유휴 시간이 지난 액터는 다음 요청 때 제거 (프로세스(워커) 단위)
+
+📌 환경 변수
+- ACTOR_ENABLED         : 0 이면 요청마다 바로 처리 (기본 1)
+- ACTOR_DEBOUNCE        : 자유 발화 합치기 대기 시간(초), 0 이면 합치지 않음 (기본 0.4)
+- ACTOR_WAIT_TIMEOUT    : 앞 요청이 끝나기를 기다리는 최대 시간(초) (기본 3, 카카오 응답 제한 5초보다 짧게)
+- ACTOR_IDLE_TTL        : 요청이 없는 액터를 유지하는 시간(초) (기본 300)
+- ACTOR_COALESCE_STAGES : 메시지를 합치는 stage 목록 (기본 "1")
+- ACTOR_CANCEL_STAGES   : 새 메시지가 오면 처리 중인 작업을 취소하는 stage 목록 (기본 "1,2")
+"""
+
+import asyncio
+import os
+import time
+from collections import OrderedDict
+from typing import Any, Awaitable, Callable, Optional
+
+from app.utils.metrics import USER_ACTOR_TURNS, USER_ACTORS
+
+# =====================================================
+# 0️⃣ 전역 설정
+# =====================================================
+def _stages(value: str) -> frozenset[int]:
+    return frozenset(int(part) for part in value.split(",") if part.strip())
+
+
+ACTOR_ENABLED = os.getenv("ACTOR_ENABLED", "1") == "1"
+ACTOR_DEBOUNCE = float(os.getenv("ACTOR_DEBOUNCE", "0.4"))
+ACTOR_WAIT_TIMEOUT = float(os.getenv("ACTOR_WAIT_TIMEOUT", "3"))
+ACTOR_IDLE_TTL = float(os.getenv("ACTOR_IDLE_TTL", "300"))
+ACTOR_COALESCE_STAGES = _stages(os.getenv("ACTOR_COALESCE_STAGES", "1"))
+ACTOR_CANCEL_STAGES = _stages(os.getenv("ACTOR_CANCEL_STAGES", "1,2"))
+
+SUPERSEDED_MESSAGE = "💬 이어서 보내신 메시지와 함께 답변드릴게요."
+BUSY_TURN_MESSAGE = "⏳ 이전 메시지를 처리하고 있습니다. 잠시 후 다시 보내 주세요."
+
+Handler = Callable[[str, dict], Awaitable[Any]]
+
+
+class TurnSkipped(Exception):
+    """
+    처리하지 않은 요청 (outcome: superseded | cancelled → SUPERSEDED_MESSAGE, busy → BUSY_TURN_MESSAGE)
+    """
+
+    def __init__(self, outcome: str):
+        super().__init__(f"유저 요청 처리 생략 ({outcome})")
+        self.outcome = outcome
+        self.message = BUSY_TURN_MESSAGE if outcome == "busy" else SUPERSEDED_MESSAGE
+
+
+# =====================================================
+# 1️⃣ 액터
+# =====================================================
+class Turn:
+    """메시지 1개 (합쳐진 경우 여러 발화를 이은 것)"""
+
+    __slots__ = ("utterance", "params")
+
+    def __init__(self, utterance: str, params: Optional[dict] = None):
+        self.utterance = utterance
+        self.params = params or {}
+
+    @property
+    def structured(self) -> bool:
+        return bool(self.params.get("action"))
+
+
+class _Running:
+    __slots__ = ("turn", "task", "stage")
+
+    def __init__(self, turn: Turn, task: asyncio.Task, stage: int):
+        self.turn = turn
+        self.task = task
+        self.stage = stage
+
+
+class _Actor:
+    __slots__ = ("lock", "pending", "running", "last_used")
+
+    def __init__(self):
+        self.lock = asyncio.Lock()
+        self.pending: list[Turn] = []          # 아직 시작하지 않은 메시지 (오래된 순)
+        self.running: Optional[_Running] = None
+        self.last_used = time.monotonic()
+
+    @property
+    def idle(self) -> bool:
+        return not self.pending and self.running is None and not self.lock.locked()
+
+
+class UserActors:
+    """
+    user id → 액터 (요청 직렬화 · 메시지 합치기 · 이전 작업 취소)
+
+    Args:
+        stage_of (Callable[[str], int]): 유저의 현재 stage 조회 (합치기 / 취소 여부 판단)
+        debounce (float): 합치기 대기 시간(초)
+        wait_timeout (float): 앞 요청 대기 최대 시간(초)
+        idle_ttl (float): 유휴 액터 유지 시간(초)
+    """
+
+    def __init__(self, stage_of: Callable[[str], int], debounce: float = ACTOR_DEBOUNCE,
+                 wait_timeout: float = ACTOR_WAIT_TIMEOUT, idle_ttl: float = ACTOR_IDLE_TTL,
+                 coalesce_stages: frozenset[int] = ACTOR_COALESCE_STAGES,
+                 cancel_stages: frozenset[int] = ACTOR_CANCEL_STAGES, enabled: bool = ACTOR_ENABLED):
+        self.stage_of = stage_of
+        self.debounce = debounce
+        self.wait_timeout = wait_timeout
+        self.idle_ttl = idle_ttl
+        self.coalesce_stages = coalesce_stages
+        self.cancel_stages = cancel_stages
+        self.enabled = enabled
+        self._actors: OrderedDict[str, _Actor] = OrderedDict()
+        USER_ACTORS.set_function(lambda: len(self._actors))
+
+    def __len__(self) -> int:
+        return len(self._actors)
+
+    def _evict(self, now: float) -> None:
+        # 최근 사용 순으로 정렬되어 있으므로 앞쪽부터 만료 확인
+        while self._actors:
+            user_id, actor = next(iter(self._actors.items()))
+            if now - actor.last_used <= self.idle_ttl:
+                break
+            if actor.idle:
+                self._actors.popitem(last=False)
+            else:
+                self._actors.move_to_end(user_id)
+                actor.last_used = now
+
+    def _actor(self, user_id: str) -> _Actor:
+        now = time.monotonic()
+        self._evict(now)
+        actor = self._actors.get(user_id)
+        if actor is None:
+            actor = self._actors[user_id] = _Actor()
+        self._actors.move_to_end(user_id)
+        actor.last_used = now
+        return actor
+
+    def _preempt(self, actor: _Actor) -> None:
+        """처리 중인 작업이 취소 가능한 stage 면 취소하고, 그 메시지를 다음 처리에 포함"""
+        running = actor.running
+        if running is None or running.stage not in self.cancel_stages:
+            return
+        if running.task.cancel():
+            actor.pending.insert(0, running.turn)
+
+    def _merge(self, batch: list[Turn], stage: int) -> Turn:
+        """대기 중이던 메시지 → 처리할 메시지 1개"""
+        latest = batch[-1]
+        if len(batch) == 1:
+            return latest
+        if stage in self.coalesce_stages and not any(turn.structured for turn in batch):
+            parts: list[str] = []
+            for turn in batch:
+                text = turn.utterance.strip()
+                if text and (not parts or parts[-1] != text):
+                    parts.append(text)
+            USER_ACTOR_TURNS.inc(len(batch) - 1, result="coalesced")
+            return Turn(" ".join(parts))
+        return latest
+
+    def _skip(self, outcome: str) -> TurnSkipped:
+        USER_ACTOR_TURNS.inc(result=outcome)
+        return TurnSkipped(outcome)
+
+    async def submit(self, user_id: str, utterance: str, params: Optional[dict], handler: Handler) -> Any:
+        """
+        유저의 메시지 1개 처리
+
+        Args:
+            handler: (발화, 액션 값) → 응답 (합쳐진 경우 합친 발화로 한 번만 호출)
+
+        Returns:
+            Any: handler 결과 (이 요청을 처리하지 않았으면 TurnSkipped)
+        """
+        if not self.enabled:
+            return await handler(utterance, params or {})
+
+        actor = self._actor(user_id)
+        turn = Turn(utterance, params)
+        actor.pending.append(turn)
+        self._preempt(actor)
+
+        # 자유 발화면 이어지는 메시지를 잠깐 기다림 (버튼 · 짧은 응답 stage 는 바로 진행)
+        if self.debounce > 0 and not turn.structured and self.stage_of(user_id) in self.coalesce_stages:
+            await asyncio.sleep(self.debounce)
+        if not actor.pending or actor.pending[-1] is not turn:
+            raise self._skip("superseded")
+
+        try:
+            await asyncio.wait_for(actor.lock.acquire(), self.wait_timeout)
+        except asyncio.TimeoutError:
+            if turn in actor.pending:
+                actor.pending.remove(turn)
+            raise self._skip("busy") from None
+
+        try:
+            # 기다리는 동안 더 새로운 메시지가 왔으면 그 쪽에서 함께 처리
+            if not actor.pending or actor.pending[-1] is not turn:
+                raise self._skip("superseded")
+            stage = self.stage_of(user_id)
+            batch, actor.pending = actor.pending, []
+            merged = self._merge(batch, stage)
+            task = asyncio.create_task(handler(merged.utterance, merged.params))
+            actor.running = _Running(merged, task, stage)
+            try:
+                await asyncio.wait({task})
+            except asyncio.CancelledError:
+                task.cancel()
+                raise
+        finally:
+            actor.running = None
+            actor.last_used = time.monotonic()
+            actor.lock.release()
+
+        if task.cancelled():
+            raise self._skip("cancelled")
+        USER_ACTOR_TURNS.inc(result="processed")
+        return task.result()
+
+    def clear(self) -> None:
+        self._actors.clear()
+
+
+# =====================================================
+# CLI 테스트
+# =====================================================
+if __name__ == "__main__":
+    calls = []
+
+    async def slow_handler(utterance: str, params: dict) -> str:
+        calls.append(utterance)
+        await asyncio.sleep(0.3)
+        return f"응답: {utterance}"
+
+    async def demo():
+        actors = UserActors(stage_of=lambda user_id: 1, debounce=0.1)
+
+        async def send(text: str, delay: float):
+            await asyncio.sleep(delay)
+            try:
+                return await actors.submit("user", text, None, slow_handler)
+            except TurnSkipped as e:
+                return e.outcome
+
+        # 0.05초 간격 2개 → 합쳐서 1번, 0.2초 뒤(처리 중) 1개 → 이전 작업 취소 후 3개를 합쳐 처리
+        results = await asyncio.gather(send("노트북 추천해줘", 0), send("게이밍용으로", 0.05), send("15인치", 0.35))
+        print(results)
+        print(f"handler 호출: {calls}")
+
+    asyncio.run(demo())
@@ -0,0 +1,182 @@
+"""
+bench_crawl_profile.py
+──────────────────────────────
+- 크롤링 프로필(full / fast) 비교: 페이지당 시간과 Chrome 프로세스 트리 RSS
+- 프로필마다 드라이버 1개를 띄워 같은 URL 목록을 순서대로 extract_spec_options() 로 추출
+  → 드라이버 기동 시간, 페이지당 p50 / p90 / 평균, 최대 RSS, 추출된 옵션 수(결과 동일성 확인)
+- URL 은 storage/category_structure.json 에서 앞쪽 N개 (--url 로 직접 지정 가능)
+- 실제 다나와 대신 fake 서버로 측정하려면 --base-url http://127.0.0.1:<port>
+  (python -m loadtest.fake_services 로 실행한 Danawa fake 서버 — 리소스가 없어 차단 효과는 측정되지 않음)
+
+📌 실행 예
+    python -m benchmarks.bench_crawl_profile --pages 10
+    python -m benchmarks.bench_crawl_profile --profiles full,fast --url "https://prod.danawa.com/list/?cate=11254120"
+"""
+
+import argparse
+import json
+import os
+import statistics
+import sys
+import time
+from pathlib import Path
+
+from benchmarks.harness import format_us
+
+PROJECT_ROOT = Path(__file__).resolve().parent.parent
+CATEGORY_JSON_PATH = PROJECT_ROOT / "storage" / "category_structure.json"
+
+
+# =====================================================
+# 1️⃣ Chrome RSS
+# =====================================================
+def _children_map() -> dict[int, list[int]]:
+    """/proc 를 훑어 ppid → 자식 pid 목록"""
+    children: dict[int, list[int]] = {}
+    for entry in os.listdir("/proc"):
+        if not entry.isdigit():
+            continue
+        try:
+            with open(f"/proc/{entry}/stat", encoding="utf-8") as f:
+                stat = f.read()
+        except OSError:
+            continue
+        ppid = int(stat.rsplit(")", 1)[1].split()[1])
+        children.setdefault(ppid, []).append(int(entry))
+    return children
+
+
+def _rss_bytes(pid: int) -> int:
+    try:
+        with open(f"/proc/{pid}/statm", encoding="utf-8") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except OSError:
+        return 0
+
+
+def process_tree_rss(root_pid: int) -> int:
+    """
+    root_pid(chromedriver) 와 모든 하위 프로세스(Chrome browser / renderer / gpu …) RSS 합계
+    psutil 이 있으면 사용, 없으면 /proc (Linux)
+    """
+    try:
+        import psutil
+    except ImportError:
+        psutil = None
+
+    if psutil is not None:
+        try:
+            root = psutil.Process(root_pid)
+            procs = [root] + root.children(recursive=True)
+        except psutil.NoSuchProcess:
+            return 0
+        total = 0
+        for proc in procs:
+            try:
+                total += proc.memory_info().rss
+            except psutil.NoSuchProcess:
+                pass
+        return total
+
+    if not os.path.isdir("/proc"):
+        return 0
+    children = _children_map()
+    total, stack = 0, [root_pid]
+    while stack:
+        pid = stack.pop()
+        total += _rss_bytes(pid)
+        stack.extend(children.get(pid, ()))
+    return total
+
+
+# =====================================================
+# 2️⃣ 측정
+# =====================================================
+def sample_urls(count: int) -> list[str]:
+    with open(CATEGORY_JSON_PATH, encoding="utf-8") as f:
+        structure = json.load(f)
+    urls = []
+    for mids in structure.values():
+        for details in mids.values():
+            for _, url in details:
+                urls.append(url)
+                if len(urls) >= count:
+                    return urls
+    return urls
+
+
+def run_profile(profile: str, urls: list[str]) -> dict:
+    """
+    profile 로 드라이버 1개를 띄워 urls 를 순서대로 추출
+
+    Returns:
+        dict: {"startup", "pages"(초 목록), "peak_rss", "options"(페이지별 추출 항목 수)}
+    """
+    from selenium_utils.manufacturer_brand_crawler import extract_spec_options, setup_selenium_driver
+
+    start = time.perf_counter()
+    driver = setup_selenium_driver(profile)
+    startup = time.perf_counter() - start
+    chromedriver_pid = driver.service.process.pid
+
+    pages, options, peak_rss = [], [], 0
+    try:
+        for url in urls:
+            start = time.perf_counter()
+            result = extract_spec_options(driver, url)
+            pages.append(time.perf_counter() - start)
+            options.append(sum(len(v) for v in result.values()))
+            peak_rss = max(peak_rss, process_tree_rss(chromedriver_pid))
+    finally:
+        driver.quit()
+    return {"startup": startup, "pages": pages, "peak_rss": peak_rss, "options": options}
+
+
+def percentile(values: list[float], q: float) -> float:
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(q * len(ordered)))]
+
+
+# =====================================================
+# 3️⃣ CLI
+# =====================================================
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description="크롤링 프로필(full / fast) 페이지 시간 · RSS 비교")
+    parser.add_argument("--profiles", default="full,fast")
+    parser.add_argument("--pages", type=int, default=10, help="카탈로그에서 가져올 URL 수")
+    parser.add_argument("--url", action="append", default=[], help="측정할 URL (여러 번 지정 가능)")
+    parser.add_argument("--base-url", default="", help="prod.danawa.com 을 이 주소로 교체 (fake 서버)")
+    parser.add_argument("--json", action="store_true", help="결과를 JSON 으로 출력")
+    args = parser.parse_args(argv)
+
+    urls = args.url or sample_urls(args.pages)
+    if args.base_url:
+        urls = [u.replace("https://prod.danawa.com", args.base_url.rstrip("/"), 1) for u in urls]
+
+    runs = {profile.strip(): run_profile(profile.strip(), urls) for profile in args.profiles.split(",") if profile.strip()}
+
+    if args.json:
+        print(json.dumps(runs, indent=2))
+        return 0
+
+    print(f"🌐 URL {len(urls)}개")
+    print(f"  {'profile':<8}{'기동':>12}{'p50':>12}{'p90':>12}{'mean':>12}{'peak RSS':>12}{'옵션 수':>10}")
+    for name, run in runs.items():
+        pages_us = [v * 1e6 for v in run["pages"]]
+        print(
+            f"  {name:<8}{format_us(run['startup'] * 1e6):>12}{format_us(percentile(pages_us, 0.5)):>12}"
+            f"{format_us(percentile(pages_us, 0.9)):>12}{format_us(statistics.fmean(pages_us)):>12}"
+            f"{run['peak_rss'] / 1024 / 1024:>10.0f}MB{sum(run['options']):>10}"
+        )
+
+    # 같은 URL 에서 추출된 항목 수가 다르면 fast 프로필이 필요한 DOM 을 놓친 것
+    baseline = runs.get("full")
+    for name, run in runs.items():
+        if baseline is not None and run is not baseline and run["options"] != baseline["options"]:
+            diff = [i for i, (a, b) in enumerate(zip(baseline["options"], run["options"])) if a != b]
+            print(f"⚠️ {name}: full 과 추출 결과 수가 다른 페이지 {len(diff)}개 → {[urls[i] for i in diff][:5]}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
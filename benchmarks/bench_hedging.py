@@ -0,0 +1,108 @@
+"""
+bench_hedging.py
+──────────────────────────────
+- hedged LLM 요청(chatbot_llm/llm_hedging.py) 오프라인 시뮬레이션
+- 긴 꼬리 지연 분포를 가진 가짜 LLM 호출로 hedge 없음 / 있음을 같은 시드로 비교
+  → p50 / p90 / p99 지연과 추가 호출 비율, 추정 추가 토큰 출력
+
+📌 실행 예
+    python -m benchmarks.bench_hedging
+    python -m benchmarks.bench_hedging --latency lognormal:0.9,0.6 --calls 2000 --budget 0.05
+"""
+
+import argparse
+import asyncio
+import random
+import statistics
+import sys
+import time
+from types import SimpleNamespace
+
+from benchmarks.harness import format_us
+from chatbot_llm.llm_hedging import HedgePolicy, hedged_call
+from loadtest.fake_services import LatencySampler
+
+PROMPT_TOKENS = 850  # refine 프롬프트 평균 크기 정도
+
+
+# =====================================================
+# 1️⃣ 시뮬레이션
+# =====================================================
+async def simulate(sampler: LatencySampler, calls: int, concurrency: int, speedup: float,
+                   policy: HedgePolicy | None) -> dict:
+    """
+    calls 건의 가짜 LLM 호출 실행 (speedup 배 빠르게 재생)
+
+    Returns:
+        dict: {"latencies", "requests"} — latencies 는 원래 시간 척도(초)
+    """
+    requests = 0
+
+    async def fake_llm():
+        nonlocal requests
+        requests += 1
+        await asyncio.sleep(sampler.sample() / speedup)
+        return SimpleNamespace(usage=SimpleNamespace(prompt_tokens=PROMPT_TOKENS, completion_tokens=40))
+
+    semaphore = asyncio.Semaphore(concurrency)
+    latencies = []
+
+    async def one():
+        async with semaphore:
+            start = time.perf_counter()
+            if policy is None:
+                await fake_llm()
+            else:
+                await hedged_call("bench", fake_llm, policy)
+            latencies.append((time.perf_counter() - start) * speedup)
+
+    await asyncio.gather(*(one() for _ in range(calls)))
+    return {"latencies": latencies, "requests": requests}
+
+
+def percentile(values: list[float], q: float) -> float:
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(q * len(ordered)))]
+
+
+# =====================================================
+# 2️⃣ CLI
+# =====================================================
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description="hedged LLM 요청 시뮬레이션")
+    parser.add_argument("--latency", default="lognormal:0.8,0.5", help="LLM 지연 분포 (loadtest 표기)")
+    parser.add_argument("--calls", type=int, default=1000)
+    parser.add_argument("--concurrency", type=int, default=50)
+    parser.add_argument("--speedup", type=float, default=20.0, help="시뮬레이션 재생 배속")
+    parser.add_argument("--quantile", type=float, default=0.9)
+    parser.add_argument("--budget", type=float, default=0.1)
+    parser.add_argument("--seed", type=int, default=7)
+    args = parser.parse_args(argv)
+
+    sampler = LatencySampler.parse(args.latency)
+    runs = {}
+    for name, policy in (
+        ("hedge 없음", None),
+        (f"hedge p{args.quantile * 100:.0f}", HedgePolicy(
+            modules={"bench"}, quantile=args.quantile, min_delay=0.0,
+            budget=args.budget, burst=10, min_samples=20,
+        )),
+    ):
+        random.seed(args.seed)
+        runs[name] = asyncio.run(simulate(sampler, args.calls, args.concurrency, args.speedup, policy))
+
+    print(f"🎲 지연 분포 {sampler}, 호출 {args.calls}건, 동시 {args.concurrency}")
+    print(f"  {'':<14}{'p50':>12}{'p90':>12}{'p99':>12}{'mean':>12}{'추가 호출':>10}{'추가 토큰':>12}")
+    for name, run in runs.items():
+        lat = [v * 1e6 for v in run["latencies"]]
+        extra = run["requests"] - args.calls
+        print(
+            f"  {name:<14}{format_us(percentile(lat, 0.5)):>12}{format_us(percentile(lat, 0.9)):>12}"
+            f"{format_us(percentile(lat, 0.99)):>12}{format_us(statistics.fmean(lat)):>12}"
+            f"{extra / args.calls * 100:>9.1f}%{extra * PROMPT_TOKENS:>12,}"
+        )
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
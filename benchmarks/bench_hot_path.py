@@ -0,0 +1,187 @@
+"""
+bench_hot_path.py
+──────────────────────────────
+- 매 요청마다 실행되는 app/utils 순수 함수 마이크로벤치마크
+- 실제 storage/category_structure*.json 데이터 사용
+- session_manager.update_session 은 유저 수 × history 길이를 늘려가며 측정
+- stage 4 옵션 선택 해석(spec_filter): 인덱스 생성 / 번호 · 이름 · 부분 일치 · 다중 선택
+- stage 1 키워드 빠른 경로(keyword_spotter): 오토마톤 생성 / 짧은 · 긴 발화 스캔
+
+📌 실행 예
+    python -m benchmarks.bench_hot_path --save-baseline          # baseline 저장
+    python -m benchmarks.bench_hot_path --compare --threshold 10 # 10% 이상 느려지면 종료 코드 1
+"""
+
+import itertools
+import json
+import sys
+from pathlib import Path
+
+from app.services.keyword_spotter import KeywordSpotter
+from app.services.spec_filter import SpecOptionIndex
+from app.utils import session_manager
+from app.utils.build_category_dict import build_category_dict, load_category_keys
+from app.utils.category_spec_storage import sanitize_filename
+from app.utils.category_url_resolver import resolve_category_url
+from app.utils.parser import (
+    extract_block_name,
+    extract_intent,
+    extract_params,
+    extract_user_id,
+    extract_utterance,
+)
+from app.utils.recommendation_formatter import format_crawled_result, format_recommendation_message
+from benchmarks.harness import BenchSuite, run_cli
+
+PROJECT_ROOT = Path(__file__).resolve().parent.parent
+CATEGORY_JSON_PATH = PROJECT_ROOT / "storage" / "category_structure.json"
+
+USER_COUNTS = (100, 10_000)
+HISTORY_LENGTHS = (10, 1_000)
+
+
+# =====================================================
+# 1️⃣ 실제 데이터 기반 입력
+# =====================================================
+def load_fixtures() -> dict:
+    category_keys = load_category_keys()
+    with open(CATEGORY_JSON_PATH, encoding="utf-8") as f:
+        structure = json.load(f)
+
+    first_top = next(iter(structure))
+    first_mid = next(iter(structure[first_top]))
+    last_top = list(structure)[-1]
+    last_mid = list(structure[last_top])[-1]
+
+    detail_names = [d for mids in category_keys.values() for details in mids.values() for d in details]
+
+    # refine 결과와 같은 모양: 중간키 2개 × 세부 항목 최대 5개
+    mids = list(category_keys["컴퓨터 · 노트북 · 조립PC"].items())[:2]
+    recommended = {mid: details[:5] for mid, details in mids}
+
+    crawled_options = {
+        "제조사": sorted({name.split("/")[0] for name in detail_names[:40]}),
+        "브랜드": sorted({name.split(" ")[0] for name in detail_names[40:80]}),
+    }
+    crawled_nav = {name: url for name, url in structure[last_top][last_mid]}
+
+    payload = {
+        "intent": {"id": "intent-id", "name": "폴백 블록"},
+        "userRequest": {
+            "utterance": "사무실에서 쓸 만한 노트북 추천해줘",
+            "user": {"id": "a" * 64, "type": "botUserKey"},
+            "block": {"id": "block-id", "name": "폴백 블록"},
+        },
+        "action": {"params": {"mid_key": "노트북"}, "clientExtra": {}},
+    }
+
+    return {
+        "category_keys": category_keys,
+        "keywords_top": [True, "컴퓨터 · 노트북 · 조립PC"],
+        "keywords_mixed": [True, "키보드/마우스/웹캠", "컴퓨터 · 노트북 · 조립PC", "게이밍 노트북"],
+        "url_first": (first_mid, structure[first_top][first_mid][0][0]),
+        "url_last": (last_mid, structure[last_top][last_mid][-1][0]),
+        "detail_names": detail_names,
+        "recommended": recommended,
+        "crawled_options": crawled_options,
+        "crawled_nav": crawled_nav,
+        "payload": payload,
+    }
+
+
+# =====================================================
+# 2️⃣ 세션 시나리오
+# =====================================================
+def prepare_sessions(user_count: int, history_length: int) -> list[str]:
+    """session_states 를 user_count 명 × history_length 개 기록으로 채움"""
+    session_manager.session_states.clear()
+    user_ids = [f"user-{i:06d}" for i in range(user_count)]
+    entry = {"user": "1", "bot_raw": {"mid_key": "노트북", "detail_key": "노트북 전체"}}
+    for user_id in user_ids:
+        session = session_manager.get_session(user_id)
+        session["history"].extend([dict(entry) for _ in range(history_length)])
+    return user_ids
+
+
+def make_update_session_bench(user_count: int, history_length: int):
+    state = {}
+
+    def bench() -> None:
+        # 최초 호출 시 세션을 채우고, 이후에는 유저를 순환하며 갱신 (history 증가를 분산)
+        if "users" not in state:
+            state["users"] = itertools.cycle(prepare_sessions(user_count, history_length))
+        session_manager.update_session(
+            next(state["users"]), stage=2, user_utterance="3", bot_raw_result={"노트북": ["노트북 전체"]}
+        )
+
+    return bench
+
+
+# =====================================================
+# 3️⃣ 스위트 구성
+# =====================================================
+def build_suite() -> BenchSuite:
+    fx = load_fixtures()
+    suite = BenchSuite("hot_path")
+
+    suite.add("build_category_dict[top, preloaded]",
+              lambda: build_category_dict(fx["keywords_top"], fx["category_keys"]))
+    suite.add("build_category_dict[mixed, preloaded]",
+              lambda: build_category_dict(fx["keywords_mixed"], fx["category_keys"]))
+    suite.add("build_category_dict[mixed, load json]",
+              lambda: build_category_dict(fx["keywords_mixed"]))
+
+    suite.add("resolve_category_url[first]", lambda: resolve_category_url(*fx["url_first"]))
+    suite.add("resolve_category_url[last]", lambda: resolve_category_url(*fx["url_last"]))
+
+    suite.add("format_recommendation_message",
+              lambda: format_recommendation_message("추천 결과입니다:", fx["recommended"], "원하시는 항목 번호를 입력해 주세요!"))
+    suite.add("format_crawled_result[options]", lambda: format_crawled_result(fx["crawled_options"]))
+    suite.add("format_crawled_result[nav]", lambda: format_crawled_result({"nav": fx["crawled_nav"]}))
+
+    detail_names = fx["detail_names"]
+    suite.add(f"sanitize_filename[x{len(detail_names)}]",
+              lambda: [sanitize_filename(name) for name in detail_names])
+
+    payload = fx["payload"]
+    suite.add("parser.extract_*[all]", lambda: (
+        extract_utterance(payload),
+        extract_user_id(payload),
+        extract_intent(payload),
+        extract_block_name(payload),
+        extract_params(payload),
+    ))
+    suite.add("parser.extract_*[missing keys]", lambda: (
+        extract_utterance({}),
+        extract_user_id({}),
+        extract_block_name({}),
+        extract_params({}),
+    ))
+
+    options_index = SpecOptionIndex(fx["crawled_options"])
+    nav_index = SpecOptionIndex({"nav": fx["crawled_nav"]})
+    manufacturers = fx["crawled_options"]["제조사"]
+    suite.add("spec_filter.build[options]", lambda: SpecOptionIndex(fx["crawled_options"]))
+    suite.add("spec_filter.resolve[number]", lambda: options_index.resolve("3", "제조사"))
+    suite.add("spec_filter.resolve[numbers]", lambda: options_index.resolve("1, 3, 5~7번", "제조사"))
+    suite.add("spec_filter.resolve[exact name]", lambda: options_index.resolve(manufacturers[-1]))
+    suite.add("spec_filter.resolve[fuzzy name]", lambda: options_index.resolve(manufacturers[-1][:2] + "으로"))
+    suite.add("spec_filter.resolve[multi]", lambda: options_index.resolve(f"{manufacturers[0]}, {manufacturers[1]}"))
+    suite.add("spec_filter.resolve[nav]", lambda: nav_index.resolve(next(iter(fx["crawled_nav"]))))
+
+    spotter = KeywordSpotter(fx["category_keys"])
+    long_utterance = "키보드를 살건데, 그렇게 비싼거는 필요없고 적당한 기계식키보드를 원해 " * 4
+    suite.add("keyword_spotter.build", lambda: KeywordSpotter(fx["category_keys"]))
+    suite.add("keyword_spotter.spot[short]", lambda: spotter.spot("게이밍 노트북 추천해줘"))
+    suite.add("keyword_spotter.spot[long]", lambda: spotter.spot(long_utterance))
+    suite.add("keyword_spotter.spot[miss]", lambda: spotter.spot("엄마 생신 선물 뭐가 좋을까"))
+
+    for user_count, history_length in itertools.product(USER_COUNTS, HISTORY_LENGTHS):
+        suite.add(f"update_session[users={user_count}, history={history_length}]",
+                  make_update_session_bench(user_count, history_length))
+
+    return suite
+
+
+if __name__ == "__main__":
+    sys.exit(run_cli(build_suite()))
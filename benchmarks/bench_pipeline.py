@@ -0,0 +1,144 @@
+"""
+bench_pipeline.py
+──────────────────────────────
+- recommend_category / prepare_category_flow 오프라인 벤치마크 & 회귀 테스트
+- LLM 호출은 카세트(chatbot_llm/llm_cassette.py)에서 재생 → 비용 없이, 실제 지연 분포 그대로 측정
+- baseline 에 출력 결과도 함께 저장해 파이프라인 동작 변화(회귀)를 검출
+
+📌 실행 예
+    # 1) 실제 OpenAI 호출로 카세트 녹화 (OPENAI_API_KEY 필요, 1회)
+    python -m benchmarks.bench_pipeline --record
+
+    # 2) 오프라인 재생 벤치마크 (원래 지연 그대로 / 지연 없이 CPU 비용만)
+    python -m benchmarks.bench_pipeline --save-baseline
+    python -m benchmarks.bench_pipeline --compare --latency-scale 0
+"""
+
+import argparse
+import asyncio
+import json
+import statistics
+import sys
+import time
+from pathlib import Path
+
+from app.services.category_flow_executor import prepare_category_flow
+from app.services.category_recommendation_service import recommend_category
+from app.utils.session_manager import clear_session, update_session
+from benchmarks.harness import RESULTS_DIR, compare_results, format_us, save_results
+from chatbot_llm.llm_cassette import use_cassette
+from loadtest.payloads import PRODUCT_UTTERANCES
+
+DEFAULT_CASSETTE = Path(__file__).resolve().parent / "cassettes" / "pipeline.jsonl.gz"
+BENCH_USER_ID = "bench-pipeline-user"
+STAGE2_UTTERANCES = ("1", "3")
+
+
+# =====================================================
+# 1️⃣ 시나리오 실행
+# =====================================================
+async def run_scenario(utterance: str) -> tuple[dict, dict]:
+    """
+    stage 1 추천 → stage 2 매칭 1회 실행
+
+    Returns:
+        (timings, outputs): 단계별 지연(µs), 단계별 결과
+    """
+    timings, outputs = {}, {}
+
+    start = time.perf_counter()
+    recommended = await recommend_category(utterance)
+    timings["recommend_category"] = (time.perf_counter() - start) * 1e6
+    outputs["recommend_category"] = recommended
+
+    if not recommended or not recommended[0]:
+        return timings, outputs
+
+    for choice in STAGE2_UTTERANCES:
+        clear_session(BENCH_USER_ID)
+        update_session(BENCH_USER_ID, stage=2, user_utterance=utterance, bot_raw_result=recommended[1])
+        start = time.perf_counter()
+        flow = await prepare_category_flow(BENCH_USER_ID, choice)
+        timings[f"prepare_category_flow[{choice}]"] = (time.perf_counter() - start) * 1e6
+        outputs[f"prepare_category_flow[{choice}]"] = list(flow[1]) if flow and flow[0] else flow
+
+    return timings, outputs
+
+
+def summarize(samples: list[float]) -> dict:
+    """harness.measure 와 같은 모양의 결과 dict"""
+    return {
+        "loops": 1,
+        "repeat": len(samples),
+        "mean_us": statistics.fmean(samples),
+        "median_us": statistics.median(samples),
+        "stdev_us": statistics.stdev(samples) if len(samples) > 1 else 0.0,
+        "min_us": min(samples),
+    }
+
+
+async def run_all(utterances: list[str], rounds: int) -> tuple[dict, dict]:
+    samples: dict[str, list[float]] = {}
+    outputs: dict[str, dict] = {}
+    for _ in range(rounds):
+        for utterance in utterances:
+            timings, outs = await run_scenario(utterance)
+            for name, value in timings.items():
+                samples.setdefault(name, []).append(value)
+                samples.setdefault(f"{name}::{utterance}", []).append(value)
+            outputs[utterance] = json.loads(json.dumps(outs, ensure_ascii=False))
+    return {name: summarize(values) for name, values in samples.items()}, outputs
+
+
+# =====================================================
+# 2️⃣ CLI
+# =====================================================
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description="LLM 파이프라인 오프라인 벤치마크")
+    parser.add_argument("--cassette", type=Path, default=DEFAULT_CASSETTE)
+    parser.add_argument("--record", action="store_true", help="실제 OpenAI 호출 결과를 카세트에 녹화")
+    parser.add_argument("--latency-scale", type=float, default=1.0, help="재생 지연 배율 (0 = 지연 없음)")
+    parser.add_argument("--rounds", type=int, default=3, help="시나리오 반복 횟수 (record 시 1회)")
+    parser.add_argument("--baseline", type=Path, default=RESULTS_DIR / "pipeline_baseline.json")
+    parser.add_argument("--save-baseline", action="store_true")
+    parser.add_argument("--compare", action="store_true")
+    parser.add_argument("--threshold", type=float, default=10.0)
+    args = parser.parse_args(argv)
+
+    mode = "record" if args.record else "replay"
+    rounds = 1 if args.record else args.rounds
+    print(f"🎞️ 카세트 {mode}: {args.cassette} (latency x{args.latency_scale})")
+
+    with use_cassette(args.cassette, mode=mode, latency_scale=args.latency_scale):
+        results, outputs = asyncio.run(run_all(list(PRODUCT_UTTERANCES), rounds))
+
+    for name, r in results.items():
+        if "::" not in name:
+            print(f"  {name:<40} p50 {format_us(r['median_us']):>10}  mean {format_us(r['mean_us']):>10}  n={r['repeat']}")
+
+    if args.record:
+        print(f"💾 녹화 완료: {args.cassette}")
+        return 0
+
+    exit_code = 0
+    if args.compare and args.baseline.exists():
+        baseline = json.loads(args.baseline.read_text(encoding="utf-8"))
+        if compare_results(baseline["results"], results, args.threshold):
+            exit_code = 1
+        changed = [u for u, out in outputs.items() if baseline.get("outputs", {}).get(u) != out]
+        if changed:
+            print(f"\n❌ 출력이 baseline 과 다른 시나리오 {len(changed)}개:")
+            for utterance in changed:
+                print(f"  - {utterance}")
+            exit_code = 1
+    elif args.compare:
+        print(f"⚠️ baseline 파일이 없습니다: {args.baseline}")
+
+    if args.save_baseline:
+        save_results(args.baseline, "pipeline", results, extra={"outputs": outputs})
+
+    return exit_code
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,117 @@
+"""
+bench_serializer.py
+──────────────────────────────
+- JSON 백엔드별 인코딩/디코딩 시간과 결과 크기 비교
+  (기존 방식: 표준 json + indent=2 + ensure_ascii=False)
+- 데이터: storage/category_structure*.json, storage/category_spec/*.json,
+  tokens.json 형태 샘플, webhook 응답(make_kakao_response 형태)
+
+📌 실행 예
+    python -m benchmarks.bench_serializer
+"""
+
+import json
+from pathlib import Path
+
+from benchmarks.harness import format_us, measure
+
+PROJECT_ROOT = Path(__file__).resolve().parent.parent
+STORAGE_DIR = PROJECT_ROOT / "storage"
+
+
+# =====================================================
+# 1️⃣ 데이터
+# =====================================================
+def load_datasets() -> dict:
+    datasets = {}
+    for name in ("category_structure", "category_structure_keys", "category_structure_prompt"):
+        with open(STORAGE_DIR / f"{name}.json", encoding="utf-8") as f:
+            datasets[f"{name}.json"] = json.load(f)
+
+    spec_files = sorted((STORAGE_DIR / "category_spec").glob("*.json"))
+    if spec_files:
+        with open(spec_files[0], encoding="utf-8") as f:
+            datasets[f"category_spec/{spec_files[0].name}"] = json.load(f)
+    else:
+        # 저장된 스펙이 없으면 nav 형태 스펙을 카탈로그에서 구성 (crawl_spec_options 의 nav 결과와 같은 모양)
+        structure = datasets["category_structure.json"]
+        top = next(iter(structure))
+        mid = next(iter(structure[top]))
+        datasets["category_spec (nav 샘플)"] = {
+            "url": structure[top][mid][0][1],
+            "data": {"nav": {name: url for name, url in structure[top][mid]}},
+        }
+
+    datasets["tokens.json (1,000명)"] = {
+        f"user-{i:04d}": {
+            "access_token": "a" * 54,
+            "refresh_token": "r" * 54,
+            "expires_at": "2025-07-11T12:00:00+00:00",
+            "failed": False,
+            "just_authenticated": False,
+        }
+        for i in range(1000)
+    }
+
+    keys = datasets["category_structure_keys.json"]["컴퓨터 · 노트북 · 조립PC"]
+    lines = ["추천 결과입니다:"] + [f"{i}. {d}" for i, d in enumerate(keys["노트북"], 1)]
+    datasets["webhook 응답"] = {
+        "version": "2.0",
+        "template": {"outputs": [{"simpleText": {"text": "\n".join(lines)}}]},
+    }
+    return datasets
+
+
+# =====================================================
+# 2️⃣ 백엔드
+# =====================================================
+def load_backends() -> dict:
+    backends = {
+        "json indent=2 (기존)": (
+            lambda o: json.dumps(o, ensure_ascii=False, indent=2).encode("utf-8"),
+            json.loads,
+        ),
+        "json compact": (
+            lambda o: json.dumps(o, ensure_ascii=False, separators=(",", ":")).encode("utf-8"),
+            json.loads,
+        ),
+    }
+    try:
+        import orjson
+        backends["orjson"] = (orjson.dumps, orjson.loads)
+        backends["orjson indent=2"] = (lambda o: orjson.dumps(o, option=orjson.OPT_INDENT_2), orjson.loads)
+    except ImportError:
+        print("ℹ️ orjson 미설치 → 생략")
+    try:
+        import msgspec
+        backends["msgspec"] = (msgspec.json.encode, msgspec.json.decode)
+    except ImportError:
+        print("ℹ️ msgspec 미설치 → 생략")
+    return backends
+
+
+# =====================================================
+# 3️⃣ 실행
+# =====================================================
+def main() -> None:
+    datasets = load_datasets()
+    backends = load_backends()
+
+    for data_name, obj in datasets.items():
+        print(f"\n📦 {data_name}")
+        print(f"  {'backend':<24}{'encode':>12}{'decode':>12}{'size':>12}")
+        base_size = None
+        for backend_name, (encode, decode) in backends.items():
+            encoded = encode(obj)
+            enc = measure(lambda: encode(obj), repeat=5, min_time=0.02)
+            dec = measure(lambda: decode(encoded), repeat=5, min_time=0.02)
+            base_size = base_size or len(encoded)
+            ratio = len(encoded) / base_size * 100
+            print(
+                f"  {backend_name:<24}{format_us(enc['median_us']):>12}{format_us(dec['median_us']):>12}"
+                f"{len(encoded):>9,} B ({ratio:.0f}%)"
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,186 @@
+"""
+bench_spec_search.py
+──────────────────────────────
+- 전문 검색 색인(app/utils/spec_search.py) 성능: 전체 카테고리(storage/category_structure.json 1,475개) 기준
+- 카테고리마다 합성 스펙 생성 (고정 seed — 80% 제조사/브랜드 옵션, 20% nav) → 임시 디렉터리의 spec_store + 색인
+- 측정
+  1. 전체 색인 시간 (update_many 일괄) / 저장 1건당 증분 갱신 시간 (save_category_spec 경로)
+  2. 질의별 검색 시간 (브랜드 · 부분 문자열 · 영문 · 초성 · 카테고리명)
+  3. 비교: 색인 없이 spec_store 전체를 읽어 부분 문자열 검색 (기존 방식)
+  4. 정확도: 스캔 결과(값에 질의 포함) 대비 색인 상위 K 재현율
+
+📌 실행 예
+    python -m benchmarks.bench_spec_search
+    python -m benchmarks.bench_spec_search --json
+"""
+
+import argparse
+import json
+import random
+import statistics
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+from app.utils.spec_search import CHOSEONG_SET, SpecSearchIndex, normalize, to_choseong
+from app.utils.spec_store import SpecStore
+from benchmarks.harness import format_us, measure
+
+PROJECT_ROOT = Path(__file__).resolve().parent.parent
+CATEGORY_JSON_PATH = PROJECT_ROOT / "storage" / "category_structure.json"
+
+MANUFACTURERS = [
+    "삼성전자", "LG전자", "애플", "레노버", "ASUS", "에이서", "MSI", "HP", "델", "마이크로소프트", "소니", "캐논",
+    "니콘", "필립스", "다이슨", "샤오미", "쿠쿠전자", "쿠첸", "위닉스", "코웨이", "SK매직", "대유위니아", "신일전자",
+    "한일전기", "보국전자", "로지텍", "레이저", "커세어", "앱코", "한성컴퓨터", "주연테크", "카카오프렌즈",
+    "락앤락", "해피콜", "테팔", "브라운", "파나소닉", "보쉬", "블랙앤데커", "아이리버", "JBL", "보스", "젠하이저",
+    "오디오테크니카", "나이키", "아디다스", "뉴발란스", "아식스", "노스페이스", "콜맨", "코베아", "스노우피크",
+    "로얄캐닌", "하림펫푸드", "오리젠", "매일유업", "남양유업", "CJ제일제당", "오뚜기", "농심",
+]
+BRANDS = [
+    "갤럭시", "갤럭시북", "그램", "맥북", "아이패드", "씽크패드", "젠북", "ROG", "프레데터", "스텔스", "스펙터",
+    "서피스", "엑스페리아", "EOS", "쿨픽스", "휴", "V15", "미지아", "트윈프레셔", "에어로", "뽀송", "아이콘",
+    "올클린", "휘센", "비스포크", "오브제", "G502", "MX", "블랙위도우", "K70", "해커", "TFG", "리얼팩", "비스프",
+    "에어프라이어", "오랄비", "루믹스", "크루저", "플립", "퀴이어트컴포트", "모멘텀", "에어맥스", "울트라부스트",
+    "프레시폼", "젤카야노", "눕시", "웨더마스터", "알파인", "오리지널", "앱솔루트", "비타민", "햇반", "진라면",
+    "신라면", "안성탕면", "짜파게티", "프로플랜", "인스팅트", "퓨리나", "나우", "아카나",
+]
+
+QUERIES = [
+    ("브랜드", "갤럭시북", None),
+    ("제조사", "삼성전자", "value"),
+    ("부분 문자열", "삼성", None),
+    ("영문", "logitech g502", None),
+    ("초성", "ㅅㅅㅈㅈ", None),
+    ("카테고리명", "게이밍 노트북", None),
+    ("없는 값", "존재하지않는브랜드", None),
+]
+
+
+# =====================================================
+# 1️⃣ 합성 데이터
+# =====================================================
+def load_categories() -> list[tuple[str, str, str]]:
+    """(중간 카테고리, 세부 항목명, URL) 전체"""
+    with open(CATEGORY_JSON_PATH, encoding="utf-8") as f:
+        structure = json.load(f)
+    return [(mid, detail, url) for mids in structure.values() for mid, details in mids.items() for detail, url in details]
+
+
+def synthesize_specs(categories: list[tuple[str, str, str]], seed: int = 42) -> list[tuple]:
+    """카테고리마다 extract_spec_options() 와 같은 모양의 합성 스펙"""
+    rng = random.Random(seed)
+    siblings: dict[str, list[str]] = {}
+    for mid, detail, _ in categories:
+        siblings.setdefault(mid, []).append(detail)
+
+    rows = []
+    for mid, detail, url in categories:
+        if rng.random() < 0.2:
+            names = [name for name in siblings[mid] if name != detail][:12] or [detail]
+            data = {"nav": {name: f"{url}&sub={i}" for i, name in enumerate(names)}}
+        else:
+            data = {
+                "제조사": sorted(rng.sample(MANUFACTURERS, rng.randint(5, 15))),
+                "브랜드": sorted(rng.sample(BRANDS, rng.randint(5, 15))),
+            }
+        rows.append((url, detail, data, mid))
+    return rows
+
+
+# =====================================================
+# 2️⃣ 측정
+# =====================================================
+def scan_search(store: SpecStore, query: str) -> list[str]:
+    """색인 없이 전체 행을 읽어 값 / 이름(색인과 같은 필드)에 질의가 포함된 URL 목록 (기존 방식)"""
+    norm_query = normalize(query)
+    initials_only = bool(norm_query) and all(ch in CHOSEONG_SET for ch in norm_query)
+    hits = []
+    for record in store.iter_all():
+        texts = [record["detail_name"], record["mid_key"] or ""]
+        for attr, values in record["data"].items():
+            texts.extend(values if isinstance(values, (list, dict)) else [])
+        for text in texts:
+            norm_text = normalize(text)
+            if norm_query in (to_choseong(norm_text) if initials_only else norm_text):
+                hits.append(record["url"])
+                break
+    return hits
+
+
+def run(workdir: Path) -> dict:
+    categories = load_categories()
+    rows = synthesize_specs(categories)
+
+    store = SpecStore(workdir / "spec.sqlite3")
+    store.put_many([(url, detail, data, mid, None) for url, detail, data, mid in rows])
+    index = SpecSearchIndex(workdir / "search.sqlite3")
+
+    start = time.perf_counter()
+    index.update_many(rows)
+    build_s = time.perf_counter() - start
+
+    # 저장 1건당 증분 갱신 (save_category_spec 과 같은 단건 트랜잭션)
+    rng = random.Random(7)
+    update_us = []
+    for url, detail, data, mid in rng.sample(rows, 100):
+        start = time.perf_counter()
+        index.update(url, detail, data, mid)
+        update_us.append((time.perf_counter() - start) * 1e6)
+
+    queries = []
+    for label, text, field in QUERIES:
+        timing = measure(lambda: index.search(text, 10, field), repeat=5, min_time=0.05)
+        expected = scan_search(store, text)
+        found = index.search(text, max(len(expected), 1), field) if expected else []
+        recall = len({r["url"] for r in found} & set(expected)) / len(expected) if expected else 1.0
+        queries.append({
+            "label": label, "query": text, "field": field, "median_us": timing["median_us"],
+            "expected": len(expected), "recall": recall,
+        })
+
+    scan = measure(lambda: scan_search(store, "갤럭시북"), repeat=3, min_time=0.0)
+    stats = index.stats()
+    store.close()
+    index.close()
+    return {
+        "categories": len(categories),
+        "docs": stats["docs"],
+        "terms": stats["terms"],
+        "postings": stats["postings"],
+        "index_bytes": stats["bytes"],
+        "build_s": build_s,
+        "update_median_us": statistics.median(update_us),
+        "queries": queries,
+        "scan_median_us": scan["median_us"],
+    }
+
+
+# =====================================================
+# 3️⃣ CLI
+# =====================================================
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description="스펙 전문 검색 색인 벤치마크 (전체 카테고리)")
+    parser.add_argument("--json", action="store_true", help="결과를 JSON 으로 출력")
+    args = parser.parse_args(argv)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        result = run(Path(tmp))
+
+    if args.json:
+        print(json.dumps(result, ensure_ascii=False, indent=2))
+        return 0
+
+    print(f"📚 카테고리 {result['categories']:,}개 → 문서 {result['docs']:,}개 (중복 URL 병합)")
+    print(f"  용어 {result['terms']:,}개 · posting {result['postings']:,}개 · {result['index_bytes'] / 1024:.0f}KB")
+    print(f"  전체 색인 {result['build_s']:.2f}s · 증분 갱신 p50 {format_us(result['update_median_us'])}")
+    print(f"\n  {'질의':<12}{'검색어':<20}{'p50':>12}{'정답 수':>10}{'재현율':>10}")
+    for q in result["queries"]:
+        print(f"  {q['label']:<12}{q['query']:<20}{format_us(q['median_us']):>12}{q['expected']:>10}{q['recall']:>10.0%}")
+    print(f"\n  색인 없이 전체 스캔 ('갤럭시북'): {format_us(result['scan_median_us'])}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
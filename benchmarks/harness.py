@@ -0,0 +1,181 @@
+"""
+harness.py
+──────────────────────────────
+- 마이크로벤치마크 공용 하네스 (pyperf / pytest-benchmark 스타일, 외부 의존성 없음)
+- 호출 횟수를 자동 보정(autorange)한 뒤 여러 번 반복 측정해 1회당 시간을 기록
+- 결과를 JSON baseline으로 저장하고, 이후 실행과 비교해 % 단위 회귀를 표시
+
+📌 사용 예
+    suite = BenchSuite("hot_path")
+    suite.add("sanitize_filename", lambda: sanitize_filename("세차/와이퍼/방향제"))
+    run_cli(suite)   # --save-baseline / --compare / --threshold / --filter
+"""
+
+import argparse
+import gc
+import json
+import platform
+import statistics
+import sys
+import time
+from pathlib import Path
+from typing import Callable, Optional
+
+RESULTS_DIR = Path(__file__).resolve().parent / "results"
+
+
+# =====================================================
+# 1️⃣ 측정
+# =====================================================
+def _autorange(fn: Callable[[], object], min_time: float) -> int:
+    """1회 측정 구간이 min_time 이상이 되도록 반복 횟수 결정"""
+    loops = 1
+    while True:
+        start = time.perf_counter()
+        for _ in range(loops):
+            fn()
+        if time.perf_counter() - start >= min_time or loops >= 10_000_000:
+            return loops
+        loops *= 2
+
+
+def measure(fn: Callable[[], object], repeat: int = 7, min_time: float = 0.05) -> dict:
+    """
+    fn 1회 호출 시간 측정
+
+    Returns:
+        dict: {"loops", "repeat", "mean_us", "median_us", "stdev_us", "min_us"}
+    """
+    fn()  # 워밍업
+    loops = _autorange(fn, min_time)
+    samples = []
+    gc_enabled = gc.isenabled()
+    gc.disable()
+    try:
+        for _ in range(repeat):
+            start = time.perf_counter()
+            for _ in range(loops):
+                fn()
+            samples.append((time.perf_counter() - start) / loops * 1e6)
+    finally:
+        if gc_enabled:
+            gc.enable()
+    return {
+        "loops": loops,
+        "repeat": repeat,
+        "mean_us": statistics.fmean(samples),
+        "median_us": statistics.median(samples),
+        "stdev_us": statistics.stdev(samples) if len(samples) > 1 else 0.0,
+        "min_us": min(samples),
+    }
+
+
+# =====================================================
+# 2️⃣ 스위트
+# =====================================================
+class BenchSuite:
+    def __init__(self, name: str):
+        self.name = name
+        self.benchmarks: dict[str, Callable[[], object]] = {}
+
+    def add(self, name: str, fn: Callable[[], object]) -> None:
+        if name in self.benchmarks:
+            raise ValueError(f"중복된 벤치마크 이름: {name}")
+        self.benchmarks[name] = fn
+
+    def run(self, name_filter: Optional[str] = None, repeat: int = 7, min_time: float = 0.05) -> dict:
+        results = {}
+        for name, fn in self.benchmarks.items():
+            if name_filter and name_filter not in name:
+                continue
+            results[name] = measure(fn, repeat=repeat, min_time=min_time)
+            r = results[name]
+            print(f"  {name:<55} {format_us(r['median_us']):>12} ± {format_us(r['stdev_us'])}")
+        return results
+
+
+def format_us(value: float) -> str:
+    if value >= 1e6:
+        return f"{value / 1e6:.2f} s"
+    if value >= 1e3:
+        return f"{value / 1e3:.2f} ms"
+    return f"{value:.2f} µs"
+
+
+# =====================================================
+# 3️⃣ baseline 저장 / 비교
+# =====================================================
+def default_baseline_path(suite_name: str) -> Path:
+    return RESULTS_DIR / f"{suite_name}_baseline.json"
+
+
+def save_results(path: Path, suite_name: str, results: dict, extra: Optional[dict] = None) -> None:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    payload = {
+        "suite": suite_name,
+        "created_at": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "python": sys.version.split()[0],
+        "machine": platform.platform(),
+        "results": results,
+        **(extra or {}),
+    }
+    path.write_text(json.dumps(payload, ensure_ascii=False, indent=2), encoding="utf-8")
+    print(f"💾 baseline 저장: {path}")
+
+
+def compare_results(baseline: dict, current: dict, threshold_pct: float) -> list[str]:
+    """
+    median 기준으로 baseline 대비 변화율 출력
+
+    Returns:
+        list[str]: threshold_pct 이상 느려진 벤치마크 이름
+    """
+    regressions = []
+    print(f"\n📈 baseline 대비 변화 (회귀 기준 +{threshold_pct:.0f}%)")
+    for name, result in current.items():
+        base = baseline.get(name)
+        if not base:
+            print(f"  {name:<55} (baseline 없음)")
+            continue
+        delta = (result["median_us"] - base["median_us"]) / base["median_us"] * 100
+        if delta >= threshold_pct:
+            mark = "❌ 회귀"
+            regressions.append(name)
+        elif delta <= -threshold_pct:
+            mark = "✅ 개선"
+        else:
+            mark = "  ="
+        print(f"  {name:<55} {format_us(base['median_us']):>12} → {format_us(result['median_us']):>12} {delta:+7.1f}% {mark}")
+    return regressions
+
+
+def run_cli(suite: BenchSuite, argv: Optional[list[str]] = None) -> int:
+    """
+    공통 CLI: 실행 → (선택) baseline 저장 / 비교
+    회귀가 있으면 종료 코드 1 반환 (CI 게이트 용도)
+    """
+    parser = argparse.ArgumentParser(description=f"{suite.name} 마이크로벤치마크")
+    parser.add_argument("--filter", help="이름에 이 문자열이 포함된 벤치마크만 실행")
+    parser.add_argument("--repeat", type=int, default=7)
+    parser.add_argument("--min-time", type=float, default=0.05, help="측정 구간 최소 시간(초)")
+    parser.add_argument("--baseline", type=Path, default=default_baseline_path(suite.name))
+    parser.add_argument("--save-baseline", action="store_true", help="이번 결과를 baseline으로 저장")
+    parser.add_argument("--compare", action="store_true", help="baseline과 비교해 회귀 표시")
+    parser.add_argument("--threshold", type=float, default=10.0, help="회귀로 판단할 %% (기본 10)")
+    args = parser.parse_args(argv)
+
+    print(f"⏱️ {suite.name} 벤치마크 실행")
+    results = suite.run(args.filter, repeat=args.repeat, min_time=args.min_time)
+
+    regressions = []
+    if args.compare:
+        if not args.baseline.exists():
+            print(f"⚠️ baseline 파일이 없습니다: {args.baseline}")
+        else:
+            baseline = json.loads(args.baseline.read_text(encoding="utf-8"))["results"]
+            regressions = compare_results(baseline, results, args.threshold)
+
+    if args.save_baseline:
+        save_results(args.baseline, suite.name, results)
+
+    return 1 if regressions else 0
@@ -0,0 +1,182 @@
+"""
+startup_profile.py
+──────────────────────────────
+- 서버 기동 비용 측정 (워커 부팅 / 오토스케일 아웃 시간)
+  1) 임포트 시간: `python -X importtime -c "import app.main"` 결과를 모듈별로 집계
+  2) 첫 요청까지 시간: uvicorn 프로세스 시작 → GET / 200 응답까지 (--serve)
+- 매번 새 인터프리터(subprocess)로 측정하므로 이미 로드된 모듈의 영향이 없음
+
+📌 실행 예
+    python -m benchmarks.startup_profile                  # 임포트 시간 상위 25개
+    python -m benchmarks.startup_profile --serve --runs 5 # + 첫 요청까지 시간
+    python -m benchmarks.startup_profile --module chatbot_llm.validate_llm --top 10
+"""
+
+import argparse
+import json
+import socket
+import statistics
+import subprocess
+import sys
+import time
+import urllib.error
+import urllib.request
+from pathlib import Path
+
+from benchmarks.harness import format_us
+
+PROJECT_ROOT = Path(__file__).resolve().parent.parent
+
+
+# =====================================================
+# 1️⃣ 임포트 시간
+# =====================================================
+def parse_importtime(stderr: str) -> list[dict]:
+    """
+    -X importtime 출력 파싱
+    형식: "import time: <self us> | <cumulative us> | <들여쓰기><모듈명>"
+
+    Returns:
+        list[dict]: [{"module", "self_us", "cumulative_us", "depth"}, …] (임포트 완료 순)
+    """
+    rows = []
+    for line in stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        parts = line.split("|")
+        if len(parts) != 3:
+            continue
+        name = parts[2][1:]  # 구분자 뒤 공백 1칸 제거 → 남은 들여쓰기 2칸 = 깊이 1
+        rows.append({
+            "module": name.strip(),
+            "self_us": int(parts[0].split(":", 1)[1]),
+            "cumulative_us": int(parts[1]),
+            "depth": (len(name) - len(name.lstrip())) // 2,
+        })
+    return rows
+
+
+def profile_imports(module: str) -> dict:
+    """
+    새 인터프리터에서 module 을 임포트하고 모듈별 임포트 시간 / 전체 wall time 반환
+    """
+    start = time.perf_counter()
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        cwd=PROJECT_ROOT,
+        capture_output=True,
+        text=True,
+    )
+    wall_us = (time.perf_counter() - start) * 1e6
+    if proc.returncode != 0:
+        tail = proc.stderr.strip().splitlines()[-1:] or ["(no output)"]
+        raise RuntimeError(f"❌ {module} 임포트 실패: {tail[0]}")
+
+    rows = parse_importtime(proc.stderr)
+    # 대상 모듈의 누적 시간 (site / encodings 등 인터프리터 기동 임포트 제외)
+    target = next((r for r in rows if r["module"] == module and r["depth"] == 0), None)
+    packages: dict[str, int] = {}
+    for r in rows:
+        root = r["module"].split(".", 1)[0]
+        packages[root] = packages.get(root, 0) + r["self_us"]
+
+    return {
+        "module": module,
+        "wall_us": wall_us,
+        "import_us": target["cumulative_us"] if target else sum(r["cumulative_us"] for r in rows if r["depth"] == 0),
+        "modules": len(rows),
+        "rows": rows,
+        "packages": dict(sorted(packages.items(), key=lambda kv: -kv[1])),
+    }
+
+
+# =====================================================
+# 2️⃣ 첫 요청까지 시간
+# =====================================================
+def _free_port() -> int:
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+def time_to_first_request(app_path: str, path: str = "/", timeout: float = 30.0) -> float:
+    """
+    uvicorn 워커 1개를 띄우고 첫 200 응답까지 걸린 시간(µs)
+    """
+    port = _free_port()
+    url = f"http://127.0.0.1:{port}{path}"
+    start = time.perf_counter()
+    proc = subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", app_path, "--host", "127.0.0.1", "--port", str(port), "--log-level", "warning"],
+        cwd=PROJECT_ROOT,
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.PIPE,
+    )
+    try:
+        while time.perf_counter() - start < timeout:
+            if proc.poll() is not None:
+                raise RuntimeError(f"❌ uvicorn 종료됨: {proc.stderr.read().decode(errors='replace')[-500:]}")
+            try:
+                with urllib.request.urlopen(url, timeout=1) as resp:
+                    if resp.status == 200:
+                        return (time.perf_counter() - start) * 1e6
+            except (urllib.error.URLError, ConnectionError, OSError):
+                time.sleep(0.005)
+        raise TimeoutError(f"❌ {timeout:.0f}초 안에 {url} 응답이 없습니다.")
+    finally:
+        proc.terminate()
+        try:
+            proc.wait(timeout=5)
+        except subprocess.TimeoutExpired:
+            proc.kill()
+
+
+# =====================================================
+# 3️⃣ CLI
+# =====================================================
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description="서버 기동 시간 프로파일링")
+    parser.add_argument("--module", default="app.main", help="임포트 시간을 측정할 모듈")
+    parser.add_argument("--top", type=int, default=25, help="누적 시간 상위 N개 모듈 출력")
+    parser.add_argument("--runs", type=int, default=3, help="반복 측정 횟수 (중앙값 보고)")
+    parser.add_argument("--serve", action="store_true", help="uvicorn 기동 → 첫 요청까지 시간도 측정")
+    parser.add_argument("--app", default="app.main:app", help="--serve 시 uvicorn 앱 경로")
+    parser.add_argument("--json", type=Path, help="결과를 JSON 파일로 저장")
+    args = parser.parse_args(argv)
+
+    profiles = [profile_imports(args.module) for _ in range(args.runs)]
+    profile = sorted(profiles, key=lambda p: p["import_us"])[len(profiles) // 2]
+
+    print(f"📦 import {args.module}: {format_us(profile['import_us'])} "
+          f"(모듈 {profile['modules']}개, 인터프리터 포함 wall {format_us(profile['wall_us'])}, {args.runs}회 중앙값)")
+
+    print(f"\n  {'cumulative':>12}{'self':>12}  module")
+    for r in sorted(profile["rows"], key=lambda r: -r["cumulative_us"])[:args.top]:
+        print(f"  {format_us(r['cumulative_us']):>12}{format_us(r['self_us']):>12}  {'  ' * r['depth']}{r['module']}")
+
+    print(f"\n  {'self 합계':>12}  최상위 패키지")
+    for name, total in list(profile["packages"].items())[:10]:
+        print(f"  {format_us(total):>12}  {name}")
+
+    result = {
+        "module": args.module,
+        "import_us": profile["import_us"],
+        "wall_us": profile["wall_us"],
+        "modules": profile["modules"],
+        "packages": profile["packages"],
+    }
+
+    if args.serve:
+        samples = [time_to_first_request(args.app) for _ in range(args.runs)]
+        result["first_request_us"] = statistics.median(samples)
+        print(f"\n🚀 {args.app} 기동 → 첫 요청: {format_us(result['first_request_us'])} "
+              f"(min {format_us(min(samples))}, {args.runs}회 중앙값)")
+
+    if args.json:
+        args.json.write_text(json.dumps(result, ensure_ascii=False, indent=2), encoding="utf-8")
+        print(f"💾 저장: {args.json}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
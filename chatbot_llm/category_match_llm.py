@@ -5,40 +5,96 @@ category_match_llm.py
   LLM에게 중간 키워드 + 세부 항목 매칭을 요청하고 결과를 반환
 """
 
-import os
 import json
+import re
 from pathlib import Path
-from dotenv import load_dotenv
-from openai import AsyncOpenAI
+from typing import Optional
+from chatbot_llm.llm_client import create_chat_completion
+from chatbot_llm.llm_router import LLM_MODEL_DEFAULT, route_llm_call
+from chatbot_llm.prompt_loader import load_prompt
+from chatbot_llm.prompt_budget import PROMPT_BUDGET_CATEGORY_MATCH, build_category_lines
 import ast
 
 # =====================================================
-# 환경 설정 & OpenAI 클라이언트
+# 환경 설정 (OpenAI 클라이언트는 llm_client 에서 첫 호출 시 생성)
 # =====================================================
-load_dotenv()
-openai = AsyncOpenAI(api_key=os.getenv("OPENAI_API_KEY"))
 
 PROJECT_ROOT = Path(__file__).resolve().parent.parent
 PROMPT_DIR = PROJECT_ROOT / "prompts"
 
+NUMBER_PATTERN = re.compile(r"(\d+)\s*번?")
+FAST_TIER_MAX_CANDIDATES = 40  # 후보가 이보다 많으면 빠른 모델을 건너뛰고 기본 모델 사용
+
 # =====================================================
 # 유틸 함수
 # =====================================================
 def load_text_file(path: Path) -> str:
-    with open(path, "r", encoding="utf-8") as f:
-        return f.read().strip()
+    return load_prompt(path)  # mtime 기준 메모리 캐시 (prompt_loader.py)
+
+
+def _candidate_pairs(bot_raw_result: dict) -> list[tuple[str, str]]:
+    """추천 메시지에 표시된 순서(1-based 번호 순)의 (중간키, 세부항목) 목록"""
+    return [(mid_key, detail) for mid_key, details in bot_raw_result.items() for detail in details]
+
+
+def _normalize(text: str) -> str:
+    return re.sub(r"\s+", "", text).lower()
+
+
+def resolve_category_match_locally(utterance: str, bot_raw_result: dict) -> Optional[list]:
+    """
+    LLM 없이 확실하게 결정할 수 있는 입력 처리
+    - 번호 입력("3", "3번"): 프롬프트의 인덱싱 규칙과 같은 방식으로 선택
+    - 세부 항목명을 정확히 입력(공백/대소문자 무시)했고 해당 항목이 하나뿐인 경우
+
+    Returns:
+        list | None: category_match 결과 형식, 애매하면 None (LLM 으로 승격)
+    """
+    if not isinstance(bot_raw_result, dict):
+        return None
+    pairs = _candidate_pairs(bot_raw_result)
+    text = utterance.strip()
+
+    number = NUMBER_PATTERN.fullmatch(text)
+    if number:
+        index = int(number.group(1))
+        if 1 <= index <= len(pairs):
+            return [True, list(pairs[index - 1])]
+        return [False, f"죄송합니다. 1~{len(pairs)} 사이의 번호를 입력해 주세요."]
+
+    key = _normalize(text)
+    matches = [pair for pair in pairs if _normalize(pair[1]) == key]
+    if len(matches) == 1:
+        return [True, list(matches[0])]
+    return None
+
+
+def is_valid_match(result: list, bot_raw_result: dict) -> bool:
+    """성공 결과이면서 (중간키, 세부항목)이 실제 후보 목록에 있는지"""
+    try:
+        mid_key, detail_key = result[1]
+        return result[0] is True and detail_key in bot_raw_result.get(mid_key, [])
+    except (TypeError, ValueError, IndexError, AttributeError):
+        return False
 
 
 # =====================================================
 # LLM 호출
 # =====================================================
-async def _call_category_match_llm(utterance: str, bot_raw_result: dict) -> list:
+async def _call_category_match_llm(utterance: str, bot_raw_result: dict, model: str = LLM_MODEL_DEFAULT) -> list:
     """
     OpenAI를 호출해 사용자 입력과 bot_raw_result를 비교하여
     중간 키워드 + 세부 항목 쌍을 반환하거나 실패 메시지를 반환
     """
-    # 🔷 bot_raw_result를 문자열로 변환
-    bot_raw_str = json.dumps(bot_raw_result, ensure_ascii=False, indent=2)
+    # 🔷 bot_raw_result를 "중간키: 세부1, 세부2, …" 형식으로 변환
+    #    (번호 입력은 전체 순서에 의존하므로 예산을 적용하지 않고, 나머지도 순서는 유지)
+    if isinstance(bot_raw_result, dict):
+        budget = 0 if NUMBER_PATTERN.fullmatch(utterance.strip()) else PROMPT_BUDGET_CATEGORY_MATCH
+        bot_raw_str, _ = build_category_lines(
+            bot_raw_result, utterance, budget=budget, keep_order=True, module="category_match"
+        )
+    else:
+        bot_raw_str = json.dumps(bot_raw_result, ensure_ascii=False)
 
     # 🔷 프롬프트 로드
     system_prompt = load_text_file(PROMPT_DIR / "category_match_system_prompt.txt")
@@ -50,8 +106,9 @@ async def _call_category_match_llm(utterance: str, bot_raw_result: dict) -> list
 
     # 🔷 LLM 호출
     try:
-        response = await openai.chat.completions.create(
-            model="gpt-4o-mini",
+        response = await create_chat_completion(
+            "category_match",
+            model=model,
             messages=[
                 {"role": "system", "content": system_prompt},
                 {"role": "user", "content": user_prompt}
@@ -94,9 +151,16 @@ async def _call_category_match_llm(utterance: str, bot_raw_result: dict) -> list
 # =====================================================
 async def category_match(utterance: str, bot_raw_result: dict) -> list:
     """
-    외부에서 호출하는 함수: 동기 → 비동기 실행
+    외부에서 호출하는 함수: 규칙 기반 → (빠른 모델) → 기본 모델 순으로 매칭
     """
-    return await _call_category_match_llm(utterance, bot_raw_result)
+    candidates = len(_candidate_pairs(bot_raw_result)) if isinstance(bot_raw_result, dict) else 0
+    return await route_llm_call(
+        "category_match",
+        remote=lambda model: _call_category_match_llm(utterance, bot_raw_result, model),
+        local=lambda: resolve_category_match_locally(utterance, bot_raw_result),
+        accept=lambda result: is_valid_match(result, bot_raw_result),
+        fast_eligible=0 < candidates <= FAST_TIER_MAX_CANDIDATES,
+    )
 
 
 # =====================================================
@@ -5,34 +5,56 @@ affirmative_llm.py
   LLM에게 긍정 여부를 판별하도록 요청하고 결과를 반환
 """
 
-import os
 from pathlib import Path
-from dotenv import load_dotenv
-from openai import AsyncOpenAI
+from typing import Optional
+from chatbot_llm.llm_client import create_chat_completion
+from chatbot_llm.llm_router import LLM_MODEL_DEFAULT, route_llm_call
+from chatbot_llm.prompt_loader import load_prompt
 
 # =====================================================
-# 환경 설정 & OpenAI 클라이언트
+# 환경 설정 (OpenAI 클라이언트는 llm_client 에서 첫 호출 시 생성)
 # =====================================================
-load_dotenv()
-openai = AsyncOpenAI(api_key=os.getenv("OPENAI_API_KEY"))
 
 PROJECT_ROOT = Path(__file__).resolve().parent.parent
 PROMPT_DIR = PROJECT_ROOT / "prompts"
 
+# 프롬프트 규칙과 같은 판단을 LLM 없이 내릴 수 있는 확실한 응답 (소문자, 앞뒤 공백/마침표 제거 후 비교)
+LOCAL_YES = {
+    "응", "그래", "좋아", "좋아요", "진행해", "진행해줘", "진행해주세요", "확인", "ㅇㅇ", "ㅇㅋ", "넵", "네", "넹",
+    "네네", "예", "ok", "okay", "오케이", "해줘", "해주세요", "부탁해", "부탁해요", "웅", "yes", "yep", "yeah",
+    "sure", "true", "go ahead", "sounds good", "y",
+}
+LOCAL_NO = {
+    "아니", "아니요", "아니오", "아니야", "취소", "아직", "노", "다른 거", "no", "nope", "not yet", "cancel",
+    "false", "wrong",
+}
+
 # =====================================================
 # 유틸 함수
 # =====================================================
 def load_text_file(path: Path) -> str:
-    with open(path, "r", encoding="utf-8") as f:
-        return f.read().strip()
+    return load_prompt(path)  # mtime 기준 메모리 캐시 (prompt_loader.py)
+
+
+def resolve_affirmative_locally(utterance: str) -> Optional[bool]:
+    """
+    목록에 있는 짧은 응답이면 True/False, 애매하면 None (LLM 으로 승격)
+    """
+    normalized = utterance.strip().strip(".!~").strip().lower()
+    if normalized in LOCAL_YES:
+        return True
+    if normalized in LOCAL_NO:
+        return False
+    return None
 
 
 # =====================================================
 # LLM 호출
 # =====================================================
-async def _call_affirmative_llm(utterance: str) -> bool:
+async def _call_affirmative_llm(utterance: str, model: str = LLM_MODEL_DEFAULT) -> Optional[bool]:
     """
     OpenAI를 호출해 사용자 입력이 긍정인지 아닌지를 판별합니다.
+    (YES/NO 로 답하지 않았거나 호출에 실패하면 None)
     """
     # 🔷 프롬프트 로드
     system_prompt = load_text_file(PROMPT_DIR / "is_affirmative_system_prompt.txt")
@@ -41,8 +63,9 @@ async def _call_affirmative_llm(utterance: str) -> bool:
 
     # 🔷 LLM 호출
     try:
-        response = await openai.chat.completions.create(
-            model="gpt-4o-mini",
+        response = await create_chat_completion(
+            "is_affirmative",
+            model=model,
             messages=[
                 {"role": "system", "content": system_prompt},
                 {"role": "user", "content": user_prompt}
@@ -51,7 +74,7 @@ async def _call_affirmative_llm(utterance: str) -> bool:
         )
     except Exception as e:
         print(f"❌ OpenAI API 호출 실패: {e}")
-        return False
+        return None
 
     content = response.choices[0].message.content.strip()
 
@@ -62,7 +85,11 @@ async def _call_affirmative_llm(utterance: str) -> bool:
             content = content.split("\n", 1)[-1].strip()
 
     # 긍정 판단
-    return content.upper().startswith("YES")
+    if content.upper().startswith("YES"):
+        return True
+    if content.upper().startswith("NO"):
+        return False
+    return None
 
 
 # =====================================================
@@ -70,9 +97,15 @@ async def _call_affirmative_llm(utterance: str) -> bool:
 # =====================================================
 async def is_affirmative(utterance: str) -> bool:
     """
-    외부에서 호출하는 함수: 동기 → 비동기 실행
+    외부에서 호출하는 함수: 규칙 기반 → (빠른 모델) → 기본 모델 순으로 판별
     """
-    return await _call_affirmative_llm(utterance)
+    result = await route_llm_call(
+        "is_affirmative",
+        remote=lambda model: _call_affirmative_llm(utterance, model),
+        local=lambda: resolve_affirmative_locally(utterance),
+        accept=lambda answer: answer is not None,
+    )
+    return bool(result)
 
 
 # =====================================================
@@ -0,0 +1,165 @@
+"""
+llm_cassette.py
+──────────────────────────────
+- LLM 호출 녹화(record) / 재생(replay) 레이어
+- 요청 fingerprint(model + messages + 파라미터 해시) → 응답(content, usage, latency)을
+  gzip 압축 JSONL 카세트 파일에 기록
+- replay 모드에서는 실제 OpenAI 대신 카세트 응답을 원래(또는 배율 조정된) 지연 시간으로 반환
+
+📌 환경 변수
+- LLM_CASSETTE_MODE          : off | record | replay | replay_or_record (기본 off)
+- LLM_CASSETTE_PATH          : 카세트 파일 경로 (기본 storage/llm_cassette.jsonl.gz)
+- LLM_REPLAY_LATENCY_SCALE   : 재생 지연 배율 (1.0 = 원래 지연, 0 = 지연 없음)
+
+📌 코드에서 사용
+    with use_cassette("bench.jsonl.gz", mode="replay", latency_scale=1.0):
+        await recommend_category("게이밍 노트북")
+"""
+
+import gzip
+import hashlib
+import json
+import os
+import threading
+from contextlib import contextmanager
+from pathlib import Path
+from types import SimpleNamespace
+from typing import Iterator, Optional
+
+# =====================================================
+# 0️⃣ 전역 설정
+# =====================================================
+PROJECT_ROOT = Path(__file__).resolve().parent.parent
+
+MODES = ("off", "record", "replay", "replay_or_record")
+
+
+class CassetteMiss(LookupError):
+    """replay 모드에서 카세트에 없는 요청을 받았을 때"""
+
+
+class Cassette:
+    def __init__(self, path: Path, mode: str = "off", latency_scale: float = 1.0):
+        if mode not in MODES:
+            raise ValueError(f"지원하지 않는 카세트 모드입니다: {mode}")
+        self.path = Path(path)
+        self.mode = mode
+        self.latency_scale = latency_scale
+        self._entries: Optional[dict[str, list[dict]]] = None
+        self._cursor: dict[str, int] = {}
+        self._lock = threading.Lock()
+
+    # -------------------------------------------------
+    # 조회 / 기록
+    # -------------------------------------------------
+    @property
+    def replaying(self) -> bool:
+        return self.mode in ("replay", "replay_or_record")
+
+    @property
+    def recording(self) -> bool:
+        return self.mode in ("record", "replay_or_record")
+
+    def _load(self) -> dict[str, list[dict]]:
+        if self._entries is None:
+            entries: dict[str, list[dict]] = {}
+            if self.path.exists():
+                with gzip.open(self.path, "rt", encoding="utf-8") as f:
+                    for line in f:
+                        if line.strip():
+                            entry = json.loads(line)
+                            entries.setdefault(entry["fp"], []).append(entry)
+            self._entries = entries
+        return self._entries
+
+    def lookup(self, fp: str) -> Optional[dict]:
+        """같은 fingerprint 가 여러 번 녹화되었으면 순서대로 순환하며 반환"""
+        with self._lock:
+            candidates = self._load().get(fp)
+            if not candidates:
+                return None
+            idx = self._cursor.get(fp, 0)
+            self._cursor[fp] = idx + 1
+            return candidates[idx % len(candidates)]
+
+    def record(self, fp: str, module: str, model: str, response, latency: float) -> None:
+        usage = getattr(response, "usage", None)
+        entry = {
+            "fp": fp,
+            "module": module,
+            "model": model,
+            "content": response.choices[0].message.content,
+            "usage": [
+                getattr(usage, "prompt_tokens", 0) or 0,
+                getattr(usage, "completion_tokens", 0) or 0,
+            ] if usage is not None else None,
+            "latency": round(latency, 4),
+        }
+        line = json.dumps(entry, ensure_ascii=False, separators=(",", ":")) + "\n"
+        with self._lock:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            with gzip.open(self.path, "at", encoding="utf-8") as f:  # gzip 멤버 단위 append
+                f.write(line)
+            if self._entries is not None:
+                self._entries.setdefault(fp, []).append(entry)
+
+
+# =====================================================
+# 1️⃣ fingerprint / 응답 복원
+# =====================================================
+def fingerprint(kwargs: dict) -> str:
+    """
+    chat.completions.create 인자를 정규화해 해시 (순서 무관, 한글 그대로)
+    """
+    canonical = json.dumps(kwargs, ensure_ascii=False, sort_keys=True, separators=(",", ":"), default=str)
+    return hashlib.sha256(canonical.encode("utf-8")).hexdigest()[:32]
+
+
+def to_response(entry: dict):
+    """
+    카세트 항목을 ChatCompletion 과 같은 속성 구조의 객체로 복원
+    (호출부는 response.choices[0].message.content / response.usage 만 사용)
+    """
+    usage = None
+    if entry.get("usage"):
+        prompt_tokens, completion_tokens = entry["usage"]
+        usage = SimpleNamespace(
+            prompt_tokens=prompt_tokens,
+            completion_tokens=completion_tokens,
+            total_tokens=prompt_tokens + completion_tokens,
+        )
+    message = SimpleNamespace(role="assistant", content=entry["content"])
+    return SimpleNamespace(
+        id=f"cassette-{entry['fp']}",
+        model=entry.get("model", ""),
+        choices=[SimpleNamespace(index=0, message=message, finish_reason="stop")],
+        usage=usage,
+    )
+
+
+# =====================================================
+# 2️⃣ 활성 카세트
+# =====================================================
+_active = Cassette(
+    Path(os.getenv("LLM_CASSETTE_PATH") or PROJECT_ROOT / "storage" / "llm_cassette.jsonl.gz"),
+    mode=os.getenv("LLM_CASSETTE_MODE", "off") or "off",
+    latency_scale=float(os.getenv("LLM_REPLAY_LATENCY_SCALE", "1.0") or 1.0),
+)
+
+
+def get_active_cassette() -> Cassette:
+    return _active
+
+
+@contextmanager
+def use_cassette(path: Path | str, mode: str = "replay", latency_scale: float = 1.0) -> Iterator[Cassette]:
+    """
+    with 블록 동안 지정한 카세트를 사용 (벤치마크 / 회귀 테스트용)
+    """
+    global _active
+    previous = _active
+    _active = Cassette(Path(path), mode=mode, latency_scale=latency_scale)
+    try:
+        yield _active
+    finally:
+        _active = previous
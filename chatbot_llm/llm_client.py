@@ -0,0 +1,118 @@
+"""
+llm_client.py
+──────────────────────────────
+- chatbot_llm 모듈 공용 OpenAI ChatCompletion 호출 래퍼
+- 모듈별 호출 수 / 지연 시간 / 토큰 사용량(response.usage)을 메트릭으로 기록
+- 호출마다 llm.<module> tracing span 생성
+- LLM_CASSETTE_MODE 에 따라 카세트 녹화 / 재생 (llm_cassette.py)
+- LLM_HEDGE_MODULES 에 포함된 모듈은 p90 을 넘기면 같은 요청을 한 번 더 보냄 (llm_hedging.py)
+- AsyncOpenAI 클라이언트는 프로세스당 1개, 첫 실제 호출 시 생성 (openai 패키지 임포트 지연)
+"""
+
+import asyncio
+import os
+import time
+from typing import Optional
+
+from app.utils.event_log import note_step
+from app.utils.metrics import LLM_REQUESTS, LLM_REQUEST_DURATION, LLM_TOKENS, record_cache
+from app.utils.tracing import span
+from app.utils.config import load_env
+from chatbot_llm.llm_cassette import CassetteMiss, fingerprint, get_active_cassette, to_response
+from chatbot_llm.llm_hedging import hedged_call
+
+_client = None
+
+
+# =====================================================
+# 클라이언트
+# =====================================================
+def get_openai_client():
+    """
+    공용 AsyncOpenAI 클라이언트 (최초 호출 시 생성, 커넥션 풀 공유)
+    """
+    global _client
+    if _client is None:
+        from openai import AsyncOpenAI
+
+        load_env()
+        _client = AsyncOpenAI(api_key=os.getenv("OPENAI_API_KEY"))
+    return _client
+
+
+# =====================================================
+# 사용량 기록
+# =====================================================
+def record_usage(module: str, response) -> None:
+    """
+    response.usage 의 prompt/completion 토큰 수를 모듈별로 누적
+    """
+    usage = getattr(response, "usage", None)
+    if usage is None:
+        return
+    LLM_TOKENS.inc(getattr(usage, "prompt_tokens", 0) or 0, module=module, kind="prompt")
+    LLM_TOKENS.inc(getattr(usage, "completion_tokens", 0) or 0, module=module, kind="completion")
+
+
+# =====================================================
+# 카세트 재생
+# =====================================================
+async def _replay(cassette, fp: str, module: str):
+    """
+    카세트에서 응답을 찾아 녹화 당시 지연 시간(× 배율)만큼 대기 후 반환
+    - replay 모드에서 없으면 CassetteMiss, replay_or_record 모드에서 없으면 None (실제 호출)
+    """
+    entry = cassette.lookup(fp)
+    record_cache("llm_cassette", entry is not None)
+    if entry is None:
+        if cassette.mode == "replay":
+            raise CassetteMiss(f"카세트에 없는 {module} 요청입니다: {fp}")
+        return None
+    if cassette.latency_scale > 0:
+        await asyncio.sleep(entry.get("latency", 0.0) * cassette.latency_scale)
+    return to_response(entry)
+
+
+# =====================================================
+# LLM 호출
+# =====================================================
+async def create_chat_completion(module: str, client: Optional[object] = None, **kwargs):
+    """
+    client.chat.completions.create(**kwargs) 를 호출하고 메트릭을 기록
+
+    Args:
+        module (str): 호출한 chatbot_llm 모듈 이름 (메트릭 라벨)
+        client: AsyncOpenAI 클라이언트 (없으면 get_openai_client())
+        **kwargs: chat.completions.create 인자 (model, messages, temperature …)
+
+    Returns:
+        ChatCompletion: OpenAI 응답 (예외는 호출한 쪽에서 처리)
+    """
+    model = kwargs.get("model", "")
+    cassette = get_active_cassette()
+    fp = fingerprint(kwargs) if cassette.mode != "off" else None
+
+    with span(f"llm.{module}", model=model) as current:
+        start = time.perf_counter()
+        try:
+            response = await _replay(cassette, fp, module) if cassette.replaying else None
+            if response is None:
+                client = client or get_openai_client()
+                response = await hedged_call(module, lambda: client.chat.completions.create(**kwargs))
+                if cassette.recording:
+                    cassette.record(fp, module, model, response, time.perf_counter() - start)
+        except Exception:
+            LLM_REQUESTS.inc(module=module, status="error")
+            raise
+        finally:
+            elapsed = time.perf_counter() - start
+            LLM_REQUEST_DURATION.observe(elapsed, module=module, model=model)
+            note_step(f"llm.{module}", elapsed)
+
+        LLM_REQUESTS.inc(module=module, status="ok")
+        record_usage(module, response)
+        usage = getattr(response, "usage", None)
+        if usage is not None:
+            current.set_attribute("prompt_tokens", getattr(usage, "prompt_tokens", 0))
+            current.set_attribute("completion_tokens", getattr(usage, "completion_tokens", 0))
+        return response
@@ -0,0 +1,196 @@
+"""
+llm_hedging.py
+──────────────────────────────
+- LLM 꼬리 지연(tail latency) 완화를 위한 hedged request 정책 (opt-in)
+- 첫 요청이 모듈별 최근 지연의 p90 안에 끝나지 않으면 같은 요청을 한 번 더 보내고,
+  먼저 끝난 응답을 사용 / 나머지는 취소
+- 모듈별 예산(token bucket)으로 추가 호출 비율을 제한
+  (기본: 일반 호출 1건당 0.1건 적립, 최대 10건 → 추가 호출 ≤ 약 10%)
+
+📌 환경 변수
+- LLM_HEDGE_MODULES     : hedge 할 모듈 (쉼표 구분, 예: validate,refine,category_match / 기본: 비활성)
+- LLM_HEDGE_QUANTILE    : hedge 시작 시점 분위수 (기본 0.9)
+- LLM_HEDGE_MIN_DELAY   : hedge 시작 최소 대기(초) (기본 0.3)
+- LLM_HEDGE_MIN_SAMPLES : 분위수 계산 전 필요한 관측 수 (기본 20)
+- LLM_HEDGE_BUDGET      : 일반 호출 1건당 적립되는 추가 호출 예산 (기본 0.1)
+- LLM_HEDGE_BURST       : 예산 최대 적립량 (기본 10)
+
+📌 메트릭
+- llm_hedges_total{module, result=won|lost|failed|no_budget} : hedge 결과 (won = 두 번째 요청이 먼저 끝남)
+- llm_hedge_extra_tokens_total{module}                       : 취소된 요청의 추정 토큰 (같은 요청의 prompt 토큰)
+- llm_request_duration_seconds 의 p99 를 hedge 전후로 비교 (benchmarks/bench_hedging.py 에서 오프라인 비교)
+"""
+
+import asyncio
+import os
+import threading
+import time
+from collections import deque
+from typing import Awaitable, Callable, Optional
+
+from app.utils.metrics import counter
+
+# =====================================================
+# 0️⃣ 전역 설정
+# =====================================================
+LLM_HEDGE_MODULES = {m.strip() for m in os.getenv("LLM_HEDGE_MODULES", "").split(",") if m.strip()}
+LLM_HEDGE_QUANTILE = float(os.getenv("LLM_HEDGE_QUANTILE", "0.9"))
+LLM_HEDGE_MIN_DELAY = float(os.getenv("LLM_HEDGE_MIN_DELAY", "0.3"))
+LLM_HEDGE_MIN_SAMPLES = int(os.getenv("LLM_HEDGE_MIN_SAMPLES", "20"))
+LLM_HEDGE_BUDGET = float(os.getenv("LLM_HEDGE_BUDGET", "0.1"))
+LLM_HEDGE_BURST = float(os.getenv("LLM_HEDGE_BURST", "10"))
+
+LLM_HEDGES = counter(
+    "llm_hedges_total",
+    "hedged LLM 요청 결과 (result=won|lost|failed|no_budget)",
+    ("module", "result"),
+)
+LLM_HEDGE_EXTRA_TOKENS = counter(
+    "llm_hedge_extra_tokens_total",
+    "hedge 로 추가 전송된(취소된) 요청의 추정 prompt 토큰",
+    ("module",),
+)
+
+
+# =====================================================
+# 1️⃣ 정책
+# =====================================================
+class HedgePolicy:
+    """
+    모듈별 지연 관측(최근 window 건) + 추가 호출 예산
+
+    Args:
+        modules (set[str]): hedge 를 적용할 모듈
+        quantile (float): hedge 시작 시점 분위수
+        min_delay (float): hedge 시작 최소 대기(초)
+        min_samples (int): 분위수 계산 전 필요한 관측 수
+        budget (float): 일반 호출 1건당 적립되는 추가 호출 예산
+        burst (float): 예산 최대 적립량
+        window (int): 모듈별로 보관할 최근 지연 관측 수
+    """
+
+    def __init__(
+        self,
+        modules: set[str] = LLM_HEDGE_MODULES,
+        quantile: float = LLM_HEDGE_QUANTILE,
+        min_delay: float = LLM_HEDGE_MIN_DELAY,
+        min_samples: int = LLM_HEDGE_MIN_SAMPLES,
+        budget: float = LLM_HEDGE_BUDGET,
+        burst: float = LLM_HEDGE_BURST,
+        window: int = 200,
+    ):
+        self.modules = set(modules)
+        self.quantile = quantile
+        self.min_delay = min_delay
+        self.min_samples = min_samples
+        self.budget = budget
+        self.burst = burst
+        self.window = window
+        self._latencies: dict[str, deque] = {}
+        self._tokens: dict[str, float] = {}
+        self._lock = threading.Lock()
+
+    def enabled(self, module: str) -> bool:
+        return module in self.modules
+
+    def observe(self, module: str, seconds: float) -> None:
+        """성공한 요청 1건의 지연 기록 + 예산 적립"""
+        with self._lock:
+            self._latencies.setdefault(module, deque(maxlen=self.window)).append(seconds)
+            self._tokens[module] = min(self.burst, self._tokens.get(module, 0.0) + self.budget)
+
+    def hedge_delay(self, module: str) -> Optional[float]:
+        """hedge 를 보낼 대기 시간(초), 관측이 부족하면 None"""
+        if not self.enabled(module):
+            return None
+        with self._lock:
+            samples = sorted(self._latencies.get(module, ()))
+        if len(samples) < self.min_samples:
+            return None
+        index = min(len(samples) - 1, int(self.quantile * len(samples)))
+        return max(self.min_delay, samples[index])
+
+    def try_spend(self, module: str) -> bool:
+        with self._lock:
+            if self._tokens.get(module, 0.0) < 1.0:
+                return False
+            self._tokens[module] -= 1.0
+            return True
+
+
+_policy = HedgePolicy()
+
+
+def get_hedge_policy() -> HedgePolicy:
+    return _policy
+
+
+# =====================================================
+# 2️⃣ hedged 호출
+# =====================================================
+def _prompt_tokens(response) -> int:
+    usage = getattr(response, "usage", None)
+    if usage is None:
+        return 0
+    return getattr(usage, "prompt_tokens", 0) or 0
+
+
+async def hedged_call(module: str, call: Callable[[], Awaitable], policy: Optional[HedgePolicy] = None):
+    """
+    call() 을 실행하고, 정책상 필요하면 같은 요청을 한 번 더 보내 먼저 끝난 응답 반환
+
+    Args:
+        module (str): chatbot_llm 모듈 이름 (정책 / 메트릭 단위)
+        call: 같은 요청을 새로 보내는 코루틴 팩토리 (예: lambda: client.chat.completions.create(**kwargs))
+        policy (HedgePolicy | None): 기본은 환경 변수 기반 전역 정책
+
+    Returns:
+        먼저 성공한 응답 (둘 다 실패하면 첫 요청의 예외를 그대로 발생)
+    """
+    policy = policy or _policy
+    delay = policy.hedge_delay(module)
+    start = time.perf_counter()
+
+    if delay is None:
+        response = await call()
+        policy.observe(module, time.perf_counter() - start)
+        return response
+
+    primary = asyncio.ensure_future(call())
+    hedge = None
+    try:
+        done, _ = await asyncio.wait({primary}, timeout=delay)
+        if done or not policy.try_spend(module):
+            if not done:
+                LLM_HEDGES.inc(module=module, result="no_budget")
+            response = await primary
+            policy.observe(module, time.perf_counter() - start)
+            return response
+
+        hedge_start = time.perf_counter()
+        hedge = asyncio.ensure_future(call())
+        pending = {primary, hedge}
+        while pending:
+            done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+            winner = None
+            for task in done:  # 실패한 요청의 예외도 모두 확인 (미확인 예외 경고 방지)
+                if not task.cancelled() and task.exception() is None:
+                    winner = winner or task
+            if winner is None:
+                continue
+            for task in pending:
+                task.cancel()
+            response = winner.result()
+            won = winner is hedge
+            LLM_HEDGES.inc(module=module, result="won" if won else "lost")
+            if pending or len(done) > 1:
+                LLM_HEDGE_EXTRA_TOKENS.inc(_prompt_tokens(response), module=module)
+            policy.observe(module, time.perf_counter() - (hedge_start if won else start))
+            return response
+
+        LLM_HEDGES.inc(module=module, result="failed")
+        return primary.result()  # 둘 다 실패 → 첫 요청의 예외
+    finally:
+        for task in (primary, hedge):
+            if task is not None and not task.done():
+                task.cancel()
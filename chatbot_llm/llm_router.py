@@ -0,0 +1,94 @@
+"""
+llm_router.py
+──────────────────────────────
+- chatbot_llm 호출을 난이도에 따라 3단계(tier)로 라우팅
+  1) local   : 규칙 기반 결정적 해석 (예: is_affirmative 의 "네", category_match 의 번호 / 정확한 세부 항목명)
+  2) fast    : 더 작고 빠른 모델 (LLM_MODEL_FAST 설정 + LLM_FAST_MODULES 에 포함된 모듈만)
+  3) default : 기존 모델 (LLM_MODEL_DEFAULT, 기본 gpt-4o-mini)
+- local 이 확신하지 못하면(None) / fast 결과가 검증을 통과하지 못하면(파싱 실패, 목록에 없는 값 등) 다음 tier 로 승격
+
+📌 환경 변수
+- LLM_MODEL_DEFAULT : 기본 모델 (기본 gpt-4o-mini)
+- LLM_MODEL_FAST    : 빠른 tier 모델 (예: gpt-4.1-nano / 비워두면 fast tier 생략)
+- LLM_FAST_MODULES  : fast tier 를 먼저 시도할 모듈 (기본 is_affirmative,category_match)
+- LLM_LOCAL_RESOLVE : 0 이면 local tier 비활성 (기본 1)
+
+📌 메트릭
+- llm_route_total{module, tier, result=handled|escalated} : tier 별 처리 / 승격 수 (handled 비율 = tier 별 트래픽 점유율)
+- llm_route_duration_seconds{module, tier}                : tier 별 지연 시간
+"""
+
+import os
+import time
+from typing import Any, Awaitable, Callable, Optional
+
+from app.utils.metrics import counter, histogram
+
+# =====================================================
+# 0️⃣ 전역 설정
+# =====================================================
+LLM_MODEL_DEFAULT = os.getenv("LLM_MODEL_DEFAULT", "gpt-4o-mini")
+LLM_MODEL_FAST = os.getenv("LLM_MODEL_FAST", "")
+LLM_FAST_MODULES = {
+    m.strip() for m in os.getenv("LLM_FAST_MODULES", "is_affirmative,category_match").split(",") if m.strip()
+}
+LLM_LOCAL_RESOLVE = os.getenv("LLM_LOCAL_RESOLVE", "1") != "0"
+
+LLM_ROUTES = counter(
+    "llm_route_total",
+    "chatbot_llm 호출의 tier 별 처리 / 승격 수 (tier=local|fast|default)",
+    ("module", "tier", "result"),
+)
+LLM_ROUTE_DURATION = histogram(
+    "llm_route_duration_seconds",
+    "chatbot_llm 호출의 tier 별 지연 시간",
+    ("module", "tier"),
+    buckets=(0.0001, 0.001, 0.01, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0),
+)
+
+
+# =====================================================
+# 1️⃣ 라우팅
+# =====================================================
+async def route_llm_call(
+    module: str,
+    remote: Callable[[str], Awaitable[Any]],
+    local: Optional[Callable[[], Any]] = None,
+    accept: Callable[[Any], bool] = lambda result: True,
+    fast_eligible: bool = True,
+) -> Any:
+    """
+    local → fast → default 순서로 시도해 처음 확신할 수 있는 결과 반환
+
+    Args:
+        module (str): chatbot_llm 모듈 이름 (메트릭 라벨)
+        remote: model 이름을 받아 LLM 을 호출하고 결과를 돌려주는 코루틴 함수
+        local: 규칙 기반 해석 (확신하지 못하면 None 반환)
+        accept: fast tier 결과 검증 (False 면 default tier 로 승격)
+        fast_eligible (bool): 입력 특징상 fast tier 로 충분한지 (후보 수, 입력 길이 등 호출한 쪽 판단)
+
+    Returns:
+        처리한 tier 의 결과 (default tier 결과는 검증 없이 그대로 반환)
+    """
+    if local is not None and LLM_LOCAL_RESOLVE:
+        start = time.perf_counter()
+        result = local()
+        LLM_ROUTE_DURATION.observe(time.perf_counter() - start, module=module, tier="local")
+        if result is not None:
+            LLM_ROUTES.inc(module=module, tier="local", result="handled")
+            return result
+        LLM_ROUTES.inc(module=module, tier="local", result="escalated")
+
+    if LLM_MODEL_FAST and module in LLM_FAST_MODULES and fast_eligible:
+        with LLM_ROUTE_DURATION.time(module=module, tier="fast"):
+            result = await remote(LLM_MODEL_FAST)
+        if accept(result):
+            LLM_ROUTES.inc(module=module, tier="fast", result="handled")
+            return result
+        LLM_ROUTES.inc(module=module, tier="fast", result="escalated")
+
+    with LLM_ROUTE_DURATION.time(module=module, tier="default"):
+        result = await remote(LLM_MODEL_DEFAULT)
+    LLM_ROUTES.inc(module=module, tier="default", result="handled")
+    return result
+
@@ -0,0 +1,152 @@
+"""
+prompt_budget.py
+──────────────────────────────
+- 프롬프트에 넣는 카테고리 데이터를 토큰 예산 안으로 줄이는 빌더
+- 항목(중간키: 세부1, 세부2, …)을 사용자 발화와의 관련도(글자 2-gram 겹침)로 순위를 매겨
+  예산 안에 들어가는 항목만 남기고, 원래 순서를 유지한 compact 텍스트로 직렬화
+- 토큰 수는 tiktoken 이 설치되어 있으면 모델 인코딩으로, 없으면 보수적인 추정치로 계산
+
+📌 환경 변수
+- PROMPT_BUDGET_REFINE         : refine 의 카테고리 데이터 토큰 예산 (기본 1200)
+- PROMPT_BUDGET_CATEGORY_MATCH : category_match 의 후보 목록 토큰 예산 (기본 600)
+
+📌 사용 예
+    text, stats = build_category_lines(category_dict, utterance, budget=1200)
+"""
+
+import math
+import os
+import re
+from functools import lru_cache
+
+from app.utils.metrics import counter
+
+# =====================================================
+# 0️⃣ 전역 설정
+# =====================================================
+PROMPT_BUDGET_REFINE = int(os.getenv("PROMPT_BUDGET_REFINE", "1200"))
+PROMPT_BUDGET_CATEGORY_MATCH = int(os.getenv("PROMPT_BUDGET_CATEGORY_MATCH", "600"))
+
+PROMPT_TRIMMED = counter(
+    "prompt_budget_trimmed_total",
+    "토큰 예산 때문에 프롬프트에서 제외된 세부 항목 수",
+    ("module",),
+)
+
+
+# =====================================================
+# 1️⃣ 토큰 수 계산
+# =====================================================
+@lru_cache(maxsize=1)
+def _encoding():
+    try:
+        import tiktoken
+    except ImportError:
+        return None
+    try:
+        return tiktoken.encoding_for_model("gpt-4o-mini")
+    except Exception:
+        return tiktoken.get_encoding("o200k_base")
+
+
+def count_tokens(text: str) -> int:
+    """
+    text 의 토큰 수 (tiktoken 미설치 시 ASCII 4글자 = 1토큰, 그 외 1글자 = 1토큰으로 추정)
+    """
+    encoding = _encoding()
+    if encoding is not None:
+        return len(encoding.encode(text))
+    ascii_chars = sum(1 for ch in text if ch.isascii())
+    return math.ceil(ascii_chars / 4) + (len(text) - ascii_chars)
+
+
+# =====================================================
+# 2️⃣ 관련도
+# =====================================================
+def _bigrams(text: str) -> set[str]:
+    compact = re.sub(r"\s+", "", text).lower()
+    if len(compact) < 2:
+        return {compact} if compact else set()
+    return {compact[i:i + 2] for i in range(len(compact) - 1)}
+
+
+def relevance(utterance_grams: set[str], text: str) -> float:
+    """utterance 의 2-gram 중 text 에 포함된 비율"""
+    if not utterance_grams:
+        return 0.0
+    return len(utterance_grams & _bigrams(text)) / len(utterance_grams)
+
+
+# =====================================================
+# 3️⃣ 빌더
+# =====================================================
+def format_line(mid_key: str, details: list[str]) -> str:
+    return f"{mid_key}: {', '.join(details)}"
+
+
+def build_category_lines(
+    category_dict: dict[str, list[str]],
+    utterance: str,
+    budget: int,
+    keep_order: bool = False,
+    module: str = "",
+) -> tuple[str, dict]:
+    """
+    "중간키: 세부1, 세부2, …" 줄 목록을 budget 토큰 안으로 구성
+
+    Args:
+        category_dict: {중간키: [세부항목, …]}
+        utterance: 사용자 발화 (관련도 기준)
+        budget: 허용 토큰 수 (0 이하면 제한 없음)
+        keep_order: True 면 순위를 매기지 않고 앞에서부터 채움
+                    (category_match 처럼 번호 입력이 전체 순서에 의존하는 경우)
+        module: 메트릭 라벨
+
+    Returns:
+        (text, stats): 프롬프트용 텍스트, {"tokens", "entries", "kept_entries", "dropped_details"}
+    """
+    entries = list(category_dict.items())
+    total_details = sum(len(details) for _, details in entries)
+    full_text = "\n".join(format_line(mid, details) for mid, details in entries)
+    full_tokens = count_tokens(full_text)
+
+    if budget <= 0 or full_tokens <= budget:
+        return full_text, {"tokens": full_tokens, "entries": len(entries), "kept_entries": len(entries), "dropped_details": 0}
+
+    if keep_order:
+        order = list(range(len(entries)))
+    else:
+        grams = _bigrams(utterance)
+        scores = [
+            max(relevance(grams, mid), *(relevance(grams, d) for d in details)) if details else relevance(grams, mid)
+            for mid, details in entries
+        ]
+        order = sorted(range(len(entries)), key=lambda i: (-scores[i], i))
+
+    kept: dict[int, list[str]] = {}
+    used = 0
+    for i in order:
+        mid, details = entries[i]
+        line_tokens = count_tokens(format_line(mid, details)) + 1  # 줄바꿈
+        if used + line_tokens <= budget:
+            kept[i] = list(details)
+            used += line_tokens
+            continue
+        # 남은 예산만큼 세부 항목 일부만 포함
+        partial = []
+        for detail in details:
+            candidate = format_line(mid, partial + [detail])
+            if used + count_tokens(candidate) + 1 > budget:
+                break
+            partial.append(detail)
+        if partial:
+            kept[i] = partial
+            used += count_tokens(format_line(mid, partial)) + 1
+        break
+
+    # 원래 순서 유지
+    text = "\n".join(format_line(entries[i][0], kept[i]) for i in sorted(kept))
+    dropped = total_details - sum(len(v) for v in kept.values())
+    if dropped and module:
+        PROMPT_TRIMMED.inc(dropped, module=module)
+    return text, {"tokens": count_tokens(text), "entries": len(entries), "kept_entries": len(kept), "dropped_details": dropped}
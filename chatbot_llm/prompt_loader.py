@@ -0,0 +1,96 @@
+"""
+prompt_loader.py
+──────────────────────────────
+- prompts/*.txt 공용 로더 (chatbot_llm 모듈들의 load_text_file 이 사용)
+- 파일 내용을 메모리에 캐시, 수정 시각(mtime)이 바뀌면 다시 읽음 → 서버 재시작 없이 프롬프트 수정 반영
+- preload_prompts(): 기동 시 전체 프롬프트를 미리 읽고 user 프롬프트의 format 자리표시자 검증
+
+📌 함수
+- load_prompt(path: Path) -> str
+- preload_prompts(prompt_dir: Path = PROMPT_DIR) -> list[str]  (문제 목록, 비어 있으면 정상)
+"""
+
+import string
+import threading
+from pathlib import Path
+
+# =====================================================
+# 0️⃣ 전역 설정
+# =====================================================
+PROJECT_ROOT = Path(__file__).resolve().parent.parent
+PROMPT_DIR = PROJECT_ROOT / "prompts"
+
+# 프롬프트 파일 → .format() 에 넘기는 필드 (system 프롬프트는 format 하지 않음)
+PROMPT_FIELDS = {
+    "validate_system_prompt.txt": None,
+    "validate_user_prompt.txt": {"keywords", "user_message"},
+    "refine_system_prompt.txt": None,
+    "refine_user_prompt.txt": {"category_data", "user_message"},
+    "category_match_system_prompt.txt": None,
+    "category_match_user_prompt.txt": {"bot_raw_result", "utterance"},
+    "is_affirmative_system_prompt.txt": None,
+    "is_affirmative_user_prompt.txt": {"utterance"},
+}
+
+_cache: dict[Path, tuple[int, str]] = {}
+_lock = threading.Lock()
+
+
+# =====================================================
+# 1️⃣ 로드
+# =====================================================
+def load_prompt(path: Path) -> str:
+    """
+    프롬프트 파일 내용 (앞뒤 공백 제거), mtime 이 같으면 캐시 반환
+    """
+    mtime = path.stat().st_mtime_ns
+    cached = _cache.get(path)
+    if cached is not None and cached[0] == mtime:
+        return cached[1]
+
+    with open(path, "r", encoding="utf-8") as f:
+        text = f.read().strip()
+    with _lock:
+        _cache[path] = (mtime, text)
+    return text
+
+
+# =====================================================
+# 2️⃣ 기동 시 검증
+# =====================================================
+def preload_prompts(prompt_dir: Path = PROMPT_DIR) -> list[str]:
+    """
+    PROMPT_FIELDS 의 모든 프롬프트를 캐시에 올리고 검증
+
+    Returns:
+        list[str]: 문제 목록 (파일 없음 / 비어 있음 / 자리표시자 불일치)
+    """
+    problems = []
+    for name, fields in PROMPT_FIELDS.items():
+        path = prompt_dir / name
+        try:
+            text = load_prompt(path)
+        except OSError as e:
+            problems.append(f"{name}: 읽기 실패 ({e})")
+            continue
+        if not text:
+            problems.append(f"{name}: 비어 있음")
+            continue
+        if fields is None:
+            continue
+        try:
+            found = {field for _, field, _, _ in string.Formatter().parse(text) if field is not None}
+        except ValueError as e:
+            problems.append(f"{name}: format 문법 오류 ({e})")
+            continue
+        if found != fields:
+            problems.append(f"{name}: 자리표시자 {sorted(found)} ≠ 기대값 {sorted(fields)}")
+    return problems
+
+
+# =====================================================
+# CLI 테스트
+# =====================================================
+if __name__ == "__main__":
+    issues = preload_prompts()
+    print("✅ 프롬프트 검증 완료" if not issues else "\n".join(f"❌ {p}" for p in issues))
@@ -5,18 +5,17 @@ refine_llm.py
   사용자 입력을 고려해 중간 키 2개 + 각 세부 항목 최대 5개씩 추천
 """
 
-import os
 import json
 from pathlib import Path
-from dotenv import load_dotenv
-from openai import AsyncOpenAI
+from chatbot_llm.llm_client import create_chat_completion
+from chatbot_llm.llm_router import LLM_MODEL_DEFAULT, route_llm_call
+from chatbot_llm.prompt_loader import load_prompt
+from chatbot_llm.prompt_budget import PROMPT_BUDGET_REFINE, build_category_lines
 import ast
 
 # =====================================================
-# 환경 설정 & OpenAI 클라이언트
+# 환경 설정 (OpenAI 클라이언트는 llm_client 에서 첫 호출 시 생성)
 # =====================================================
-load_dotenv()
-openai = AsyncOpenAI(api_key=os.getenv("OPENAI_API_KEY"))
 
 PROJECT_ROOT = Path(__file__).resolve().parent.parent
 PROMPT_DIR = PROJECT_ROOT / "prompts"
@@ -25,22 +24,21 @@ PROMPT_DIR = PROJECT_ROOT / "prompts"
 # 유틸 함수
 # =====================================================
 def load_text_file(path: Path) -> str:
-    with open(path, "r", encoding="utf-8") as f:
-        return f.read().strip()
+    return load_prompt(path)  # mtime 기준 메모리 캐시 (prompt_loader.py)
 
 
 # =====================================================
 # LLM 호출
 # =====================================================
-async def _call_refine_llm(user_message: str, category_dict: dict) -> list:
+async def _call_refine_llm(user_message: str, category_dict: dict, model: str = LLM_MODEL_DEFAULT) -> list:
     """
     OpenAI를 호출해 사용자 입력을 기반으로
     중간 키 2개 + 각 세부 항목 추천
     """
-    # 🔷 category_dict를 문자열로 변환
-    category_items_str = ""
-    for mid_key, details in category_dict.items():
-        category_items_str += f"{mid_key}: {', '.join(details)}\n"
+    # 🔷 category_dict를 문자열로 변환 (발화와 관련도가 높은 항목부터 토큰 예산 안에서)
+    category_items_str, _ = build_category_lines(
+        category_dict, user_message, budget=PROMPT_BUDGET_REFINE, module="refine"
+    )
 
     # 🔷 프롬프트 로드
     system_prompt = load_text_file(PROMPT_DIR / "refine_system_prompt.txt")
@@ -52,8 +50,9 @@ async def _call_refine_llm(user_message: str, category_dict: dict) -> list:
 
     # 🔷 LLM 호출
     try:
-        response = await openai.chat.completions.create(
-            model="gpt-4o-mini",
+        response = await create_chat_completion(
+            "refine",
+            model=model,
             messages=[
                 {"role": "system", "content": system_prompt},
                 {"role": "user", "content": user_prompt}
@@ -98,7 +97,11 @@ async def refine_keywords(user_message: str, category_dict: dict) -> list:
     """
     외부에서 호출하는 함수: 동기 → 비동기 실행
     """
-    return await _call_refine_llm(user_message, category_dict)
+    return await route_llm_call(
+        "refine",
+        remote=lambda model: _call_refine_llm(user_message, category_dict, model),
+        accept=lambda result: bool(result) and result[0] is True,
+    )
 
 
 # =====================================================
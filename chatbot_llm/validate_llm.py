@@ -4,18 +4,18 @@ validate_llm.py
 - 사용자 입력 → 연관 카테고리 키워드 최대 10개 추출
 """
 
-from openai import AsyncOpenAI
-import os
 import json
 from pathlib import Path
-from dotenv import load_dotenv
 import ast
+from chatbot_llm.llm_client import create_chat_completion
+from chatbot_llm.llm_router import LLM_MODEL_DEFAULT, route_llm_call
+from chatbot_llm.prompt_loader import load_prompt
+from app.utils.catalog_snapshot import get_catalog_snapshot
+from app.utils.tracing import span
 
 # =====================================================
-# 환경 설정 & OpenAI 클라이언트
+# 환경 설정 (OpenAI 클라이언트는 llm_client 에서 첫 호출 시 생성)
 # =====================================================
-load_dotenv()
-openai = AsyncOpenAI(api_key=os.getenv("OPENAI_API_KEY"))
 
 PROJECT_ROOT = Path(__file__).resolve().parent.parent
 PROMPT_DIR = PROJECT_ROOT / "prompts"
@@ -25,17 +25,19 @@ CATEGORY_KEYS_JSON = PROJECT_ROOT / "storage" / "category_structure_keys.json"
 # 유틸 함수
 # =====================================================
 def load_text_file(path: Path) -> str:
-    with open(path, "r", encoding="utf-8") as f:
-        return f.read().strip()
+    return load_prompt(path)  # mtime 기준 메모리 캐시 (prompt_loader.py)
 
 def load_category_keys() -> dict:
-    with open(CATEGORY_KEYS_JSON, "r", encoding="utf-8") as f:
+    snapshot = get_catalog_snapshot()
+    if snapshot is not None:
+        return snapshot.keys_view()
+    with span("catalog.load_keys"), open(CATEGORY_KEYS_JSON, "r", encoding="utf-8") as f:
         return json.load(f)
 
 # =====================================================
 # LLM 호출
 # =====================================================
-async def _call_validate_llm(user_message: str, category_keys: dict) -> list:
+async def _call_validate_llm(user_message: str, category_keys: dict, model: str = LLM_MODEL_DEFAULT) -> list:
     """
     OpenAI를 호출해 사용자 입력과 카테고리 키를 비교하여 연관 키워드 최대 10개를 추출
     """
@@ -55,8 +57,9 @@ async def _call_validate_llm(user_message: str, category_keys: dict) -> list:
 
     # LLM 요청
     try:
-        response = await openai.chat.completions.create(
-            model="gpt-4o-mini",
+        response = await create_chat_completion(
+            "validate",
+            model=model,
             messages=[
                 {"role": "system", "content": system_prompt},
                 {"role": "user", "content": user_prompt}
@@ -110,7 +113,11 @@ async def validate_keywords(user_message: str) -> list:
     import asyncio
 
     category_keys = load_category_keys()
-    return await _call_validate_llm(user_message, category_keys)
+    return await route_llm_call(
+        "validate",
+        remote=lambda model: _call_validate_llm(user_message, category_keys, model),
+        accept=lambda result: bool(result) and result[0] is True,
+    )
 
 # =====================================================
 # CLI 테스트
@@ -1,20 +1,19 @@
-import requests
+"""
+다나와 메인 카테고리 href 확인용 스크립트 (HTTP 캐시 경유)
+실행: python -m crawling.test
+"""
+from app.utils.http_cache import DEFAULT_HEADERS, cached_get
 from bs4 import BeautifulSoup
 
 url = "https://www.danawa.com/"
 # =====================================================
 # 0️⃣  공용 headers
 # =====================================================
-headers = {
-    "User-Agent": (
-        "Mozilla/5.0 (Windows NT 10.0; Win64; x64) "
-        "AppleWebKit/537.36 (KHTML, like Gecko) "
-        "Chrome/115.0.0.0 Safari/537.36"
-    )
-}
+headers = DEFAULT_HEADERS
 
-response = requests.get(url, headers=headers)
+response = cached_get(url, headers=headers)  # 변경이 없으면 304 → 디스크 캐시 본문 사용
 response.raise_for_status()  # 에러 발생 시 예외
+print(f"ℹ️ 응답 출처: {response.source}")
 
 soup = BeautifulSoup(response.text, "html.parser")
 div_category = soup.find('div', attrs={"id": "category"})
@@ -0,0 +1,277 @@
+"""
+fake_services.py
+──────────────────────────────
+- 부하 테스트용 로컬 stand-in 서버 (OpenAI / Kakao / Danawa)
+- 표준 라이브러리 ThreadingHTTPServer 기반, 요청마다 지정한 분포로 지연 시간 주입
+- 실제 서비스와 같은 응답 형태를 돌려주어 앱 코드는 수정 없이 동작
+
+📌 지연 분포 표기 (LatencySampler.parse)
+- "const:0.2"            → 항상 0.2초
+- "uniform:0.1,0.5"      → 0.1 ~ 0.5초 균등 분포
+- "normal:0.8,0.2"       → 평균 0.8초, 표준편차 0.2초 (0 미만은 0)
+- "lognormal:0.8,0.5"    → 중앙값 0.8초, sigma 0.5 (LLM 지연처럼 긴 꼬리)
+"""
+
+import json
+import math
+import random
+import re
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import urlparse
+
+# =====================================================
+# 0️⃣ 지연 분포
+# =====================================================
+class LatencySampler:
+    def __init__(self, kind: str = "const", params: tuple = (0.0,)):
+        self.kind = kind
+        self.params = params
+
+    @classmethod
+    def parse(cls, spec: str) -> "LatencySampler":
+        kind, _, raw = spec.partition(":")
+        params = tuple(float(x) for x in raw.split(",") if x.strip()) or (0.0,)
+        if kind not in ("const", "uniform", "normal", "lognormal"):
+            raise ValueError(f"지원하지 않는 지연 분포입니다: {spec}")
+        return cls(kind, params)
+
+    def sample(self) -> float:
+        if self.kind == "uniform":
+            return random.uniform(self.params[0], self.params[1])
+        if self.kind == "normal":
+            return max(0.0, random.gauss(self.params[0], self.params[1]))
+        if self.kind == "lognormal":
+            return random.lognormvariate(math.log(max(self.params[0], 1e-6)), self.params[1])
+        return self.params[0]
+
+    def __str__(self) -> str:
+        return f"{self.kind}:{','.join(str(p) for p in self.params)}"
+
+
+# =====================================================
+# 1️⃣ 공통 핸들러
+# =====================================================
+class _FakeHandler(BaseHTTPRequestHandler):
+    latency: LatencySampler = LatencySampler()
+    protocol_version = "HTTP/1.1"
+
+    def log_message(self, format, *args):  # 부하 테스트 중 로그 억제
+        pass
+
+    def _read_body(self) -> bytes:
+        length = int(self.headers.get("Content-Length") or 0)
+        return self.rfile.read(length) if length else b""
+
+    def _send(self, status: int, body: bytes, content_type: str) -> None:
+        time.sleep(self.latency.sample())
+        self.send_response(status)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def _send_json(self, payload: dict, status: int = 200) -> None:
+        self._send(status, json.dumps(payload, ensure_ascii=False).encode("utf-8"), "application/json")
+
+
+# =====================================================
+# 2️⃣ Fake OpenAI (POST /v1/chat/completions)
+# =====================================================
+def _section(text: str, start_marker: str, end_marker: str) -> str:
+    start = text.find(start_marker)
+    if start < 0:
+        return ""
+    start += len(start_marker)
+    end = text.find(end_marker, start)
+    return text[start:end if end >= 0 else None].strip("─ \n:")
+
+
+def _fake_validate(user_prompt: str) -> str:
+    keywords = [k.strip() for k in _section(user_prompt, "카테고리 키워드 목록", "📄 사용자 입력").splitlines() if k.strip()]
+    message = _section(user_prompt, "📄 사용자 입력", "\u0000")
+    hits = [k for k in keywords if any(tok and tok in message for tok in re.split(r"[\s/·]+", k) if len(tok) >= 2)]
+    chosen = hits[:3] or random.sample(keywords, min(2, len(keywords)))
+    return json.dumps([True, *chosen], ensure_ascii=False)
+
+
+def _parse_category_lines(data: str) -> dict[str, list[str]]:
+    """프롬프트의 "중간키: 세부1, 세부2" 줄 → {중간키: [세부항목, …]} (prompt_budget.build_category_lines 형식)"""
+    result = {}
+    for line in data.splitlines():
+        mid, sep, details = line.partition(": ")
+        if sep:
+            result[mid.strip()] = [d.strip() for d in details.split(", ") if d.strip()]
+    return result
+
+
+def _fake_refine(user_prompt: str) -> str:
+    data = _parse_category_lines(_section(user_prompt, "카테고리 데이터:", "사용자 입력:"))
+    result = {mid: details[:5] for mid, details in list(data.items())[:2]}
+    return json.dumps([True, result] if result else [False, "적합한 카테고리가 없습니다."], ensure_ascii=False)
+
+
+def _fake_category_match(user_prompt: str) -> str:
+    raw = _section(user_prompt, "📄 카테고리 데이터:", "📄 사용자 입력:")
+    utterance = _section(user_prompt, "📄 사용자 입력:", "───")
+    data = _parse_category_lines(raw)
+    if not data:
+        return json.dumps([False, "카테고리 데이터를 해석하지 못했습니다."], ensure_ascii=False)
+    pairs = [(mid, detail) for mid, details in data.items() for detail in details]
+    if not pairs:
+        return json.dumps([False, "선택할 항목이 없습니다."], ensure_ascii=False)
+    digits = re.sub(r"\D", "", utterance)
+    idx = int(digits) - 1 if digits else 0
+    mid, detail = pairs[idx] if 0 <= idx < len(pairs) else pairs[0]
+    return json.dumps([True, [mid, detail]], ensure_ascii=False)
+
+
+def fake_completion_content(user_prompt: str) -> tuple[str, str]:
+    """
+    사용자 프롬프트 형태로 어떤 chatbot_llm 모듈의 호출인지 판별해 그럴듯한 응답 생성
+
+    Returns:
+        (module, content)
+    """
+    if "카테고리 키워드 목록" in user_prompt:
+        return "validate", _fake_validate(user_prompt)
+    if "사용자 발화:" in user_prompt:
+        return "is_affirmative", "YES"
+    if "(중간키, 세부항목) 쌍" in user_prompt:
+        return "category_match", _fake_category_match(user_prompt)
+    return "refine", _fake_refine(user_prompt)
+
+
+class FakeOpenAIHandler(_FakeHandler):
+    def do_POST(self):
+        if not urlparse(self.path).path.endswith("/chat/completions"):
+            self._send_json({"error": {"message": "not found"}}, 404)
+            return
+        request = json.loads(self._read_body() or b"{}")
+        messages = request.get("messages", [])
+        user_prompt = next((m["content"] for m in reversed(messages) if m.get("role") == "user"), "")
+        _, content = fake_completion_content(user_prompt)
+        prompt_chars = sum(len(m.get("content", "")) for m in messages)
+        self._send_json({
+            "id": f"chatcmpl-fake-{random.getrandbits(48):x}",
+            "object": "chat.completion",
+            "created": int(time.time()),
+            "model": request.get("model", "gpt-4o-mini"),
+            "choices": [{
+                "index": 0,
+                "message": {"role": "assistant", "content": content},
+                "finish_reason": "stop",
+            }],
+            "usage": {
+                "prompt_tokens": prompt_chars // 2,
+                "completion_tokens": len(content) // 2,
+                "total_tokens": prompt_chars // 2 + len(content) // 2,
+            },
+        })
+
+
+# =====================================================
+# 3️⃣ Fake Kakao (kauth 토큰 발급 + kapi 메시지 전송)
+# =====================================================
+class FakeKakaoHandler(_FakeHandler):
+    def do_POST(self):
+        path = urlparse(self.path).path
+        self._read_body()
+        if path == "/oauth/token":
+            self._send_json({
+                "access_token": f"fake-access-{random.getrandbits(32):x}",
+                "refresh_token": f"fake-refresh-{random.getrandbits(32):x}",
+                "expires_in": 21599,
+                "token_type": "bearer",
+            })
+        elif path == "/v2/api/talk/memo/default/send":
+            self._send_json({"result_code": 0})
+        else:
+            self._send_json({"msg": "not found"}, 404)
+
+
+# =====================================================
+# 4️⃣ Fake Danawa (메인 카테고리 + 상품 리스트 페이지)
+# =====================================================
+DANAWA_HOME_HTML = """<html><body>
+<div id="category">
+  <a class="category__list__btn" href="#categoryHoverLayer22">AI</a>
+  <a class="category__list__btn" href="#categoryHoverLayer10">가전 · TV</a>
+</div>
+</body></html>"""
+
+DANAWA_LIST_HTML = """<html><body>
+<div class="option_nav">
+  <dl class="spec_item">
+    <input type="hidden" data-attribute-name="제조사">
+    <ul>{makers}</ul>
+  </dl>
+  <dl class="spec_item">
+    <input type="hidden" data-attribute-name="브랜드">
+    <ul>{brands}</ul>
+  </dl>
+</div>
+</body></html>"""
+
+FAKE_MAKERS = ["삼성전자", "LG전자", "APPLE", "레노버", "ASUS", "HP", "MSI", "에이서"]
+FAKE_BRANDS = ["갤럭시북", "그램", "맥북", "씽크패드", "젠북", "파빌리온", "스텔스", "스위프트"]
+
+
+class FakeDanawaHandler(_FakeHandler):
+    def do_GET(self):
+        path = urlparse(self.path).path
+        if path in ("", "/"):
+            self._send(200, DANAWA_HOME_HTML.encode("utf-8"), "text/html; charset=utf-8")
+            return
+        items = lambda names: "".join(  # noqa: E731
+            f'<li class="sub_item"><label title="{n}">{n}</label></li>' for n in random.sample(names, 5)
+        )
+        html = DANAWA_LIST_HTML.format(makers=items(FAKE_MAKERS), brands=items(FAKE_BRANDS))
+        self._send(200, html.encode("utf-8"), "text/html; charset=utf-8")
+
+
+# =====================================================
+# 5️⃣ 서버 기동
+# =====================================================
+def start_fake_server(handler_cls: type, latency: LatencySampler, host: str = "127.0.0.1", port: int = 0) -> ThreadingHTTPServer:
+    """
+    지정한 핸들러로 백그라운드 스레드 서버를 띄우고 반환 (server.server_address 로 포트 확인)
+    """
+    handler = type(handler_cls.__name__, (handler_cls,), {"latency": latency})
+    server = ThreadingHTTPServer((host, port), handler)
+    server.daemon_threads = True
+    thread = threading.Thread(target=server.serve_forever, name=f"{handler_cls.__name__}-server", daemon=True)
+    thread.start()
+    return server
+
+
+def server_url(server: ThreadingHTTPServer) -> str:
+    host, port = server.server_address[:2]
+    return f"http://{host}:{port}"
+
+
+# =====================================================
+# CLI: fake 서버만 단독 실행
+# =====================================================
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="OpenAI / Kakao / Danawa fake 서버 실행")
+    parser.add_argument("--openai-latency", default="lognormal:0.8,0.4")
+    parser.add_argument("--kakao-latency", default="const:0.05")
+    parser.add_argument("--danawa-latency", default="uniform:0.2,0.6")
+    args = parser.parse_args()
+
+    servers = {
+        "OPENAI_BASE_URL": (start_fake_server(FakeOpenAIHandler, LatencySampler.parse(args.openai_latency)), "/v1"),
+        "KAKAO_API_HOST": (start_fake_server(FakeKakaoHandler, LatencySampler.parse(args.kakao_latency)), ""),
+        "DANAWA_BASE_URL": (start_fake_server(FakeDanawaHandler, LatencySampler.parse(args.danawa_latency)), ""),
+    }
+    for env_name, (server, suffix) in servers.items():
+        print(f"{env_name}={server_url(server)}{suffix}")
+    print("KAKAO_AUTH_HOST 는 KAKAO_API_HOST 와 같은 서버를 사용하세요. (Ctrl+C 로 종료)")
+    try:
+        threading.Event().wait()
+    except KeyboardInterrupt:
+        pass
@@ -0,0 +1,86 @@
+"""
+payloads.py
+──────────────────────────────
+- 카카오 i 오픈빌더 스킬 요청(webhook payload) 생성
+- stage 1 → 3 다중 턴 대화 시나리오 생성
+"""
+
+import random
+import uuid
+
+# =====================================================
+# 0️⃣ 샘플 발화
+# =====================================================
+PRODUCT_UTTERANCES = [
+    "사무실에서 쓸 만한 노트북 추천해줘",
+    "키보드를 살건데 적당한 기계식키보드를 원해",
+    "게이밍 노트북 보고 있어",
+    "자취방에 둘 작은 냉장고",
+    "세차 용품 필요해",
+    "부모님 드릴 안마의자",
+    "캠핑 갈 때 쓸 텐트",
+    "아이패드 같은 태블릿",
+    "거실용 75인치 TV",
+    "무선 청소기 추천 부탁해",
+    "강아지 사료 사려고",
+    "러닝화 찾고 있어요",
+]
+GREETINGS = ["안녕", "시작", "안녕하세요", "hi"]
+AFFIRMATIVES = ["네", "응", "좋아요", "진행해줘", "ㅇㅇ"]
+
+
+# =====================================================
+# 1️⃣ payload 생성
+# =====================================================
+def make_user_id() -> str:
+    """카카오 botUserKey 형태의 임의 유저 ID"""
+    return uuid.uuid4().hex[:20] + uuid.uuid4().hex[:44]
+
+
+def make_webhook_payload(user_id: str, utterance: str) -> dict:
+    """
+    카카오 스킬 서버로 전달되는 요청 본문과 같은 구조의 payload 생성
+    (handle_webhook 이 읽는 userRequest.user.id / userRequest.utterance 포함)
+    """
+    return {
+        "intent": {"id": uuid.uuid4().hex[:24], "name": "폴백 블록"},
+        "userRequest": {
+            "timezone": "Asia/Seoul",
+            "params": {"ignoreMe": "true"},
+            "block": {"id": uuid.uuid4().hex[:24], "name": "폴백 블록"},
+            "utterance": utterance,
+            "lang": "ko",
+            "user": {
+                "id": user_id,
+                "type": "botUserKey",
+                "properties": {"botUserKey": user_id},
+            },
+        },
+        "bot": {"id": "loadtest-bot", "name": "loadtest"},
+        "action": {
+            "name": "webhook",
+            "clientExtra": {},
+            "params": {},
+            "id": uuid.uuid4().hex[:24],
+            "detailParams": {},
+        },
+    }
+
+
+# =====================================================
+# 2️⃣ 대화 시나리오
+# =====================================================
+def make_conversation(stage3_answer: str = "yes") -> list[tuple[str, str]]:
+    """
+    인증 직후 첫 턴부터 stage 3 확인까지의 (stage 라벨, 발화) 목록
+
+    Args:
+        stage3_answer (str): "yes" 면 크롤링까지 진행, "no" 면 stage 1 로 복귀
+    """
+    confirm = random.choice(AFFIRMATIVES) if stage3_answer == "yes" else "아니요"
+    return [
+        ("auth", random.choice(GREETINGS)),
+        ("stage_1", random.choice(PRODUCT_UTTERANCES)),
+        ("stage_2", str(random.randint(1, 4))),
+        ("stage_3", confirm),
+    ]
@@ -0,0 +1,284 @@
+"""
+run_load.py
+──────────────────────────────
+- /webhook 처리량 측정용 부하 테스트 러너
+- fake OpenAI / Kakao / Danawa 서버를 띄우고, 앱(uvicorn)을 해당 서버로 향하게 실행
+- 가상 유저마다 /oauth 인증 → stage 1 → 2 → 3 다중 턴 대화를 지정한 동시성으로 수행
+- 결과: 전체 RPS, stage별 p50/p95/p99 지연 시간, 오류율
+
+📌 실행 예
+    python -m loadtest.run_load --spawn --users 200 --concurrency 20 \\
+        --openai-latency lognormal:0.8,0.4 --danawa-latency uniform:0.2,0.6
+
+    # 이미 떠 있는 서버 대상 (출력되는 환경 변수로 서버를 띄워야 함)
+    python -m loadtest.run_load --target http://127.0.0.1:8000 --users 50
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+import httpx
+
+from app.utils.admission import BUSY_MESSAGE
+from app.utils.user_actor import BUSY_TURN_MESSAGE
+from loadtest.fake_services import (
+    FakeDanawaHandler,
+    FakeKakaoHandler,
+    FakeOpenAIHandler,
+    LatencySampler,
+    server_url,
+    start_fake_server,
+)
+from loadtest.payloads import make_conversation, make_user_id, make_webhook_payload
+
+PROJECT_ROOT = Path(__file__).resolve().parent.parent
+
+# 응답 본문이 이 문구로 시작하면 HTTP 200 이어도 실패(soft error)로 집계
+# (부하 차단 · 유저 액터 대기 초과 응답은 문구가 바뀌어도 집계되도록 상수를 그대로 사용)
+SOFT_ERROR_PREFIXES = (
+    "죄송합니다", "카테고리를 찾지 못했습니다", "잠시 후 다시 시도해 주세요", BUSY_MESSAGE, BUSY_TURN_MESSAGE,
+)
+
+
+# =====================================================
+# 1️⃣ 통계
+# =====================================================
+def percentile(values: list[float], pct: float) -> float:
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    idx = min(len(ordered) - 1, max(0, int(round(pct / 100 * len(ordered) + 0.5)) - 1))
+    return ordered[idx]
+
+
+class LoadStats:
+    def __init__(self):
+        self.latencies: dict[str, list[float]] = {}
+        self.errors: dict[str, int] = {}
+        self.soft_errors: dict[str, int] = {}
+
+    def record(self, stage: str, elapsed: float, ok: bool, soft_error: bool = False) -> None:
+        self.latencies.setdefault(stage, []).append(elapsed)
+        self.errors.setdefault(stage, 0)
+        self.soft_errors.setdefault(stage, 0)
+        if not ok:
+            self.errors[stage] += 1
+        elif soft_error:
+            self.soft_errors[stage] += 1
+
+    def report(self, wall_time: float) -> dict:
+        total = sum(len(v) for v in self.latencies.values())
+        stages = {}
+        for stage, values in self.latencies.items():
+            stages[stage] = {
+                "requests": len(values),
+                "rps": round(len(values) / wall_time, 2) if wall_time else 0.0,
+                "p50_ms": round(percentile(values, 50) * 1000, 1),
+                "p95_ms": round(percentile(values, 95) * 1000, 1),
+                "p99_ms": round(percentile(values, 99) * 1000, 1),
+                "error_rate": round(self.errors[stage] / len(values), 4),
+                "soft_error_rate": round(self.soft_errors[stage] / len(values), 4),
+            }
+        return {
+            "wall_time_s": round(wall_time, 2),
+            "requests": total,
+            "rps": round(total / wall_time, 2) if wall_time else 0.0,
+            "error_rate": round(sum(self.errors.values()) / total, 4) if total else 0.0,
+            "stages": stages,
+        }
+
+
+def print_report(report: dict) -> None:
+    print("\n📊 부하 테스트 결과")
+    print(f"- 소요 시간: {report['wall_time_s']}s / 요청 수: {report['requests']} / RPS: {report['rps']}")
+    print(f"- 전체 오류율: {report['error_rate'] * 100:.2f}%\n")
+    header = f"{'stage':<10}{'req':>7}{'rps':>8}{'p50(ms)':>10}{'p95(ms)':>10}{'p99(ms)':>10}{'err%':>8}{'soft%':>8}"
+    print(header)
+    print("─" * len(header))
+    for stage, row in report["stages"].items():
+        print(
+            f"{stage:<10}{row['requests']:>7}{row['rps']:>8}{row['p50_ms']:>10}{row['p95_ms']:>10}"
+            f"{row['p99_ms']:>10}{row['error_rate'] * 100:>8.2f}{row['soft_error_rate'] * 100:>8.2f}"
+        )
+
+
+# =====================================================
+# 2️⃣ 가상 유저
+# =====================================================
+def _response_text(body: dict) -> str:
+    try:
+        return body["template"]["outputs"][0]["simpleText"]["text"]
+    except (KeyError, IndexError, TypeError):
+        return ""
+
+
+async def run_virtual_user(client: httpx.AsyncClient, stats: LoadStats, args: argparse.Namespace) -> None:
+    user_id = make_user_id()
+
+    # 🔷 인증 (fake kauth 로 토큰 발급 → tokens 저장)
+    start = time.perf_counter()
+    try:
+        response = await client.get("/oauth", params={"code": "loadtest", "state": user_id})
+        stats.record("oauth", time.perf_counter() - start, response.status_code == 200)
+    except httpx.HTTPError:
+        stats.record("oauth", time.perf_counter() - start, False)
+        return
+
+    # 🔷 stage 1 → 3 대화
+    for stage, utterance in make_conversation(args.stage3_answer):
+        start = time.perf_counter()
+        try:
+            response = await client.post("/webhook", json=make_webhook_payload(user_id, utterance))
+            elapsed = time.perf_counter() - start
+            ok = response.status_code == 200
+            text = _response_text(response.json()) if ok else ""
+            stats.record(stage, elapsed, ok, soft_error=text.startswith(SOFT_ERROR_PREFIXES))
+            if not ok:
+                return
+        except (httpx.HTTPError, ValueError):
+            stats.record(stage, time.perf_counter() - start, False)
+            return
+        if args.think_time:
+            await asyncio.sleep(args.think_time)
+
+
+async def run_load(args: argparse.Namespace, target: str) -> dict:
+    stats = LoadStats()
+    semaphore = asyncio.Semaphore(args.concurrency)
+    limits = httpx.Limits(max_connections=args.concurrency, max_keepalive_connections=args.concurrency)
+
+    async with httpx.AsyncClient(base_url=target, timeout=args.timeout, limits=limits) as client:
+        async def guarded() -> None:
+            async with semaphore:
+                await run_virtual_user(client, stats, args)
+
+        start = time.perf_counter()
+        await asyncio.gather(*(guarded() for _ in range(args.users)))
+        wall_time = time.perf_counter() - start
+
+    return stats.report(wall_time)
+
+
+# =====================================================
+# 3️⃣ 앱 기동
+# =====================================================
+def build_app_env(fakes: dict, tokens_file: Path) -> dict:
+    """앱이 fake 서버를 바라보도록 하는 환경 변수"""
+    return {
+        "OPENAI_BASE_URL": f"{fakes['openai']}/v1",
+        "OPENAI_API_KEY": "sk-loadtest",
+        "KAKAO_API_HOST": fakes["kakao"],
+        "KAKAO_AUTH_HOST": fakes["kakao"],
+        "KAKAO_REST_API_KEY": "loadtest",
+        "DANAWA_BASE_URL": fakes["danawa"],
+        "TOKENS_FILE": str(tokens_file),
+    }
+
+
+def spawn_app(env_overrides: dict, port: int, workers: int) -> subprocess.Popen:
+    env = {**os.environ, **env_overrides}
+    process = subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "app.main:app", "--port", str(port),
+         "--workers", str(workers), "--log-level", "warning"],
+        cwd=PROJECT_ROOT,
+        env=env,
+    )
+    deadline = time.time() + 30
+    while time.time() < deadline:
+        if process.poll() is not None:
+            raise RuntimeError("❌ uvicorn 프로세스가 종료되었습니다.")
+        try:
+            if httpx.get(f"http://127.0.0.1:{port}/", timeout=1).status_code == 200:
+                return process
+        except httpx.HTTPError:
+            time.sleep(0.2)
+    process.terminate()
+    raise RuntimeError("❌ uvicorn 기동 대기 시간 초과")
+
+
+# =====================================================
+# 4️⃣ CLI
+# =====================================================
+def parse_args(argv: list[str] | None = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="/webhook 부하 테스트")
+    target = parser.add_mutually_exclusive_group(required=True)
+    target.add_argument("--target", help="이미 실행 중인 앱 URL (예: http://127.0.0.1:8000)")
+    target.add_argument("--spawn", action="store_true", help="fake 서버를 바라보는 uvicorn 을 직접 실행")
+    parser.add_argument("--port", type=int, default=8765, help="--spawn 시 앱 포트")
+    parser.add_argument("--workers", type=int, default=1,
+                        help="--spawn 시 uvicorn 워커 수 (세션이 프로세스 메모리에 있어 1 만 지원)")
+    parser.add_argument("--users", type=int, default=50, help="가상 유저 수 (유저당 대화 1회)")
+    parser.add_argument("--concurrency", type=int, default=10, help="동시에 진행되는 대화 수")
+    parser.add_argument("--think-time", type=float, default=0.0, help="턴 사이 대기 시간(초)")
+    parser.add_argument("--timeout", type=float, default=60.0, help="요청 타임아웃(초)")
+    parser.add_argument("--stage3-answer", choices=("yes", "no"), default="yes",
+                        help="stage 3 확인 응답 (no 면 크롤링 생략)")
+    parser.add_argument("--openai-latency", default="lognormal:0.8,0.4")
+    parser.add_argument("--kakao-latency", default="const:0.05")
+    parser.add_argument("--danawa-latency", default="uniform:0.2,0.6")
+    parser.add_argument("--json", type=Path, help="결과를 JSON 파일로 저장")
+    args = parser.parse_args(argv)
+    if args.workers != 1:
+        # session_states 는 워커 프로세스마다 따로 있어 한 유저의 턴이 다른 워커로 가면 stage 가 초기화됨
+        # → stage 별 지연 · 오류율이 실제와 달라지므로 공유 세션 저장소가 생기기 전까지는 1 워커만 허용
+        parser.error("--workers 는 1 만 지원합니다 (세션 상태가 워커 프로세스 메모리에 있어 워커 간 공유되지 않음)")
+    return args
+
+
+def main(argv: list[str] | None = None) -> dict:
+    args = parse_args(argv)
+
+    servers = [
+        start_fake_server(FakeOpenAIHandler, LatencySampler.parse(args.openai_latency)),
+        start_fake_server(FakeKakaoHandler, LatencySampler.parse(args.kakao_latency)),
+        start_fake_server(FakeDanawaHandler, LatencySampler.parse(args.danawa_latency)),
+    ]
+    fakes = dict(zip(("openai", "kakao", "danawa"), (server_url(s) for s in servers)))
+    tokens_file = Path(tempfile.mkdtemp(prefix="loadtest-")) / "tokens.json"
+    app_env = build_app_env(fakes, tokens_file)
+
+    process = None
+    if args.spawn:
+        process = spawn_app(app_env, args.port, args.workers)
+        target = f"http://127.0.0.1:{args.port}"
+    else:
+        target = args.target
+        print("ℹ️ 대상 서버는 아래 환경 변수로 실행되어 있어야 합니다:")
+        for key, value in app_env.items():
+            print(f"  {key}={value}")
+
+    print(f"🚀 부하 테스트 시작: users={args.users}, concurrency={args.concurrency}, target={target}")
+    try:
+        report = asyncio.run(run_load(args, target))
+    finally:
+        if process:
+            process.terminate()
+            process.wait(timeout=10)
+        for server in servers:
+            server.shutdown()
+
+    report["config"] = {
+        "users": args.users,
+        "concurrency": args.concurrency,
+        "workers": args.workers,
+        "openai_latency": args.openai_latency,
+        "kakao_latency": args.kakao_latency,
+        "danawa_latency": args.danawa_latency,
+        "stage3_answer": args.stage3_answer,
+    }
+    print_report(report)
+    if args.json:
+        args.json.write_text(json.dumps(report, ensure_ascii=False, indent=2), encoding="utf-8")
+        print(f"💾 결과 저장: {args.json}")
+    return report
+
+
+if __name__ == "__main__":
+    main()
@@ -12,11 +12,11 @@ category_structure_builder.py
 
 📌 호출 관계
 - 단독 실행 가능 (CLI 테스트용)
+- 페이지 요청은 crawl_scheduler 의 REBUILD 우선순위로 실행 (같은 프로세스의 대화형 크롤링이 먼저)
 """
 
 import platform
 import sys
-import json
 from pathlib import Path
 
 from selenium import webdriver
@@ -26,7 +26,12 @@ from selenium.webdriver.common.action_chains import ActionChains
 from selenium.webdriver.chrome.options import Options
 
 from bs4 import BeautifulSoup
-import requests
+
+from app.utils.catalog_snapshot import compile_snapshot
+from app.utils.http_cache import fetch_parsed
+from app.utils.metrics import CRAWL_DURATION, CRAWL_PAGE_LOAD
+from app.utils.serializer import write_json
+from selenium_utils.crawl_scheduler import Priority, get_crawl_scheduler
 
 # =====================================================
 # 0️⃣ 전역 설정
@@ -61,18 +66,14 @@ def import_chromedriver_installer():
 def extract_category_hrefs(url: str) -> list[str]:
     """
     다나와 메인 페이지에서 메인 카테고리 href 목록 추출
+    - HTTP 캐시(app/utils/http_cache.py) 경유: 페이지가 바뀌지 않았으면 304 + 이전 파싱 결과 재사용
     """
-    headers = {
-        "User-Agent": (
-            "Mozilla/5.0 (Windows NT 10.0; Win64; x64) "
-            "AppleWebKit/537.36 (KHTML, like Gecko) "
-            "Chrome/115.0.0.0 Safari/537.36"
-        )
-    }
-    response = requests.get(url, headers=headers)
-    response.raise_for_status()
-
-    soup = BeautifulSoup(response.text, "html.parser")
+    with CRAWL_PAGE_LOAD.time(crawler="category_hrefs"):
+        return fetch_parsed(url, "category_hrefs", parse_category_hrefs)
+
+
+def parse_category_hrefs(html: str) -> list[str]:
+    soup = BeautifulSoup(html, "html.parser")
     div_category = soup.find('div', attrs={"id": "category"})
     if not div_category:
         raise ValueError("div with id='category' not found")
@@ -133,23 +134,39 @@ def crawl_category_structure(driver: webdriver.Chrome, hrefs: list[str]) -> dict
     print("✅ 카테고리 크롤링 완료")
     return result
 
+def crawl_danawa_structure(driver_path: Path, options: Options, url: str, hrefs: list[str]) -> dict:
+    """
+    드라이버 기동 → 메인 페이지 로드 → 카테고리 트리 크롤링 → 종료 (스케줄러 작업 1건)
+    """
+    driver = webdriver.Chrome(service=Service(str(driver_path)), options=options)
+    try:
+        with CRAWL_PAGE_LOAD.time(crawler="category_structure"):
+            driver.get(url)
+        driver.implicitly_wait(3)
+
+        with CRAWL_DURATION.time(crawler="category_structure"):
+            return crawl_category_structure(driver, hrefs)
+    finally:
+        driver.quit()
+
 # =====================================================
 # 4️⃣ JSON으로 저장 (원본 + 시스템프롬프트용 + 중간키+하위목록)
 # =====================================================
-def save_all_json(result: dict, base_dir: Path):
+def save_all_json(result: dict, base_dir: Path, pretty: bool = False):
     """
     크롤링 결과를 JSON으로 저장
     - category_structure.json (원본)
     - category_structure_prompt.json (메인/중간 키만: 시스템프롬프트용)
     - category_structure_keys.json (중간키 + 하위 이름들)
+    - category_structure.bin (워커 간 공유용 mmap 스냅샷)
+    - pretty: True 면 2칸 들여쓰기 (기본은 compact, 기계가 읽는 파일)
     """
     original_path = base_dir / "category_structure.json"
     prompt_path = base_dir / "category_structure_prompt.json"
     keys_full_path = base_dir / "category_structure_keys.json"
 
     # 1️⃣ 원본 저장
-    with open(original_path, "w", encoding="utf-8") as f:
-        json.dump(result, f, ensure_ascii=False, indent=2)
+    write_json(original_path, result, pretty=pretty)
     print(f"💾 원본 JSON 저장: {original_path}")
 
     # 2️⃣ 메인/중간키만 저장 → 시스템프롬프트용
@@ -157,8 +174,7 @@ def save_all_json(result: dict, base_dir: Path):
     for top, mid_dict in result.items():
         keys_only[top] = list(mid_dict.keys())
 
-    with open(prompt_path, "w", encoding="utf-8") as f:
-        json.dump(keys_only, f, ensure_ascii=False, indent=2)
+    write_json(prompt_path, keys_only, pretty=pretty)
     print(f"💾 시스템프롬프트용 JSON 저장: {prompt_path}")
 
     # 3️⃣ 중간키 + 하위 이름들 저장
@@ -168,10 +184,18 @@ def save_all_json(result: dict, base_dir: Path):
         for mid, lst in mid_dict.items():
             simplified[top][mid] = [name for name, _ in lst]
 
-    with open(keys_full_path, "w", encoding="utf-8") as f:
-        json.dump(simplified, f, ensure_ascii=False, indent=2)
+    write_json(keys_full_path, simplified, pretty=pretty)
     print(f"💾 중간키+하위목록 JSON 저장: {keys_full_path}")
 
+    # 4️⃣ 바이너리 스냅샷 (JSON 저장 이후에 만들어야 stale 판정이 맞음)
+    snapshot_path = compile_snapshot(
+        result,
+        out_path=base_dir / "category_structure.bin",
+        structure_path=original_path,
+        keys_path=keys_full_path,
+    )
+    print(f"💾 카탈로그 스냅샷 저장: {snapshot_path}")
+
 # =====================================================
 # 5️⃣ 메인 실행 로직
 # =====================================================
@@ -207,17 +231,17 @@ def main():
     options.add_argument("--disable-dev-shm-usage")
 
     url = "https://www.danawa.com/"
-    hrefs = extract_category_hrefs(url)
-
-    driver = webdriver.Chrome(service=Service(str(driver_path)), options=options)
-    driver.get(url)
-    driver.implicitly_wait(3)
-
-    result = crawl_category_structure(driver, hrefs)
-    driver.quit()
+    scheduler = get_crawl_scheduler()
+    hrefs = scheduler.submit(
+        url, extract_category_hrefs, url, priority=Priority.REBUILD, key="category_structure:hrefs"
+    ).wait()
+    result = scheduler.submit(
+        url, crawl_danawa_structure, driver_path, options, url, hrefs,
+        priority=Priority.REBUILD, key="category_structure:tree",
+    ).wait()
 
     output_dir.mkdir(parents=True, exist_ok=True)
-    save_all_json(result, output_dir)
+    save_all_json(result, output_dir, pretty="--pretty" in sys.argv)
 
 if __name__ == "__main__":
     main()
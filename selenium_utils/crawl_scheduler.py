@@ -0,0 +1,366 @@
+"""
+crawl_scheduler.py
+────────────────────────────────────────────────────────
+- 다나와 크롤링 공용 스케줄러 (stage 3 대화형 크롤링 · 사전 워밍 · 카탈로그 재구축이 같은 큐를 사용)
+- 우선순위: INTERACTIVE(유저 대기 중) > WARMUP(인기 카테고리 사전 크롤링) > REBUILD(카테고리 구조 재구축)
+- 호스트별 token bucket 으로 페이지 요청 속도 제한 (다나와 차단 방지)
+- 같은 우선순위 안에서는 유저별 라운드 로빈 (한 유저의 연속 요청이 다른 유저를 막지 않음)
+- 같은 키(기본: URL)의 작업이 이미 대기 / 실행 중이면 새로 만들지 않고 기존 작업을 반환
+  (더 높은 우선순위로 다시 요청되면 대기 중인 작업의 우선순위를 올림)
+- 작업 상태 조회: get_job(job_id) / list_jobs() (GET /crawl/jobs, /crawl/jobs/{job_id})
+
+📌 환경 변수
+- CRAWL_WORKERS     : 동시 크롤링 수 (Chrome 프로세스 수, 기본 2)
+- CRAWL_HOST_RATE   : 호스트별 초당 작업 시작 수 (기본 1.0)
+- CRAWL_HOST_BURST  : 호스트별 최대 연속 작업 수 (기본 3)
+- CRAWL_JOB_HISTORY : 상태 조회용으로 보관할 완료 작업 수 (기본 500)
+
+📌 사용 예
+    job = get_crawl_scheduler().submit(url, crawl_fn, url, priority=Priority.INTERACTIVE, user=user_id)
+    result = job.wait()          # 완료까지 대기 (실패 시 예외 전달)
+"""
+
+import contextvars
+import itertools
+import os
+import threading
+import time
+from collections import OrderedDict, deque
+from concurrent.futures import Future
+from enum import IntEnum
+from typing import Any, Callable, Optional
+from urllib.parse import urlparse
+
+from app.utils.metrics import counter, gauge, histogram
+
+# =====================================================
+# 0️⃣ 전역 설정
+# =====================================================
+CRAWL_WORKERS = int(os.getenv("CRAWL_WORKERS", "2"))
+CRAWL_HOST_RATE = float(os.getenv("CRAWL_HOST_RATE", "1.0"))
+CRAWL_HOST_BURST = float(os.getenv("CRAWL_HOST_BURST", "3"))
+CRAWL_JOB_HISTORY = int(os.getenv("CRAWL_JOB_HISTORY", "500"))
+
+
+class Priority(IntEnum):
+    INTERACTIVE = 0  # stage 3: 유저가 응답을 기다리는 크롤링
+    WARMUP = 1       # 인기 카테고리 사전 크롤링
+    REBUILD = 2      # 카테고리 구조 재구축
+
+
+CRAWL_QUEUE_DEPTH = gauge(
+    "crawl_queue_depth",
+    "우선순위별 대기 중인 크롤링 작업 수",
+    ("priority",),
+)
+CRAWL_JOBS = counter(
+    "crawl_jobs_total",
+    "크롤링 작업 결과 (result=done|failed|deduplicated)",
+    ("priority", "result"),
+)
+CRAWL_QUEUE_WAIT = histogram(
+    "crawl_queue_wait_seconds",
+    "크롤링 작업이 큐에서 기다린 시간 (속도 제한 대기 포함)",
+    ("priority",),
+    buckets=(0.01, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0, 300.0),
+)
+
+
+# =====================================================
+# 1️⃣ 호스트별 속도 제한
+# =====================================================
+class TokenBucket:
+    """rate 개/초로 채워지고 최대 burst 개까지 쌓이는 토큰"""
+
+    def __init__(self, rate: float, burst: float):
+        self.rate = rate
+        self.burst = burst
+        self.tokens = burst
+        self.updated = time.monotonic()
+
+    def try_take(self, now: float) -> float:
+        """
+        토큰 1개 사용 시도
+
+        Returns:
+            float: 0 이면 사용 성공, 아니면 토큰이 생길 때까지 남은 시간(초)
+        """
+        if self.rate <= 0:
+            return 0.0
+        self.tokens = min(self.burst, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+        if self.tokens >= 1.0:
+            self.tokens -= 1.0
+            return 0.0
+        return (1.0 - self.tokens) / self.rate
+
+
+# =====================================================
+# 2️⃣ 작업
+# =====================================================
+_job_ids = itertools.count(1)
+
+
+class CrawlJob:
+    """
+    크롤링 작업 1건 (status: queued → running → done | failed)
+    """
+
+    def __init__(self, key: str, url: str, fn: Callable, args: tuple, kwargs: dict,
+                 priority: Priority, user: Optional[str]):
+        self.id = f"crawl-{next(_job_ids)}"
+        self.key = key
+        self.url = url
+        self.host = urlparse(url).netloc or url
+        self.fn = fn
+        self.args = args
+        self.kwargs = kwargs
+        self.priority = priority
+        self.user = user or ""
+        self.status = "queued"
+        self.error: Optional[str] = None
+        self.submitted_at = time.time()
+        self.started_at: Optional[float] = None
+        self.finished_at: Optional[float] = None
+        self.future: Future = Future()
+        self.context = contextvars.copy_context()  # 제출한 쪽의 trace / 이벤트 로그 문맥을 워커에서 이어서 사용
+
+    def wait(self, timeout: Optional[float] = None) -> Any:
+        """완료까지 대기 후 결과 반환 (작업 예외는 그대로 전달)"""
+        return self.future.result(timeout)
+
+    def to_dict(self) -> dict:
+        return {
+            "id": self.id,
+            "url": self.url,
+            "host": self.host,
+            "priority": self.priority.name.lower(),
+            "status": self.status,
+            "error": self.error,
+            "submitted_at": self.submitted_at,
+            "wait_ms": round(((self.started_at or time.time()) - self.submitted_at) * 1000, 1),
+            "run_ms": round((self.finished_at - self.started_at) * 1000, 1)
+            if self.started_at and self.finished_at else None,
+        }
+
+
+# =====================================================
+# 3️⃣ 스케줄러
+# =====================================================
+class CrawlScheduler:
+    """
+    우선순위 · 유저 라운드 로빈 · 호스트 속도 제한 큐 + 워커 스레드
+
+    Args:
+        workers (int): 동시 실행 작업 수
+        host_rate (float): 호스트별 초당 작업 시작 수 (0 이하면 제한 없음)
+        host_burst (float): 호스트별 최대 연속 작업 수
+        history (int): 상태 조회용으로 보관할 완료 작업 수
+    """
+
+    def __init__(self, workers: int = CRAWL_WORKERS, host_rate: float = CRAWL_HOST_RATE,
+                 host_burst: float = CRAWL_HOST_BURST, history: int = CRAWL_JOB_HISTORY):
+        self.workers = max(1, workers)
+        self.host_rate = host_rate
+        self.host_burst = host_burst
+        self.history = history
+        # priority → (user → 대기 작업) — 유저 순서가 라운드 로빈 순서
+        self._queues: dict[Priority, OrderedDict[str, deque]] = {p: OrderedDict() for p in Priority}
+        self._active: dict[str, CrawlJob] = {}      # key → 대기 / 실행 중 작업
+        self._jobs: OrderedDict[str, CrawlJob] = OrderedDict()  # id → 작업 (상태 조회)
+        self._buckets: dict[str, TokenBucket] = {}
+        self._cv = threading.Condition()
+        self._threads: list[threading.Thread] = []
+        for priority in Priority:
+            CRAWL_QUEUE_DEPTH.set_function(
+                lambda p=priority: sum(len(q) for q in self._queues[p].values()), priority=priority.name.lower()
+            )
+
+    # ---------- 제출 ----------
+    def submit(self, url: str, fn: Callable, *args, priority: Priority = Priority.INTERACTIVE,
+               user: Optional[str] = None, key: Optional[str] = None, **kwargs) -> CrawlJob:
+        """
+        fn(*args, **kwargs) 를 크롤링 작업으로 등록
+
+        Args:
+            url (str): 요청할 페이지 (속도 제한 호스트 / 기본 중복 키)
+            priority (Priority): 우선순위
+            user (str | None): 공정성 단위 (없으면 우선순위 안에서 하나의 그룹)
+            key (str | None): 중복 판단 키 (기본 url)
+
+        Returns:
+            CrawlJob: 새 작업 또는 같은 키로 대기 / 실행 중인 기존 작업
+        """
+        key = key or url
+        with self._cv:
+            existing = self._active.get(key)
+            if existing is not None:
+                CRAWL_JOBS.inc(priority=priority.name.lower(), result="deduplicated")
+                if existing.status == "queued" and priority < existing.priority:
+                    self._dequeue(existing)
+                    existing.priority = priority
+                    existing.user = user or existing.user
+                    self._enqueue(existing)
+                return existing
+
+            job = CrawlJob(key, url, fn, args, kwargs, priority, user)
+            self._active[key] = job
+            self._remember(job)
+            self._enqueue(job)
+            self._ensure_workers()
+        return job
+
+    def _enqueue(self, job: CrawlJob) -> None:
+        self._queues[job.priority].setdefault(job.user, deque()).append(job)
+        self._cv.notify()
+
+    def _dequeue(self, job: CrawlJob) -> None:
+        users = self._queues[job.priority]
+        pending = users.get(job.user)
+        if pending is None:
+            return
+        pending.remove(job)
+        if not pending:
+            del users[job.user]
+
+    def _remember(self, job: CrawlJob) -> None:
+        self._jobs[job.id] = job
+        while len(self._jobs) > self.history:
+            oldest_id, oldest = next(iter(self._jobs.items()))
+            if oldest.status in ("queued", "running"):
+                break  # 진행 중인 작업은 남겨 둠
+            del self._jobs[oldest_id]
+
+    # ---------- 실행 ----------
+    def _ensure_workers(self) -> None:
+        self._threads = [t for t in self._threads if t.is_alive()]
+        while len(self._threads) < self.workers:
+            thread = threading.Thread(target=self._worker, name=f"crawl-worker-{len(self._threads)}", daemon=True)
+            thread.start()
+            self._threads.append(thread)
+
+    def _bucket(self, host: str) -> TokenBucket:
+        bucket = self._buckets.get(host)
+        if bucket is None:
+            bucket = self._buckets[host] = TokenBucket(self.host_rate, self.host_burst)
+        return bucket
+
+    def _next_job(self) -> tuple[Optional[CrawlJob], Optional[float]]:
+        """
+        높은 우선순위부터, 같은 우선순위에서는 유저 순서대로 호스트 토큰이 있는 첫 작업
+        - 토큰이 없는 호스트의 작업은 건너뛰고 다른 호스트 작업을 먼저 실행
+
+        Returns:
+            (job, wait): 실행할 작업, 없으면 (None, 다음 토큰까지 대기 시간 | None)
+        """
+        now = time.monotonic()
+        wait: Optional[float] = None
+        waiting_hosts: set[str] = set()
+        for priority in Priority:
+            users = self._queues[priority]
+            for user, pending in list(users.items()):
+                job = pending[0]
+                if job.host in waiting_hosts:
+                    continue
+                delay = self._bucket(job.host).try_take(now)
+                if delay > 0:
+                    waiting_hosts.add(job.host)
+                    wait = delay if wait is None else min(wait, delay)
+                    continue
+                pending.popleft()
+                if pending:
+                    users.move_to_end(user)  # 다음 차례는 다른 유저
+                else:
+                    del users[user]
+                return job, None
+        return None, wait
+
+    def _worker(self) -> None:
+        while True:
+            with self._cv:
+                while True:
+                    job, wait = self._next_job()
+                    if job is not None:
+                        break
+                    self._cv.wait(timeout=wait)
+                job.status = "running"
+                job.started_at = time.time()
+            CRAWL_QUEUE_WAIT.observe(job.started_at - job.submitted_at, priority=job.priority.name.lower())
+            self._run(job)
+
+    def _run(self, job: CrawlJob) -> None:
+        try:
+            result = job.context.run(job.fn, *job.args, **job.kwargs)
+        except BaseException as e:
+            job.status, job.error = "failed", f"{type(e).__name__}: {e}"
+            CRAWL_JOBS.inc(priority=job.priority.name.lower(), result="failed")
+            print(f"⚠️ 크롤링 작업 실패 ({job.id}, {job.url}): {job.error}")
+            self._finish(job)
+            job.future.set_exception(e)
+            return
+        job.status = "done"
+        CRAWL_JOBS.inc(priority=job.priority.name.lower(), result="done")
+        self._finish(job)
+        job.future.set_result(result)
+
+    def _finish(self, job: CrawlJob) -> None:
+        job.finished_at = time.time()
+        with self._cv:
+            if self._active.get(job.key) is job:
+                del self._active[job.key]
+
+    # ---------- 상태 조회 ----------
+    def get_job(self, job_id: str) -> Optional[dict]:
+        with self._cv:
+            job = self._jobs.get(job_id)
+            return job.to_dict() if job else None
+
+    def list_jobs(self, status: Optional[str] = None, limit: int = 50) -> dict:
+        """
+        Returns:
+            dict: {"queued": {우선순위: 대기 수}, "running": 실행 수, "jobs": [최근 작업 …]}
+        """
+        with self._cv:
+            jobs = [j for j in reversed(self._jobs.values()) if status is None or j.status == status]
+            return {
+                "queued": {p.name.lower(): sum(len(q) for q in self._queues[p].values()) for p in Priority},
+                "running": sum(1 for j in self._active.values() if j.status == "running"),
+                "jobs": [j.to_dict() for j in jobs[:limit]],
+            }
+
+
+_scheduler: Optional[CrawlScheduler] = None
+_scheduler_lock = threading.Lock()
+
+
+def get_crawl_scheduler() -> CrawlScheduler:
+    global _scheduler
+    if _scheduler is None:
+        with _scheduler_lock:
+            if _scheduler is None:
+                _scheduler = CrawlScheduler()
+    return _scheduler
+
+
+# =====================================================
+# CLI 테스트
+# =====================================================
+if __name__ == "__main__":
+    scheduler = CrawlScheduler(workers=1, host_rate=5, host_burst=1)
+    order = []
+
+    def fake_crawl(name: str) -> str:
+        order.append(name)
+        time.sleep(0.05)
+        return name
+
+    jobs = [scheduler.submit(f"https://prod.danawa.com/list/?cate={i}", fake_crawl, f"rebuild-{i}",
+                             priority=Priority.REBUILD) for i in range(3)]
+    jobs += [scheduler.submit(f"https://prod.danawa.com/list/?cate=u{u}{i}", fake_crawl, f"user{u}-{i}",
+                              priority=Priority.INTERACTIVE, user=f"user{u}") for u in (1, 2) for i in range(2)]
+    duplicate = scheduler.submit("https://prod.danawa.com/list/?cate=0", fake_crawl, "dup", priority=Priority.INTERACTIVE)
+    for job in jobs:
+        job.wait()
+    print("실행 순서:", order)
+    print("중복 요청 → 기존 작업:", duplicate is jobs[0])
+    print(scheduler.list_jobs(limit=3))
@@ -9,23 +9,57 @@ manufacturer_brand_crawler.py
 1. chromedriver는 OS별로 사전에 설치되어야 함 (자동 설치 지원)
 2. WINDOWS_USER 상수는 로컬 윈도우 환경에 맞게 수정
 3. 출력 경로는 OS별로 다름
+4. selenium 은 크롤링 시점에 임포트 (웹훅 서버 기동 시 로드하지 않음)
+5. 모든 크롤링은 crawl_scheduler 를 거침 (우선순위 · 호스트 속도 제한 · 중복 URL 병합)
+6. CRAWL_BROWSER_POOL > 0 이면 크롤링 후 드라이버를 종료하지 않고 그 수만큼 재사용 (기동 시 warm-up 에서 미리 생성)
+
+📌 크롤링 프로필 (CRAWL_PROFILE)
+- fast (기본): 이미지 · 미디어 · 폰트 · 광고/트래커 호스트 차단 (Chrome prefs + CDP Network.setBlockedURLs),
+               page load strategy = eager (DOMContentLoaded 에서 반환), implicit wait 없이 대상 요소만 명시적 대기
+- full        : 기존 설정 (모든 리소스 로드, implicit wait 1초)
+- 비교: python -m benchmarks.bench_crawl_profile
 """
 
+import os
 import platform
 import sys
+import threading
+import time
+from contextlib import contextmanager
 from pathlib import Path
+from typing import TYPE_CHECKING, Iterator, Optional
+
+from app.utils.metrics import CRAWL_DURATION, CRAWL_FAILURES, CRAWL_PAGE_LOAD, gauge
+from app.utils.tracing import span
+from selenium_utils.crawl_scheduler import CrawlJob, Priority, get_crawl_scheduler
 
-from selenium import webdriver
-from selenium.webdriver.chrome.service import Service
-from selenium.webdriver.common.by import By
-from selenium.webdriver.chrome.options import Options
-from selenium.webdriver.support.ui import WebDriverWait
-from selenium.webdriver.support import expected_conditions as EC
+if TYPE_CHECKING:
+    from selenium import webdriver
+    from selenium.webdriver.chrome.options import Options
 
 # =====================================================
 # 0️⃣ 전역 설정
 # =====================================================
 WINDOWS_USER = "sdg15"  # ⚠️ 로컬 윈도우 계정명에 맞게 수정
+DANAWA_BASE_URL = os.getenv("DANAWA_BASE_URL", "")  # 설정 시 prod.danawa.com 호스트를 교체 (부하 테스트용)
+CRAWL_PROFILE = os.getenv("CRAWL_PROFILE", "fast")
+CRAWL_WAIT_TIMEOUT = float(os.getenv("CRAWL_WAIT_TIMEOUT", "3"))  # 대상 요소 명시적 대기(초)
+CRAWL_BROWSER_POOL = int(os.getenv("CRAWL_BROWSER_POOL", "0"))  # 재사용할 유휴 드라이버 수 (0 = 매번 기동 · 종료)
+
+# fast 프로필에서 요청 자체를 막을 URL 패턴 (CDP Network.setBlockedURLs, * 와일드카드)
+BLOCKED_RESOURCE_PATTERNS = [
+    # 이미지 / 미디어 / 폰트
+    "*.jpg*", "*.jpeg*", "*.png*", "*.gif*", "*.webp*", "*.svg*", "*.ico*", "*.bmp*",
+    "*.mp4*", "*.webm*", "*.m3u8*", "*.mp3*",
+    "*.woff*", "*.woff2*", "*.ttf*", "*.otf*", "*.eot*",
+]
+BLOCKED_HOST_PATTERNS = [
+    # 광고 / 분석 / 트래커 (option_nav DOM 과 무관한 서드파티 호스트)
+    "*googletagmanager.com*", "*google-analytics.com*", "*doubleclick.net*", "*googlesyndication.com*",
+    "*googleadservices.com*", "*facebook.net*", "*facebook.com/tr*", "*criteo.com*", "*criteo.net*",
+    "*adnxs.com*", "*mobon.net*", "*dable.io*", "*kakaocdn.net/kas*", "*analytics.naver.com*",
+    "*wcs.naver.net*", "*hotjar.com*", "*clarity.ms*",
+] + [p.strip() for p in os.getenv("CRAWL_BLOCK_HOSTS", "").split(",") if p.strip()]
 
 
 # =====================================================
@@ -54,10 +88,16 @@ def import_chromedriver_installer():
 # =====================================================
 # 2️⃣ Selenium Driver 세팅
 # =====================================================
-def setup_selenium_driver() -> webdriver.Chrome:
+def setup_selenium_driver(profile: str = CRAWL_PROFILE) -> "webdriver.Chrome":
     """
     OS별 크롬드라이버 준비 및 headless 설정
+
+    Args:
+        profile (str): "fast" | "full" (모듈 docstring 참고)
     """
+    from selenium import webdriver
+    from selenium.webdriver.chrome.service import Service
+
     chromedriver_installer = import_chromedriver_installer()
     if chromedriver_installer and not chromedriver_installer.setup_chromedriver():
         print("❌ chromedriver 설치 실패")
@@ -76,60 +116,239 @@ def setup_selenium_driver() -> webdriver.Chrome:
         print(f"❌ chromedriver not found: {driver_path}")
         sys.exit(1)
 
+    options = build_chrome_options(profile)
+    driver = webdriver.Chrome(service=Service(str(driver_path)), options=options)
+    if profile == "fast":
+        block_resources(driver)
+    else:
+        driver.implicitly_wait(1)
+
+    return driver
+
+
+def build_chrome_options(profile: str = CRAWL_PROFILE) -> "Options":
+    """
+    프로필별 Chrome 옵션
+    - fast: eager 로드 + 이미지 / 알림 / 플러그인 비활성 prefs + 가벼운 창 크기
+    """
+    from selenium.webdriver.chrome.options import Options
+
     options = Options()
     options.add_argument("--headless")
     options.add_argument("--window-size=1920,1080")
     options.add_argument("--disable-gpu")
     options.add_argument("--no-sandbox")
     options.add_argument("--disable-dev-shm-usage")
+    if profile != "fast":
+        return options
 
-    driver = webdriver.Chrome(service=Service(str(driver_path)), options=options)
-    driver.implicitly_wait(1)
+    options.page_load_strategy = "eager"
+    options.add_argument("--blink-settings=imagesEnabled=false")
+    options.add_argument("--mute-audio")
+    options.add_argument("--disable-extensions")
+    options.add_argument("--disable-background-networking")
+    options.add_argument("--disable-component-update")
+    options.add_argument("--disable-default-apps")
+    options.add_argument("--disable-sync")
+    options.add_argument("--no-first-run")
+    options.add_experimental_option("prefs", {
+        "profile.managed_default_content_settings.images": 2,
+        "profile.managed_default_content_settings.media_stream": 2,
+        "profile.managed_default_content_settings.notifications": 2,
+        "profile.managed_default_content_settings.plugins": 2,
+        "profile.managed_default_content_settings.popups": 2,
+        "profile.managed_default_content_settings.geolocation": 2,
+    })
+    return options
 
-    return driver
+
+def block_resources(driver: "webdriver.Chrome") -> None:
+    """CDP 로 이미지 · 미디어 · 폰트 · 서드파티 호스트 요청 차단 (실패해도 크롤링은 계속)"""
+    try:
+        driver.execute_cdp_cmd("Network.enable", {})
+        driver.execute_cdp_cmd("Network.setBlockedURLs", {"urls": BLOCKED_RESOURCE_PATTERNS + BLOCKED_HOST_PATTERNS})
+    except Exception as e:
+        print(f"⚠️ CDP 리소스 차단 설정 실패: {e}")
+
+
+# =====================================================
+# 3️⃣ 드라이버 풀
+# =====================================================
+BROWSER_POOL_IDLE = gauge("crawl_browser_pool_idle", "재사용 대기 중인 Chrome 드라이버 수", ("profile",))
+
+_idle_drivers: dict[str, list] = {}
+_pool_lock = threading.Lock()
+
+
+def _is_alive(driver: "webdriver.Chrome") -> bool:
+    try:
+        driver.current_url
+        return True
+    except Exception:
+        return False
+
+
+def _quit(driver: "webdriver.Chrome") -> None:
+    try:
+        driver.quit()
+    except Exception as e:
+        print(f"⚠️ 드라이버 종료 실패: {e}")
+
+
+@contextmanager
+def acquire_driver(profile: str = CRAWL_PROFILE) -> Iterator["webdriver.Chrome"]:
+    """
+    풀에서 드라이버를 빌려 쓰고 반납 (풀이 비었으면 새로 기동)
+    - 사용 중 예외가 나면 드라이버 상태를 믿을 수 없으므로 반납하지 않고 종료
+    - 풀이 CRAWL_BROWSER_POOL 만큼 차 있으면 종료
+    """
+    driver = None
+    with _pool_lock:
+        idle = _idle_drivers.get(profile)
+        while idle and driver is None:
+            candidate = idle.pop()
+            if _is_alive(candidate):
+                driver = candidate
+            else:
+                _quit(candidate)
+        BROWSER_POOL_IDLE.set(len(idle or ()), profile=profile)
+
+    if driver is None:
+        with span("crawl.setup_driver", profile=profile):
+            driver = setup_selenium_driver(profile)
+
+    try:
+        yield driver
+    except BaseException:
+        _quit(driver)
+        raise
+    _release(driver, profile)
+
+
+def _release(driver: "webdriver.Chrome", profile: str) -> None:
+    with _pool_lock:
+        idle = _idle_drivers.setdefault(profile, [])
+        if len(idle) < CRAWL_BROWSER_POOL:
+            try:
+                driver.delete_all_cookies()
+            except Exception:
+                pass
+            idle.append(driver)
+            driver = None
+        BROWSER_POOL_IDLE.set(len(idle), profile=profile)
+    if driver is not None:
+        _quit(driver)
+
+
+def prespawn_drivers(count: int = CRAWL_BROWSER_POOL, profile: str = CRAWL_PROFILE) -> int:
+    """
+    유휴 드라이버를 count 개까지 미리 기동 (서버 warm-up 용)
+
+    Returns:
+        int: 새로 기동한 드라이버 수
+    """
+    count = min(count, CRAWL_BROWSER_POOL)
+    spawned = 0
+    while True:
+        with _pool_lock:
+            if len(_idle_drivers.get(profile, ())) >= count:
+                break
+        with span("crawl.setup_driver", profile=profile, prespawn=True):
+            driver = setup_selenium_driver(profile)
+        _release(driver, profile)
+        spawned += 1
+    return spawned
+
+
+def close_driver_pool() -> None:
+    """유휴 드라이버 전부 종료 (서버 종료 시)"""
+    with _pool_lock:
+        drivers = [d for idle in _idle_drivers.values() for d in idle]
+        for profile in _idle_drivers:
+            BROWSER_POOL_IDLE.set(0, profile=profile)
+        _idle_drivers.clear()
+    for driver in drivers:
+        _quit(driver)
 
 
 # =====================================================
-# 3️⃣ 크롤링 로직
+# 4️⃣ 크롤링 로직
 # =====================================================
-def crawl_spec_options(url: str) -> dict:
+def crawl_spec_options(url: str, profile: str = CRAWL_PROFILE,
+                       priority: Priority = Priority.INTERACTIVE, user: Optional[str] = None) -> dict:
     """
-    옵션 네비게이션 영역 크롤링
+    옵션 네비게이션 영역 크롤링 (크롤링 스케줄러를 거쳐 실행, 완료까지 대기)
     - 옵션이 존재하면 옵션만 반환
     - 옵션이 없으면 nav_3depth를 대신 크롤링
     """
-    driver = setup_selenium_driver()
-    wait = WebDriverWait(driver, 3)  # 명시적 대기 3초
+    with span("crawl.scheduled", priority=priority.name.lower()):
+        return submit_spec_crawl(url, profile, priority, user).wait()
+
+
+def submit_spec_crawl(url: str, profile: str = CRAWL_PROFILE,
+                      priority: Priority = Priority.WARMUP, user: Optional[str] = None) -> CrawlJob:
+    """
+    스펙 크롤링 작업만 등록하고 바로 반환 (같은 URL 이 대기 / 실행 중이면 기존 작업)
+    """
+    if DANAWA_BASE_URL:
+        url = url.replace("https://prod.danawa.com", DANAWA_BASE_URL.rstrip("/"), 1)
+    return get_crawl_scheduler().submit(
+        url, _crawl_spec_options_now, url, profile, priority=priority, user=user, key=f"spec_options:{url}"
+    )
+
+
+def _crawl_spec_options_now(url: str, profile: str) -> dict:
+    """스케줄러 워커에서 실행되는 실제 크롤링 (풀에서 드라이버 대여 → 추출 → 반납)"""
+    crawl_start = time.perf_counter()
+    with acquire_driver(profile) as driver:
+        result = extract_spec_options(driver, url)
+    CRAWL_DURATION.observe(time.perf_counter() - crawl_start, crawler="spec_options")
+    return result
 
-    driver.get(url)
+
+def extract_spec_options(driver: "webdriver.Chrome", url: str, wait_timeout: float = CRAWL_WAIT_TIMEOUT) -> dict:
+    """
+    이미 떠 있는 driver 로 url 1개를 열어 옵션(없으면 nav_3depth) 추출
+    - eager 로드에서도 동작하도록 대상 요소(option_nav / nav_3depth)만 명시적으로 대기
+    """
+    from selenium.webdriver.common.by import By
+    from selenium.webdriver.support import expected_conditions as EC
+    from selenium.webdriver.support.ui import WebDriverWait
+
+    wait = WebDriverWait(driver, wait_timeout)
+
+    with CRAWL_PAGE_LOAD.time(crawler="spec_options"), span("crawl.page_load"):
+        driver.get(url)
 
     result = {}
 
-    try:
-        div_spec_list = wait.until(EC.presence_of_element_located((By.CLASS_NAME, "option_nav")))
-        dl_spec_items = div_spec_list.find_elements(By.CLASS_NAME, "spec_item")
-        count = 0
-        for dl in dl_spec_items:
-            try:
-                input_elem = dl.find_element(By.CSS_SELECTOR, "input[data-attribute-name]")
-                attr_name = input_elem.get_attribute("data-attribute-name").strip()
-                if attr_name not in result:
-                    result[attr_name] = []
-                labels = dl.find_elements(By.CSS_SELECTOR, "li.sub_item > label")
-                result[attr_name].extend(
-                    label.get_attribute("title").strip()
-                    for label in labels
-                    if label.get_attribute("title")
-                )
-            except Exception as e:
-                print(f"⚠️ spec_item 처리 중 오류: {e}")
-                continue
-            count += 1
-            if count == 2:
-                break
+    with span("crawl.option_nav"):
+        try:
+            div_spec_list = wait.until(EC.presence_of_element_located((By.CLASS_NAME, "option_nav")))
+            dl_spec_items = div_spec_list.find_elements(By.CLASS_NAME, "spec_item")
+            count = 0
+            for dl in dl_spec_items:
+                try:
+                    input_elem = dl.find_element(By.CSS_SELECTOR, "input[data-attribute-name]")
+                    attr_name = input_elem.get_attribute("data-attribute-name").strip()
+                    if attr_name not in result:
+                        result[attr_name] = []
+                    labels = dl.find_elements(By.CSS_SELECTOR, "li.sub_item > label")
+                    result[attr_name].extend(
+                        label.get_attribute("title").strip()
+                        for label in labels
+                        if label.get_attribute("title")
+                    )
+                except Exception as e:
+                    print(f"⚠️ spec_item 처리 중 오류: {e}")
+                    continue
+                count += 1
+                if count == 2:
+                    break
 
-    except Exception as e:
-        print(f"⚠️ 옵션 네비게이션 크롤링 실패: {e}")
+        except Exception as e:
+            CRAWL_FAILURES.inc(crawler="spec_options", step="option_nav")
+            print(f"⚠️ 옵션 네비게이션 크롤링 실패: {e}")
     
     # 중복 제거 후 정렬
     result = {k: sorted(set(v)) for k, v in result.items()}
@@ -138,26 +357,30 @@ def crawl_spec_options(url: str) -> dict:
     if not result:
         print("ℹ️ 옵션값이 없어 nav_3depth를 대신 크롤링합니다.")
         nav_dict = {}
-        try:
-            ul_nav_3depth = driver.find_element(By.CLASS_NAME, "nav_3depth")
-            for a in ul_nav_3depth.find_elements(By.CSS_SELECTOR, "a.nav_link"):
-                txt_elem = a.find_element(By.CSS_SELECTOR, "span.link_txt")
-                txt = txt_elem.text.strip()
-                href = a.get_attribute("href").strip()
-                if txt and href:
-                    nav_dict[txt] = href
-        except Exception as e:
-            print(f"⚠️ nav_3depth 크롤링 실패: {e}")
+        with span("crawl.nav_3depth"):
+            try:
+                # option_nav 대기에서 이미 시간을 썼으므로 짧게만 대기
+                ul_nav_3depth = WebDriverWait(driver, 1).until(
+                    EC.presence_of_element_located((By.CLASS_NAME, "nav_3depth"))
+                )
+                for a in ul_nav_3depth.find_elements(By.CSS_SELECTOR, "a.nav_link"):
+                    txt_elem = a.find_element(By.CSS_SELECTOR, "span.link_txt")
+                    txt = txt_elem.text.strip()
+                    href = a.get_attribute("href").strip()
+                    if txt and href:
+                        nav_dict[txt] = href
+            except Exception as e:
+                CRAWL_FAILURES.inc(crawler="spec_options", step="nav_3depth")
+                print(f"⚠️ nav_3depth 크롤링 실패: {e}")
         
         if nav_dict:
             result["nav"] = nav_dict
 
-    driver.quit()
     return result
 
 
 # =====================================================
-# 4️⃣ 메인 실행 로직
+# 5️⃣ 메인 실행 로직
 # =====================================================
 def main():
     """
@@ -1,27 +1,29 @@
-import json
 from pathlib import Path
 from datetime import datetime, timedelta, timezone
-import requests
 import os
-from dotenv import load_dotenv
+from app.utils.config import load_env
 
-load_dotenv()
+from app.utils.serializer import read_json, write_json
+from app.utils.tracing import span
 
-TOKENS_FILE = Path(__file__).resolve().parent / "tokens.json"
+load_env()
+
+TOKENS_FILE = Path(os.getenv("TOKENS_FILE") or Path(__file__).resolve().parent / "tokens.json")
 KAKAO_REST_API_KEY = os.getenv("KAKAO_REST_API_KEY")
+KAKAO_AUTH_HOST = os.getenv("KAKAO_AUTH_HOST", "https://kauth.kakao.com")
 BASE_URL = os.getenv("BASE_URL") or ""
 
 
 def load_tokens() -> dict:
-    if TOKENS_FILE.exists():
-        with open(TOKENS_FILE, encoding="utf-8") as f:
-            return json.load(f)
-    return {}
+    with span("storage.load_tokens"):
+        if TOKENS_FILE.exists():
+            return read_json(TOKENS_FILE)
+        return {}
 
 
 def save_tokens(tokens: dict):
-    with open(TOKENS_FILE, "w", encoding="utf-8") as f:
-        json.dump(tokens, f, ensure_ascii=False, indent=2)
+    with span("storage.save_tokens"):
+        write_json(TOKENS_FILE, tokens)
 
 
 def save_failed_state(user_id: str):
@@ -76,7 +78,7 @@ def refresh_access_token(user_id: str) -> dict:
     if not user_token or "refresh_token" not in user_token:
         raise ValueError(f"User {user_id} has no refresh_token.")
 
-    url = "https://kauth.kakao.com/oauth/token"
+    url = f"{KAKAO_AUTH_HOST}/oauth/token"
     headers = {"Content-Type": "application/x-www-form-urlencoded"}
     data = {
         "grant_type": "refresh_token",
@@ -84,6 +86,8 @@ def refresh_access_token(user_id: str) -> dict:
         "refresh_token": user_token["refresh_token"]
     }
 
+    import requests  # 서버 기동 시 임포트 비용을 피하기 위해 첫 사용 시 로드
+
     response = requests.post(url, headers=headers, data=data)
     response.raise_for_status()
     result = response.json()